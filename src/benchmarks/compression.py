@@ -0,0 +1,123 @@
+"""compression.py
+
+Benchmarks file size against load time for each compression codec,
+on the saved villager data and on a scaled synthetic copy of it.
+
+Run from the src directory:
+    py -m benchmarks.compression [SCALE]
+"""
+
+# python native
+import os, sys, copy, time, tempfile
+
+# in project
+from classes.file_json import JSONFile
+from classes.file_extension import zstandard
+
+
+# constants
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)),
+                         'data', 'villager-data.json')
+SUFFIXES = {
+    'none' : '',
+    'gzip' : '.gz',
+    'zstd' : '.zst',
+    'lzma' : '.xz'
+}
+
+
+def scale_data(data: list[dict], scale: int) -> list[dict]:
+    """
+    Makes a larger dataset by repeating every profession.
+
+    Parameters
+    ----------
+    data : list[dict]
+        the villager data to repeat
+    scale : int
+        the number of copies of each profession
+
+    Returns
+    -------
+    list[dict]
+        the scaled villager data
+    """
+
+    scaled = []
+    for i in range(scale):
+        for profession in data:
+            copied = copy.deepcopy(profession)
+            copied['profession'] = f'{profession["profession"]}-{i}'
+            scaled.append(copied)
+
+    return scaled
+
+
+def bench(label: str, data: list[dict], repeat: int=5) -> None:
+    """
+    Writes the data with each codec and prints size and load time.
+
+    Parameters
+    ----------
+    label : str
+        name of the dataset being benchmarked
+    data : list[dict]
+        the villager data to write
+    repeat : int, default=5
+        number of loads to take the best time of
+    """
+
+    print(f'\n{label}')
+    print(f'{"codec":<6} {"size (KiB)":>12} {"ratio":>7} ' +
+          f'{"write (ms)":>11} {"load (ms)":>10}')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_size = None
+        for codec, suffix in SUFFIXES.items():
+            if codec == 'zstd' and zstandard is None:
+                print(f'{codec:<6} {"(zstandard not installed)":>42}')
+                continue
+
+            file = JSONFile(os.path.join(tmp, 'data.json' + suffix))
+
+            start = time.perf_counter()
+            file.write(data)
+            write_ms = (time.perf_counter() - start) * 1000
+
+            loads = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                file.read()
+                loads.append((time.perf_counter() - start) * 1000)
+
+            size = os.path.getsize(file.fn)
+            base_size = base_size or size
+            print(f'{codec:<6} {size / 1024:>12.1f} ' +
+                  f'{base_size / size:>6.1f}x ' +
+                  f'{write_ms:>11.1f} {min(loads):>10.1f}')
+
+    return
+
+
+def main() -> None:
+    """
+    Runs the benchmark on the saved data and a scaled copy.
+    """
+
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+
+    if not os.path.isfile(DATA_PATH) or os.path.getsize(DATA_PATH) == 0:
+        print(f'{DATA_PATH} not found, run main.py once to fetch the data')
+        exit(1)
+
+    data = JSONFile(DATA_PATH).read()
+
+    bench('saved dataset', data)
+    bench(f'synthetic dataset ({scale}x)', scale_data(data, scale))
+
+    return
+
+
+
+if __name__ == '__main__':
+    main()
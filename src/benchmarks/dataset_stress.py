@@ -0,0 +1,131 @@
+"""dataset_stress.py
+
+Stress tests the shared dataset: many reader threads search and render
+snapshots while the data is refreshed over and over, and every read is
+checked to have seen one whole version of the data.
+
+Run from the src directory:
+    py -m benchmarks.dataset_stress [READERS] [REFRESHES]
+"""
+
+# python native
+import sys, time, threading
+from typing import Any
+
+# in project
+from benchmarks.synthetic_data import generate
+from classes.dataset import Dataset
+from main import filter_trades, render_data
+
+
+def versioned_data(version: int) -> list[dict[str, Any]]:
+    """
+    Generates villager data where every profession is marked with the
+    version, so a read that mixes versions can be spotted.
+
+    Parameters
+    ----------
+    version : int
+        the version of the data
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        the villager data
+    """
+
+    data = generate(2000, seed=version % 4)
+    for profession in data:
+        profession['job-site-block'] = f'version {version}'
+
+    return data
+
+
+def read(dataset: Dataset, stop: threading.Event,
+         stats: dict[str, Any]) -> None:
+    """
+    Reads snapshots until stopped, checking each is whole and cannot be
+    changed.
+
+    Parameters
+    ----------
+    dataset : Dataset
+        the shared dataset
+    stop : threading.Event
+        set to stop reading
+    stats : dict[str, Any]
+        counts of reads and errors of this reader, updated in place
+    """
+
+    while not stop.is_set():
+        snapshot = dataset.snapshot()
+        marker = f'version {snapshot.version}'
+
+        # a slow reader, the data must not change underneath it
+        results = filter_trades(snapshot.data, 2, ('emerald', 'book'))
+        render_data(results)
+
+        if any(prof['job-site-block'] != marker for prof in snapshot.data):
+            stats['torn'] += 1
+        try:
+            snapshot.data[0]['trades'][0]['exchanges'][0]['given'] \
+                ['item'] = 'changed'
+            stats['mutable'] += 1
+        except TypeError:
+            pass
+
+        stats['reads'] += 1
+        stats['versions'].add(snapshot.version)
+
+    return
+
+
+def main() -> None:
+    """
+    Runs the readers during the refreshes and prints the results.
+    """
+
+    readers = int(sys.argv[1]) if len(sys.argv) > 1 else 32
+    refreshes = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    version = 0
+    def load() -> list[dict[str, Any]]:
+        nonlocal version
+        version += 1
+        return versioned_data(version)
+
+    dataset = Dataset(load)
+    stop = threading.Event()
+    stats = [{'reads': 0, 'torn': 0, 'mutable': 0, 'versions': set()}
+             for _ in range(readers)]
+    threads = [threading.Thread(target=read, args=(dataset, stop, stat))
+               for stat in stats]
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for _ in range(refreshes):
+        dataset.refresh()
+    stop.set()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    reads = sum(stat['reads'] for stat in stats)
+    torn = sum(stat['torn'] for stat in stats)
+    mutable = sum(stat['mutable'] for stat in stats)
+    seen = set().union(*(stat['versions'] for stat in stats))
+
+    print(f'{readers} readers, {refreshes} refreshes in {seconds:.2f}s')
+    print(f'{reads} reads of {len(seen)} versions, {torn} torn, ' +
+          f'{mutable} changed a snapshot')
+
+    assert dataset.snapshot().version == refreshes + 1, 'refresh lost'
+    assert torn == 0 and mutable == 0, 'a read saw an unsafe snapshot'
+
+    return
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+"""library_api.py
+
+Benchmarks the library API: the time taken to import it (against
+importing main.py), checking that importing it touches no files, and
+the latency of each call once the data is loaded.
+
+Run from the src directory:
+    py -m benchmarks.library_api [CALLS]
+"""
+
+# python native
+import sys, json, time, statistics, subprocess
+
+# in project
+from classes.file_handler import SCRIPT_ROOT
+
+
+# constants
+IMPORT_REPEAT = 5
+# imports a module in a fresh interpreter, reporting the time taken,
+# which heavy modules it pulled in and whether the data directory changed
+IMPORT_SCRIPT = '''
+import os, sys, json, time
+def files():
+    return {os.path.join(root, name): os.stat(os.path.join(root, name))
+            .st_mtime_ns for root, _, names in os.walk('data')
+            for name in names}
+before = files()
+start = time.perf_counter()
+import MODULE
+seconds = time.perf_counter() - start
+print(json.dumps({
+    'seconds' : seconds,
+    'loaded'  : [name for name in ('main', 'bs4', 'requests', 'yaml')
+                 if name in sys.modules],
+    'touched' : files() != before
+}))
+'''
+
+
+def time_import(module: str) -> dict:
+    """
+    Imports a module in fresh interpreters.
+
+    Parameters
+    ----------
+    module : str
+        the name of the module
+
+    Returns
+    -------
+    dict
+        the median seconds taken, the heavy modules loaded and whether
+        any file in the data directory was created or changed
+    """
+
+    runs = []
+    for _ in range(IMPORT_REPEAT):
+        output = subprocess.run(
+            [sys.executable, '-c', IMPORT_SCRIPT.replace('MODULE', module)],
+            cwd=SCRIPT_ROOT, capture_output=True, text=True, check=True
+        ).stdout
+        runs.append(json.loads(output.splitlines()[-1]))
+
+    return {
+        'seconds' : statistics.median(run['seconds'] for run in runs),
+        'loaded'  : runs[0]['loaded'],
+        'touched' : any(run['touched'] for run in runs)
+    }
+
+
+def time_calls(function, calls: int) -> float:
+    """
+    Calls a function a number of times.
+
+    Parameters
+    ----------
+    function : Callable
+        the function, taking no arguments
+    calls : int
+        the number of calls
+
+    Returns
+    -------
+    float
+        the median seconds taken by a call
+    """
+
+    times = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+def main() -> None:
+    """
+    Times importing the library and each call, and prints the results.
+    """
+
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f'{"import":>16} {"time":>10}  loaded / touched files')
+    for module in ('villager_trades', 'main'):
+        result = time_import(module)
+        print(f'{module:>16} {result["seconds"] * 1000:>8.1f}ms  ' +
+              f'{", ".join(result["loaded"]) or "-"} / ' +
+              f'{"yes" if result["touched"] else "no"}')
+
+    import villager_trades
+
+    start = time.perf_counter()
+    snapshot = villager_trades.load()
+    first = time.perf_counter() - start
+    if snapshot is None:
+        print('no villager data, fetch it by running main.py first')
+        return
+
+    professions = list(snapshot.professions)[:2]
+    results = villager_trades.search(['emerald'], 'given')
+    timings = {
+        'first load'        : first,
+        'load'              : time_calls(villager_trades.load, calls),
+        'search wanted'     : time_calls(
+            lambda: villager_trades.search(['book', 'iron']), calls),
+        'search given'      : time_calls(
+            lambda: villager_trades.search(['emerald'], 'given'), calls),
+        'search profession' : time_calls(
+            lambda: villager_trades.search(professions, 'profession'), calls),
+        'render'            : time_calls(
+            lambda: villager_trades.render(results, 'full'), calls)
+    }
+
+    print(f'\n{"call":>18} {"median":>12}   ({calls} calls)')
+    for name, seconds in timings.items():
+        print(f'{name:>18} {seconds * 1e6:>10.1f}us')
+
+    return
+
+
+
+if __name__ == '__main__':
+    main()
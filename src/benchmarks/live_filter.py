@@ -0,0 +1,134 @@
+"""live_filter.py
+
+Benchmarks filtering the trade browser as the user types: the time from
+a keystroke to the rows on screen being ready, typing and deleting item
+names on generated data, by scanning every row on each keystroke vs.
+narrowing the last matches, which is how the browser filters.
+
+Run from the src directory:
+    py -m benchmarks.live_filter [EXCHANGES]
+"""
+
+# python native
+import sys, time, random, statistics
+
+# in project
+from benchmarks.synthetic_data import generate
+from classes.narrowing_index import NarrowingIndex
+from classes.trade_browser import TradeBrowser
+
+
+# constants
+FRAME = 1 / 60  # seconds a frame is shown at 60 fps
+HEIGHT = 40     # rows on screen
+QUERIES = 20
+
+
+def keystrokes(browser: TradeBrowser, count: int,
+               seed: int=0) -> list[str]:
+    """
+    Makes the keystrokes of typing words of random rows, deleting part
+    of each query with backspace and typing it again, then clearing it.
+
+    Parameters
+    ----------
+    browser : TradeBrowser
+        the browser, to pick words from
+    count : int
+        the number of queries to type
+    seed : int, default=0
+        seed of the random picks
+
+    Returns
+    -------
+    list[str]
+        the keystrokes, '\\b' for backspace
+    """
+
+    rng = random.Random(seed)
+    keys = []
+    for _ in range(count):
+        words = rng.choice(browser.lines).lower().split()
+        query = ' '.join(rng.sample(words, min(2, len(words))))
+        cut = rng.randint(1, len(query))
+        keys.extend(query)
+        keys.extend('\b' * cut)
+        keys.extend(query[-cut:])
+        keys.extend('\b' * len(query))
+
+    return keys
+
+
+def time_keystrokes(browser: TradeBrowser, keys: list[str]) -> list[float]:
+    """
+    Handles each keystroke and gets the rows on screen.
+
+    Parameters
+    ----------
+    browser : TradeBrowser
+        the browser
+    keys : list[str]
+        the keystrokes
+
+    Returns
+    -------
+    list[float]
+        the seconds taken by each keystroke
+    """
+
+    times = []
+    for key in keys:
+        start = time.perf_counter()
+        browser.handle_key(key)
+        browser.visible(HEIGHT)
+        times.append(time.perf_counter() - start)
+
+    browser.handle_key('home')
+
+    return times
+
+
+class FullScan(NarrowingIndex):
+    """
+    Scans every row on each keystroke, without keeping earlier matches.
+    """
+
+    def filter(self, query: str) -> list[int]:
+        self.stack = self.stack[:1]
+        return super().filter(query)
+
+
+def main() -> None:
+    """
+    Times each keystroke both ways and prints the results.
+    """
+
+    exchanges = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    data = generate(exchanges)
+    start = time.perf_counter()
+    browser = TradeBrowser(data)
+    setup = time.perf_counter() - start
+    keys = keystrokes(browser, QUERIES)
+
+    print(f'{len(browser.lines)} rows, set up in {setup * 1000:.0f}ms, ' +
+          f'{len(keys)} keystrokes, {FRAME * 1000:.1f}ms frame\n')
+    print(f'{"filter":>10} {"median":>10} {"p99":>10} {"max":>10} ' +
+          f'{"over a frame":>14}')
+
+    for name, index in (('full scan', FullScan(browser.index.texts)),
+                        ('narrowing', browser.index)):
+        browser.index = index
+        times = time_keystrokes(browser, keys)
+        over = sum(seconds > FRAME for seconds in times)
+        p99 = statistics.quantiles(times, n=100)[98]
+        print(f'{name:>10} {statistics.median(times) * 1000:>8.2f}ms ' +
+              f'{p99 * 1000:>8.2f}ms {max(times) * 1000:>8.2f}ms ' +
+              f'{over:>7} ({over / len(times):.0%})')
+
+    return
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+"""multi_query_search.py
+
+Benchmarks searching for many items at once, comparing the previous
+query-by-query scan against the Aho-Corasick matcher used by
+main.filter_trades.
+
+Run from the src directory:
+    py -m benchmarks.multi_query_search [SCALE]
+"""
+
+# python native
+import sys, time, random
+from typing import Any
+
+# in project
+from benchmarks.compression import DATA_PATH, scale_data
+from classes.file_json import JSONFile
+from main import filter_trades
+
+
+def naive_filter(data: list[dict[str, Any]],
+                 queries: tuple[str]) -> list[dict[str, Any]]:
+    """
+    Finds the exchanges whose wanted items contain any query, testing
+    every query against every item as the search used to.
+
+    Parameters
+    ----------
+    data : list[dict[str, Any]]
+        the villager data to search
+    queries : tuple[str]
+        the individual search queries
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        the matching exchanges
+    """
+
+    results = []
+    for profession in data:
+        for trade in profession['trades']:
+            for exchange in trade['exchanges']:
+                for item in exchange['wanted']['item']:
+                    if any(query in item.lower() for query in queries):
+                        results.append(exchange)
+                        break
+
+    return results
+
+
+def make_queries(data: list[dict[str, Any]], count: int,
+                 rng: random.Random) -> tuple[str]:
+    """
+    Makes a shopping list of queries, one in ten taken from part of an
+    item name in the data and the rest matching nothing.
+
+    Parameters
+    ----------
+    data : list[dict[str, Any]]
+        the villager data to take item names from
+    count : int
+        the number of queries
+    rng : random.Random
+        source of randomness
+
+    Returns
+    -------
+    tuple[str]
+        the queries
+    """
+
+    names = sorted({
+        item.lower()
+        for profession in data
+        for trade in profession['trades']
+        for exchange in trade['exchanges']
+        for item in exchange['wanted']['item']
+    })
+
+    queries = []
+    for i in range(count):
+        name = rng.choice(names)
+        start = rng.randrange(len(name))
+        part = name[start : start + rng.randint(3, 8)]
+        queries.append(part if i % 10 == 0 else part + f' #{i}')
+
+    return tuple(queries)
+
+
+def main() -> None:
+    """
+    Times both searches over increasing numbers of queries.
+    """
+
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    data = scale_data(JSONFile(DATA_PATH).read(), scale)
+    exchanges = sum(len(trade['exchanges'])
+                    for prof in data for trade in prof['trades'])
+    rng = random.Random(0)
+
+    print(f'{exchanges} exchanges ({scale}x saved data)')
+    print(f'{"queries":>8} {"naive (ms)":>11} {"matcher (ms)":>13} ' +
+          f'{"speedup":>8}')
+
+    for count in (1, 10, 100, 300, 1000):
+        queries = make_queries(data, count, rng)
+
+        start = time.perf_counter()
+        expected = naive_filter(data, queries)
+        naive_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        results = filter_trades(data, 1, queries)
+        matcher_ms = (time.perf_counter() - start) * 1000
+
+        found = sum(len(trade['exchanges'])
+                    for prof in results for trade in prof['trades'])
+        assert found == len(expected), 'searches disagree'
+
+        print(f'{count:>8} {naive_ms:>11.1f} {matcher_ms:>13.1f} ' +
+              f'{naive_ms / matcher_ms:>7.1f}x')
+
+    return
+
+
+
+if __name__ == '__main__':
+    main()
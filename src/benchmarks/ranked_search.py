@@ -0,0 +1,133 @@
+"""ranked_search.py
+
+Benchmarks relevance ranked searches on generated data: the time taken
+to build and load the relevance index, and to search and render the
+results of a query by filtering in data order, by ranking every match,
+and by ranking only the best few, which is how the script searches.
+Ranked searches find the matches as the filter does, see rank_trades.
+
+Run from the src directory:
+    py -m benchmarks.ranked_search [EXCHANGES] [TOP]
+"""
+
+# python native
+import os, sys, time, random, statistics, tempfile
+
+# in project
+from benchmarks.synthetic_data import generate
+from classes.file_handler import FileHandler
+from classes.file_compact_json import CompactJSONFile
+from classes.relevance_index import RelevanceIndex, terms
+from main import filter_trades, exchange_matcher, render_data
+
+
+# constants
+QUERIES = 20
+
+
+def matching(data: list[dict], query: tuple[str]) -> set[tuple]:
+    """
+    Finds the exchanges of items given matching a query, as rank_trades
+    does.
+
+    Parameters
+    ----------
+    data : list[dict]
+        the villager data
+    query : tuple[str]
+        the search queries
+
+    Returns
+    -------
+    set[tuple]
+        the positions of the profession, trade and exchange of each
+        match
+    """
+
+    matches = exchange_matcher(2, query)
+    return {(p, t, e) for p, profession in enumerate(data)
+            for t, trade in enumerate(profession['trades'])
+            for e, exchange in enumerate(trade['exchanges'])
+            if matches(exchange)}
+
+
+def time_queries(search, queries: list[str]) -> tuple[float, int]:
+    """
+    Searches for and renders each query.
+
+    Parameters
+    ----------
+    search : Callable
+        the search, taking a tuple of queries and returning villager data
+    queries : list[str]
+        the queries
+
+    Returns
+    -------
+    tuple[float, int]
+        the median seconds taken by a query, and the median number of
+        lines rendered
+    """
+
+    times, lines = [], []
+    for query in queries:
+        start = time.perf_counter()
+        lines.append(len(render_data(search((query,)), 'simple')))
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times), int(statistics.median(lines))
+
+
+def main() -> None:
+    """
+    Times building the index and each kind of search, and prints the
+    results.
+    """
+
+    exchanges = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    top = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    data = generate(exchanges)
+    rng = random.Random(0)
+    words = sorted({word for profession in data
+                    for trade in profession['trades']
+                    for exchange in trade['exchanges']
+                    for word in terms(exchange['given']['item'])})
+    queries = rng.sample(words, QUERIES)
+
+    with tempfile.TemporaryDirectory() as dir:
+        index = RelevanceIndex(FileHandler('relevance-index.json',
+                                           CompactJSONFile, dir))
+        start = time.perf_counter()
+        index.build(data, 'benchmark')
+        build = time.perf_counter() - start
+        size = os.path.getsize(index.file.path)
+
+        start = time.perf_counter()
+        RelevanceIndex(index.file).load('benchmark')
+        load = time.perf_counter() - start
+
+    print(f'{exchanges} exchanges, index built in {build * 1000:.0f}ms, ' +
+          f'{size / 1e6:.1f}MB, loaded in {load * 1000:.0f}ms\n')
+    print(f'{"search":>16} {"median":>10} {"lines":>8}   ' +
+          f'({QUERIES} queries)')
+
+    searches = {
+        'filter, all'     : lambda query: filter_trades(data, 2, query),
+        'ranked, all'     : lambda query: index.top(
+                                data, 'given', query, None,
+                                matching(data, query)),
+        f'ranked, top {top}' : lambda query: index.top(
+                                data, 'given', query, top,
+                                matching(data, query))
+    }
+    for name, search in searches.items():
+        seconds, lines = time_queries(search, queries)
+        print(f'{name:>16} {seconds * 1000:>8.2f}ms {lines:>8}')
+
+    return
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""result_views.py
+
+Benchmarks sorting and grouping villager data for display on generated
+data: the time taken to build the saved views, and to arrange the whole
+data and search results by each sort, with the saved views vs. reading
+and sorting the values of every exchange each time.
+
+Run from the src directory:
+    py -m benchmarks.result_views [EXCHANGES]
+"""
+
+# python native
+import sys, time, statistics, tempfile
+
+# in project
+from benchmarks.synthetic_data import generate
+from classes.file_handler import FileHandler
+from classes.file_compact_json import CompactJSONFile
+from classes.result_views import ResultViews, SORTS
+from main import filter_trades
+
+
+# constants
+REPEAT = 5
+
+
+def timed(function) -> float:
+    """
+    Calls a function a number of times.
+
+    Parameters
+    ----------
+    function : Callable
+        the function, taking no arguments
+
+    Returns
+    -------
+    float
+        the median seconds taken by a call
+    """
+
+    times = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times)
+
+
+def main() -> None:
+    """
+    Times building the views and arranging the data both ways, and
+    prints the results.
+    """
+
+    exchanges = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    data = generate(exchanges)
+    results = filter_trades(data, 2, ('emerald',))
+    found = sum(len(trade['exchanges']) for profession in results
+                for trade in profession['trades'])
+
+    with tempfile.TemporaryDirectory() as dir:
+        views = ResultViews(FileHandler('result-views.json', CompactJSONFile,
+                                        dir))
+        start = time.perf_counter()
+        views.build(data, 'benchmark')
+        build = time.perf_counter() - start
+
+    # no saved views, every value is read from its text and sorted
+    unsaved = ResultViews(views.file)
+
+    print(f'{exchanges} exchanges, views built in {build * 1000:.0f}ms, ' +
+          f'{found} search results\n')
+    print(f'{"sort":>8} {"data, saved":>12} {"data, unsaved":>14} ' +
+          f'{"results, saved":>15} {"results, unsaved":>17}')
+
+    for sort in SORTS:
+        if SORTS[sort] is None:
+            continue
+        timings = [
+            timed(lambda: views.arrange(data, sort, 'none', True)),
+            timed(lambda: unsaved.arrange(data, sort, 'none', True)),
+            timed(lambda: views.arrange(results, sort, 'none')),
+            timed(lambda: unsaved.arrange(results, sort, 'none'))
+        ]
+        print(f'{sort:>8} ' + ' '.join(
+            f'{seconds * 1000:>{width - 2}.1f}ms'
+            for seconds, width in zip(timings, (12, 14, 15, 17))))
+
+    print(f'\n{"group":>8} {"data, saved":>12}')
+    for group in ('given', 'level'):
+        seconds = timed(lambda: views.arrange(data, 'default', group, True))
+        print(f'{group:>8} {seconds * 1000:>10.1f}ms')
+
+    return
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""scaling.py
+
+Benchmarks how search, display, load and update-diff scale with the
+number of exchanges, using generated data.
+
+Run from the src directory:
+    py -m benchmarks.scaling [EXCHANGES,]
+"""
+
+# python native
+import os, sys, math, copy, time, tempfile
+from typing import Any, Callable
+
+# in project
+from benchmarks.synthetic_data import generate
+from classes.file_indexed_json import IndexedJSONFile
+from main import filter_trades, render_data, changed_professions
+
+
+# constants
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def timed(function: Callable[[], Any], repeat: int=3) -> float:
+    """
+    Times a function, taking the best of several runs.
+
+    Parameters
+    ----------
+    function : Callable[[], Any]
+        the function to time
+    repeat : int, default=3
+        the number of runs
+
+    Returns
+    -------
+    float
+        the fastest run in milliseconds
+    """
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - start) * 1000)
+
+    return min(times)
+
+
+def bench_size(exchanges: int, directory: str) -> dict[str, float]:
+    """
+    Times each operation on generated data of the given size.
+
+    Parameters
+    ----------
+    exchanges : int
+        the number of exchanges to generate
+    directory : str
+        directory to write the data to
+
+    Returns
+    -------
+    dict[str, float]
+        milliseconds taken by each operation
+    """
+
+    data = generate(exchanges)
+    file = IndexedJSONFile(os.path.join(directory, f'{exchanges}.json'))
+    file.write(data)
+
+    # one profession in a hundred has a changed trade
+    updated = copy.deepcopy(data)
+    for profession in updated[::100]:
+        profession['trades'][0]['exchanges'][0]['xp-to-villager'] = '99'
+
+    queries = ('pickaxe', 'oak', 'enchanted book', 'lantern', 'emerald')
+    professions = tuple(prof['profession'] for prof in data[::100])
+
+    return {
+        'load'        : timed(file.read),
+        'indexed'     : timed(lambda: file.read_professions(professions)),
+        'search'      : timed(lambda: filter_trades(data, 1, queries[:1])),
+        'search x5'   : timed(lambda: filter_trades(data, 2, queries)),
+        'display'     : timed(lambda: render_data(data), repeat=1),
+        'update-diff' : timed(lambda: changed_professions(data, updated))
+    }
+
+
+def main() -> None:
+    """
+    Runs the benchmark at each size and prints the scaling of each
+    operation, as the exponent k in time ~ exchanges^k.
+    """
+
+    sizes = [int(size) for size in sys.argv[1].split(',')] \
+            if len(sys.argv) > 1 else DEFAULT_SIZES
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            results[size] = bench_size(size, directory)
+
+    operations = list(results[sizes[0]])
+    print(f'{"exchanges":>10} ' +
+          ' '.join(f'{operation:>12}' for operation in operations))
+    for size in sizes:
+        print(f'{size:>10} ' + ' '.join(
+            f'{results[size][operation]:>10.1f}ms'
+            for operation in operations
+        ))
+
+    if len(sizes) > 1:
+        first, last = results[sizes[0]], results[sizes[-1]]
+        exponents = [
+            math.log(max(last[op], 1e-3) / max(first[op], 1e-3)) /
+            math.log(sizes[-1] / sizes[0])
+            for op in operations
+        ]
+        print(f'{"scaling k":>10} ' + 
+              ' '.join(f'{k:>12.2f}' for k in exponents))
+
+    return
+
+
+
+if __name__ == '__main__':
+    main()
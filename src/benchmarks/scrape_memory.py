@@ -0,0 +1,124 @@
+"""scrape_memory.py
+
+Compares the peak memory of scraping the Trading page by building the
+DOM of the whole page against scanning the page and parsing one table
+at a time, using tracemalloc.
+
+Run from the src directory:
+    py -m benchmarks.scrape_memory [PAGE] [REPEAT]
+"""
+
+# python native
+import sys, time, tracemalloc
+from typing import Any, Callable
+
+# install required
+import requests
+from bs4 import BeautifulSoup
+
+# in project
+from classes.wiki_crawler import WIKI_HEADERS
+from main import TRADING_URL, get_list, parse_table, scan_page, \
+                 parse_table_html
+
+
+def dom_scrape(content: bytes) -> list[dict[str, Any]]:
+    """
+    Scrapes the page by building the DOM of the whole page.
+
+    Parameters
+    ----------
+    content : bytes
+        the HTML of the page
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        the villager data
+    """
+
+    job_sites, tables = get_list(BeautifulSoup(content, 'html.parser'))
+    return [parse_table(job_site, table)
+            for job_site, table in zip(job_sites, tables)]
+
+
+def streaming_scrape(content: bytes) -> list[dict[str, Any]]:
+    """
+    Scrapes the page by scanning it and parsing one table at a time.
+
+    Parameters
+    ----------
+    content : bytes
+        the HTML of the page
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        the villager data
+    """
+
+    job_sites, tables = scan_page(content)
+    return [parse_table_html(job_site, table)
+            for job_site, table in zip(job_sites, tables)]
+
+
+def measure(scrape: Callable, content: bytes,
+            repeat: int) -> tuple[list[dict[str, Any]], int, float]:
+    """
+    Scrapes the page a number of times, keeping only the data.
+
+    Parameters
+    ----------
+    scrape : Callable
+        the way to scrape the page
+    content : bytes
+        the HTML of the page
+    repeat : int
+        the number of times to scrape it
+
+    Returns
+    -------
+    tuple[list[dict[str, Any]], int, float]
+        the data, the peak bytes allocated and the seconds taken
+    """
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        data = scrape(content)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return (data, peak, seconds)
+
+
+def main() -> None:
+    """
+    Scrapes the page both ways and prints the peak memory of each.
+    """
+
+    if len(sys.argv) > 1 and sys.argv[1] != '-':
+        with open(sys.argv[1], 'rb') as f:
+            content = f.read()
+    else:
+        content = requests.get(TRADING_URL, headers=WIKI_HEADERS).content
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    print(f'page of {len(content) / 1024:.0f} KiB, scraped {repeat} times')
+    print(f'{"method":>10} {"peak":>10} {"time":>10}')
+
+    results = []
+    for name, scrape in [('dom', dom_scrape), ('streaming', streaming_scrape)]:
+        data, peak, seconds = measure(scrape, content, repeat)
+        results.append(data)
+        print(f'{name:>10} {peak / 2**20:>8.1f}MB {seconds:>9.2f}s')
+
+    assert results[0] == results[1], 'scraped data differs'
+
+    return
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""synthetic_data.py
+
+Generates villager data in the same format as villager-data.json, at
+any number of exchanges, for benchmarking large datasets.
+
+Run from the src directory:
+    py -m benchmarks.synthetic_data EXCHANGES [OUTPUT] [SEED]
+"""
+
+# python native
+import sys, random
+from typing import Any
+
+# in project
+from classes.file_json import JSONFile
+
+
+# constants
+LEVELS = ['novice', 'apprentice', 'journeyman', 'expert', 'master']
+EXCHANGES_PER_LEVEL = 4
+ADJECTIVES = ['enchanted', 'polished', 'cracked', 'mossy', 'glazed',
+              'chiseled', 'smooth', 'cut', 'waxed', 'dyed', 'chainmail',
+              'golden', 'iron', 'diamond', 'stone', 'wooden']
+MATERIALS = ['oak', 'spruce', 'birch', 'jungle', 'acacia', 'cherry',
+             'granite', 'diorite', 'andesite', 'quartz', 'copper',
+             'terracotta', 'leather', 'prismarine', 'sandstone', 'bamboo']
+NOUNS = ['sword', 'pickaxe', 'helmet', 'boots', 'planks', 'pillar',
+         'stairs', 'slab', 'banner', 'book', 'compass', 'map', 'arrow',
+         'bread', 'stew', 'lantern', 'bell', 'pattern', 'block', 'ingot']
+
+
+def item_names(rng: random.Random, count: int) -> list[str]:
+    """
+    Makes a vocabulary of distinct item names.
+
+    Parameters
+    ----------
+    rng : random.Random
+        source of randomness
+    count : int
+        the number of names
+
+    Returns
+    -------
+    list[str]
+        the item names, title cased like the wiki's
+    """
+
+    names = [
+        f'{adjective} {material} {noun}'.title()
+        for adjective in ADJECTIVES
+        for material in MATERIALS
+        for noun in NOUNS
+    ]
+    rng.shuffle(names)
+
+    # numbered variants once every combination is used
+    while len(names) < count:
+        names.append(f'{rng.choice(names)} {len(names)}')
+
+    return names[:count]
+
+
+def generate(exchanges: int, seed: int=0) -> list[dict[str, Any]]:
+    """
+    Generates villager data with the given number of exchanges.
+
+    Parameters
+    ----------
+    exchanges : int
+        the total number of exchanges
+    seed : int, default=0
+        seed of the random generator, so that data can be regenerated
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        the villager data
+    """
+
+    rng = random.Random(seed)
+    vocabulary = ['Emerald'] + item_names(rng, max(100, exchanges // 10))
+
+    data = []
+    remaining = exchanges
+    while remaining > 0:
+        number = len(data)
+        trades = []
+        for level in LEVELS:
+            count = min(EXCHANGES_PER_LEVEL, remaining)
+            remaining -= count
+            trades.append({
+                'level'     : level,
+                'exchanges' : [
+                    make_exchange(rng, vocabulary) for _ in range(count)
+                ]
+            })
+
+        data.append({
+            'profession'     : f'profession-{number}',
+            'job-site-block' : f'{rng.choice(vocabulary).lower()} table',
+            'trades'         : [trade for trade in trades
+                                if trade['exchanges']]
+        })
+
+    return data
+
+
+def make_exchange(rng: random.Random,
+                  vocabulary: list[str]) -> dict[str, Any]:
+    """
+    Makes a single exchange, buying or selling an item for emeralds.
+
+    Parameters
+    ----------
+    rng : random.Random
+        source of randomness
+    vocabulary : list[str]
+        the item names to choose from, emerald first
+
+    Returns
+    -------
+    dict[str, Any]
+        the exchange
+    """
+
+    item = vocabulary[rng.randrange(1, len(vocabulary))]
+    if rng.random() < 0.5:
+        wanted = ['Emerald']
+        given = item
+    elif rng.random() < 0.8:
+        wanted = [item]
+        given = 'Emerald'
+    else:
+        wanted = ['Emerald', item]
+        given = vocabulary[rng.randrange(1, len(vocabulary))]
+
+    return {
+        'wanted' : {
+            'item'             : wanted,
+            'default-quantity' : [str(rng.randint(1, 64)) for _ in wanted],
+            'price-multiplier' : rng.choice(['0.05', '0.2'])
+        },
+        'given' : {
+            'item'     : given,
+            'quantity' : str(rng.randint(1, 16))
+        },
+        'trades-until-disabled' : str(rng.choice([3, 12, 16])),
+        'xp-to-villager'        : str(rng.choice([1, 2, 5, 10, 15, 20, 30]))
+    }
+
+
+def main() -> None:
+    """
+    Writes generated data to a file.
+    """
+
+    if len(sys.argv) < 2:
+        print('py -m benchmarks.synthetic_data EXCHANGES [OUTPUT] [SEED]')
+        exit(2)
+
+    exchanges = int(sys.argv[1])
+    output = sys.argv[2] if len(sys.argv) > 2 \
+             else f'villager-data-{exchanges}.json'
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    JSONFile(output).write(generate(exchanges, seed))
+    print(f'wrote {exchanges} exchanges to {output}')
+
+    return
+
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""trade_packs.py
+
+Benchmarks reading directories of trade definition files, in this
+process and across worker processes, on generated modpack-like
+professions.
+
+Run from the src directory:
+    py -m benchmarks.trade_packs [PROFESSIONS] [FILES]
+"""
+
+# python native
+import os, sys, json, tempfile
+from typing import Any
+
+# in project
+from benchmarks.synthetic_data import generate, EXCHANGES_PER_LEVEL, LEVELS
+from classes.trade_pack import TradePackLoader
+
+
+def short_form(profession: dict[str, Any]) -> dict[str, Any]:
+    """
+    Rewrites a generated profession as a trade definition in the short
+    form, with offers keyed by level.
+
+    Parameters
+    ----------
+    profession : dict[str, Any]
+        the villager data of the profession
+
+    Returns
+    -------
+    dict[str, Any]
+        the trade definition of the profession
+    """
+
+    def offer(exchange: dict[str, Any]) -> dict[str, Any]:
+        wanted = exchange['wanted']
+        return {
+            'wanted'           : [
+                {'item': item, 'count': quantity} for item, quantity
+                in zip(wanted['item'], wanted['default-quantity'])
+            ],
+            'given'            : {'item'  : exchange['given']['item'],
+                                  'count' : exchange['given']['quantity']},
+            'price-multiplier' : wanted['price-multiplier'],
+            'max-uses'         : exchange['trades-until-disabled'],
+            'xp'               : exchange['xp-to-villager']
+        }
+
+    return {
+        'profession'     : profession['profession'],
+        'job-site-block' : profession['job-site-block'],
+        'trades'         : {trade['level']: [offer(exchange) for exchange
+                                             in trade['exchanges']]
+                            for trade in profession['trades']}
+    }
+
+
+def write_pack(dir: str, professions: int, files: int) -> None:
+    """
+    Writes generated trade definitions, spread evenly over files.
+
+    Parameters
+    ----------
+    dir : str
+        the directory to write to
+    professions : int
+        the number of professions
+    files : int
+        the number of files
+    """
+
+    data = generate(professions * EXCHANGES_PER_LEVEL * len(LEVELS))
+    per_file = -(-len(data) // files)
+    for i in range(0, len(data), per_file):
+        with open(os.path.join(dir, f'trades-{i // per_file}.json'),
+                  'w', encoding='utf-8') as f:
+            json.dump({'professions': [short_form(profession) for profession
+                                       in data[i : i+per_file]]}, f)
+
+    return
+
+
+def main() -> None:
+    """
+    Reads the generated trade definitions with one and with every
+    worker, and prints the throughput of each.
+    """
+
+    professions = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    files = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    with tempfile.TemporaryDirectory() as dir:
+        write_pack(dir, professions, files)
+        print(f'{professions} professions in {files} files')
+        print(f'{"workers":>8} {"time":>8} {"files/s":>10} ' +
+              f'{"exchanges/s":>12}')
+
+        results = []
+        for workers in (1, None):
+            loader = TradePackLoader([dir], workers=workers)
+            results.append(loader.load())
+            stats = loader.stats
+            print(f'{workers or os.cpu_count():>8} ' +
+                  f'{stats["seconds"]:>7.2f}s ' +
+                  f'{stats["files-per-s"]:>10.0f} ' +
+                  f'{stats["exchanges"] / stats["seconds"]:>12.0f}')
+
+        assert results[0] == results[1], 'results differ'
+        assert len(results[0]) == professions, 'professions missing'
+
+    return
+
+
+
+if __name__ == '__main__':
+    main()
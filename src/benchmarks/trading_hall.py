@@ -0,0 +1,90 @@
+"""trading_hall.py
+
+Compares trading hall layouts under several scenarios with the
+vectorized simulator, and times how long the comparison takes.
+Needs numpy.
+
+Run from the src directory:
+    py -m benchmarks.trading_hall [VILLAGERS] [DAYS]
+"""
+
+# python native
+import sys, time
+
+# in project
+from benchmarks.compression import DATA_PATH
+from classes.file_json import JSONFile
+from classes.trading_hall import TradingHall
+
+
+# constants
+SCENARIOS = [
+    {'name': 'full demand'},
+    {'name': 'half demand', 'demand': 0.5},
+    {'name': 'cured', 'cured': True},
+    {'name': 'hero V', 'hero-level': 5},
+    {'name': 'cured + hero V', 'cured': True, 'hero-level': 5}
+]
+
+
+def make_layouts(professions: list[str],
+                 villagers: int) -> dict[str, dict[str, int]]:
+    """
+    Makes layouts of a hall with the given number of villagers.
+
+    Parameters
+    ----------
+    professions : list[str]
+        the professions in the data
+    villagers : int
+        the number of villagers in each layout
+
+    Returns
+    -------
+    dict[str, dict[str, int]]
+        the number of villagers of each profession, keyed by layout name
+    """
+
+    focused = professions[:3]
+    return {
+        'balanced' : {name: villagers // len(professions)
+                      for name in professions},
+        'focused'  : {name: villagers // len(focused) for name in focused},
+        'single'   : {professions[0]: villagers}
+    }
+
+
+def main() -> None:
+    """
+    Simulates each layout under every scenario and prints the results.
+    """
+
+    villagers = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    days = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    data = JSONFile(DATA_PATH).read()
+    professions = [prof['profession'] for prof in data]
+
+    print(f'{villagers} villagers, {days} days, {len(SCENARIOS)} scenarios')
+    print(f'{"layout":>10} {"scenario":>15} {"trades":>10} {"spent":>10} ' +
+          f'{"earned":>10} {"bought":>10} {"master":>7}')
+
+    start = time.perf_counter()
+    for name, layout in make_layouts(professions, villagers).items():
+        totals = TradingHall(data, layout).simulate(days, SCENARIOS)
+
+        for i, scenario in enumerate(SCENARIOS):
+            print(f'{name:>10} {scenario["name"]:>15} ' +
+                  f'{totals["trades"][i]:>10.0f} ' +
+                  f'{totals["emeralds-spent"][i]:>10.0f} ' +
+                  f'{totals["emeralds-earned"][i]:>10.0f} ' +
+                  f'{totals["items-bought"][i]:>10.0f} ' +
+                  f'{totals["master"][i]:>7.0%}')
+
+    print(f'simulated in {time.perf_counter() - start:.2f}s')
+
+    return
+
+
+
+if __name__ == '__main__':
+    main()
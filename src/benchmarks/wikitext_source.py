@@ -0,0 +1,136 @@
+"""wikitext_source.py
+
+Checks that reading the trades from the Trading page's wikitext through
+the MediaWiki API gives the same villager data as scraping the rendered
+page, and times both. The API is a local stand-in serving a saved
+action=parse response (benchmarks/fixtures/trading-wikitext.json), and
+the rendered tables of the same professions are read from
+benchmarks/fixtures/trading-tables.html, so no wiki is needed.
+
+Run from the src directory:
+    py -m benchmarks.wikitext_source [REPEAT]
+"""
+
+# python native
+import os, sys, json, time, threading, statistics
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+# in project
+from classes.page_scanner import PageScanner
+from main import CONFIG_DICT, fetch_wikitext_data, parse_table_html
+
+
+# constants
+FIXTURES = os.path.join(os.path.dirname(__file__), 'fixtures')
+API_RESPONSE = os.path.join(FIXTURES, 'trading-wikitext.json')
+PAGE_TABLES = os.path.join(FIXTURES, 'trading-tables.html')
+
+
+class StandInAPI(BaseHTTPRequestHandler):
+    """
+    Answers every request with the saved action=parse response.
+    """
+
+    def do_GET(self) -> None:
+        with open(API_RESPONSE, 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('content-type', 'application/json; charset=utf-8')
+        self.send_header('content-length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+    def log_message(self, *args) -> None:
+        return
+
+
+def scrape_tables() -> list[dict]:
+    """
+    Parses the saved rendered tables the way the page is scraped.
+
+    Returns
+    -------
+    list[dict]
+        the villager data of the tables
+    """
+
+    with open(PAGE_TABLES, encoding='utf-8') as f:
+        scanner = PageScanner()
+        scanner.scan(f.read())
+
+    return [parse_table_html(job_site, table)
+            for job_site, table in zip(scanner.job_sites, scanner.tables)]
+
+
+def timed(function, repeat: int) -> tuple[float, list[dict]]:
+    """
+    Calls a function a number of times.
+
+    Parameters
+    ----------
+    function : Callable
+        the function, taking no arguments
+    repeat : int
+        the number of calls
+
+    Returns
+    -------
+    tuple[float, list[dict]]
+        the median seconds taken by a call, and the last result
+    """
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+
+    return statistics.median(times), result
+
+
+def main() -> None:
+    """
+    Compares the data of both sources, prints the timings and any
+    differences, and exits with an error if they differ.
+    """
+
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    server = HTTPServer(('127.0.0.1', 0), StandInAPI)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    CONFIG_DICT['wiki-api-url'] = \
+        f'http://127.0.0.1:{server.server_port}/api.php'
+
+    try:
+        api_time, api_data = timed(fetch_wikitext_data, repeat)
+    finally:
+        server.shutdown()
+    page_time, page_data = timed(scrape_tables, repeat)
+
+    exchanges = sum(len(trade['exchanges']) for profession in page_data
+                    for trade in profession['trades'])
+    print(f'{len(page_data)} professions, {exchanges} exchanges\n')
+    print(f'{"source":>8} {"size":>10} {"median":>10}')
+    for name, path, seconds in (('api', API_RESPONSE, api_time),
+                                ('page', PAGE_TABLES, page_time)):
+        print(f'{name:>8} {os.path.getsize(path) / 1000:>8.1f}kB ' +
+              f'{seconds * 1000:>8.2f}ms')
+
+    if api_data == page_data:
+        print('\nboth sources give the same villager data')
+        return
+
+    print('\nthe sources differ:')
+    for api, page in zip(api_data or [], page_data):
+        if api != page:
+            print(json.dumps({'api': api, 'page': page}, indent=2))
+    if len(api_data or []) != len(page_data):
+        print(f'{len(api_data or [])} professions from the api, ' +
+              f'{len(page_data)} from the page')
+    sys.exit(1)
+
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,26 @@
-from .file_handler import FileHandler
+from .file_handler import FileHandler, SCRIPT_ROOT
+from .file_lock import FileLock
+from .page_scanner import PageScanner
+from .shard_handler import ShardHandler
+from .history_store import HistoryStore
+from .dataset import Dataset, Snapshot, freeze, thaw
+from .completion_index import CompletionIndex
+from .relevance_index import RelevanceIndex
+from .result_views import ResultViews, SORTS, GROUPS
 from .file_json import JSONFile
+from .file_compact_json import CompactJSONFile
+from .file_indexed_json import IndexedJSONFile
 from .file_txt import TxtFile
 from .file_yaml import YAMLFile
+from .search_cache import SearchCache
+from .prefetcher import Prefetcher
+from .logger import Logger, LOG, LEVELS
+from .aho_corasick import AhoCorasick
+from .item_catalog import ItemCatalog, item_id
+from .trade_pack import TradePackLoader
+from .narrowing_index import NarrowingIndex
+from .trade_browser import TradeBrowser
+from . import wikitext
+from .wikitext import WikiAPI
+from .wiki_crawler import WikiCrawler, parse_item_page, WIKI_URL, WIKI_HEADERS
 from .useful_methods import * 
\ No newline at end of file
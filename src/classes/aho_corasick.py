@@ -0,0 +1,139 @@
+"""aho_corasick.py
+
+Contains a class that matches many search queries against text at once.
+"""
+
+# python native
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    A class that finds which of many patterns occur in a text in a
+    single pass over the text, using an Aho-Corasick automaton built
+    once per set of patterns.
+
+    Attributes
+    ----------
+    patterns : list[str]
+        the patterns to match
+    goto : list[dict[str, int]]
+        the trie transitions of each state
+    fail : list[int]
+        the state to fall back to when a transition is missing
+    output : list[frozenset[int]]
+        the indices of the patterns that end at each state
+
+    Methods
+    -------
+    matches(text):
+        determines if any pattern occurs in the text
+    find(text):
+        finds every pattern that occurs in the text
+    """
+
+    def __init__(self, patterns: list[str] | tuple[str]) -> None:
+        """
+        Creates AhoCorasick instance, building the automaton.
+
+        Parameters
+        ----------
+        patterns : list[str] | tuple[str]
+            the patterns to match
+        """
+
+        self.patterns = list(patterns)
+        self.goto = [{}]
+        self.fail = [0]
+        outputs = [set()]
+
+        # build the trie of patterns
+        for i, pattern in enumerate(self.patterns):
+            state = 0
+            for character in pattern:
+                if character not in self.goto[state]:
+                    self.goto.append({})
+                    self.fail.append(0)
+                    outputs.append(set())
+                    self.goto[state][character] = len(self.goto) - 1
+                state = self.goto[state][character]
+            outputs[state].add(i)
+
+        # link each state to the longest suffix that is also in the trie,
+        # breadth first so that shorter suffixes are linked first
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for character, next_state in self.goto[state].items():
+                queue.append(next_state)
+
+                fallback = self.fail[state]
+                while fallback and character not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+
+                target = self.goto[fallback].get(character, 0)
+                self.fail[next_state] = target if target != next_state else 0
+                outputs[next_state] |= outputs[self.fail[next_state]]
+
+        self.output = [frozenset(output) for output in outputs]
+
+
+    def matches(self, text: str) -> bool:
+        """
+        Determines if any pattern occurs in the text, stopping at the
+        first match.
+
+        Parameters
+        ----------
+        text : str
+            the text to search
+
+        Returns
+        -------
+        bool
+            True,  if a pattern occurs in the text |
+            False, otherwise
+        """
+
+        goto, fail, output = self.goto, self.fail, self.output
+
+        state = 0
+        if output[state]:
+            return True
+
+        for character in text:
+            while state and character not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(character, 0)
+            if output[state]:
+                return True
+
+        return False
+
+
+    def find(self, text: str) -> set[int]:
+        """
+        Finds every pattern that occurs in the text.
+
+        Parameters
+        ----------
+        text : str
+            the text to search
+
+        Returns
+        -------
+        set[int]
+            the indices of the patterns that occur in the text
+        """
+
+        goto, fail, output = self.goto, self.fail, self.output
+
+        state = 0
+        found = set(output[state])
+        for character in text:
+            while state and character not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(character, 0)
+            found |= output[state]
+
+        return found
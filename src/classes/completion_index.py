@@ -0,0 +1,298 @@
+"""completion_index.py
+
+Contains a class that keeps the vocabularies used to complete command
+line args in the shell, and the completion scripts that read them.
+"""
+
+# python native
+import os, bisect, threading
+from typing import Any
+
+# in project
+from .file_handler import SCRIPT_ROOT
+from .useful_methods import *
+
+
+# constants
+KINDS = ('wanted', 'given', 'items', 'professions')
+COMMAND = 'villager-trades'
+FLAGS = '-w -g -p -e --watch --history --ingest --completion'
+
+# each script defines a command that runs the script, and completes it
+# by prefix from the sorted vocabularies, without starting python
+BASH_SCRIPT = r'''
+{command}() {{ "{python}" "{main}" "$@"; }}
+
+_{name}() {{
+    local dir="{dir}" kind cur="${{COMP_WORDS[COMP_CWORD]}}"
+    if [ "$COMP_CWORD" -eq 1 ]; then
+        COMPREPLY=( $(compgen -W "{flags}" -- "$cur") )
+        return
+    fi
+    case "${{COMP_WORDS[1]}}" in
+        -w) kind=wanted ;;
+        -g) kind=given ;;
+        -p) kind=professions ;;
+        --history) [ "$COMP_CWORD" -eq 2 ] && kind=professions || kind=items ;;
+        *) return ;;
+    esac
+    cur="${{cur#[\"\']}}"
+    local IFS=$'\n' names
+    if command -v look >/dev/null 2>&1; then
+        names=$(LC_ALL=C look -- "$cur" "$dir/$kind.txt" 2>/dev/null)
+    else
+        names=$(awk -v p="$cur" 'index($0, p) == 1' "$dir/$kind.txt" 2>/dev/null)
+    fi
+    [ -n "$names" ] && COMPREPLY=( $(printf '%q\n' $names) )
+}}
+complete -o default -F _{name} {command}
+'''
+
+ZSH_SCRIPT = r'''
+{command}() {{ "{python}" "{main}" "$@"; }}
+
+_{name}() {{
+    local dir="{dir}" kind
+    if (( CURRENT == 2 )); then
+        compadd -- {flags}
+        return
+    fi
+    case "$words[2]" in
+        -w) kind=wanted ;;
+        -g) kind=given ;;
+        -p) kind=professions ;;
+        --history) (( CURRENT == 3 )) && kind=professions || kind=items ;;
+        *) return ;;
+    esac
+    [[ -r "$dir/$kind.txt" ]] || return
+    local -a names
+    names=("${{(@f)$(<"$dir/$kind.txt")}}")
+    compadd -a names
+}}
+compdef _{name} {command}
+'''
+
+FISH_SCRIPT = r'''
+function {command}
+    "{python}" "{main}" $argv
+end
+
+function __{name}_kind
+    set -l tokens (commandline -opc)
+    switch "$tokens[2]"
+        case -w
+            echo wanted
+        case -g
+            echo given
+        case -p
+            echo professions
+        case --history
+            test (count $tokens) -eq 2; and echo professions; or echo items
+    end
+end
+
+complete -c {command} -f
+complete -c {command} -n 'test (count (commandline -opc)) -eq 1' -a '{flags}'
+complete -c {command} -n 'test (count (commandline -opc)) -gt 1' -a '(set -l kind (__{name}_kind); and cat "{dir}/$kind.txt" 2>/dev/null)'
+'''
+
+SCRIPTS = {
+    'bash' : BASH_SCRIPT,
+    'zsh'  : ZSH_SCRIPT,
+    'fish' : FISH_SCRIPT
+}
+
+
+class CompletionIndex:
+    """
+    A class that keeps the completion index: for each kind of query, a
+    file of the distinct lowercase names, sorted, one per line. The
+    files are small and sorted, so a completion script can find the
+    names starting with a prefix by binary search (with `look`) or a
+    single scan, without loading the villager data or python.
+
+    Attributes
+    ----------
+    path : str
+        directory the index is stored in
+
+    Methods
+    -------
+    build(data):
+        writes the index of the villager data
+    exists():
+        determines if the index has been written
+    complete(kind, prefix):
+        finds the names of a kind that start with a prefix
+    script(shell, python, main):
+        makes the completion script of a shell
+    """
+
+    def __init__(self, dir: str='data/completions') -> None:
+        """
+        Creates CompletionIndex instance.
+
+        Parameters
+        ----------
+        dir : str, default='data/completions'
+            directory to store the index in
+        """
+
+        self.path = os.path.join(SCRIPT_ROOT, dir)
+        self._cache = {}  # kind -> (mtime, names)
+        self._lock = threading.Lock()
+
+
+    def _file(self, kind: str) -> str:
+        """
+        Gets the path of the file of a kind of query.
+
+        Parameters
+        ----------
+        kind : str
+            one of KINDS
+
+        Returns
+        -------
+        str
+            the path of the file
+        """
+
+        return os.path.join(self.path, kind + '.txt')
+
+
+    def build(self, data: list[dict[str, Any]]) -> bool:
+        """
+        Writes the index of the villager data, each file replaced at
+        once so a completion never reads a file being written.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data
+
+        Returns
+        -------
+        bool
+            True,  if the index was written |
+            False, otherwise
+        """
+
+        names = {kind: set() for kind in KINDS}
+        for profession in data:
+            names['professions'].add(profession['profession'].lower())
+            for trade in profession['trades']:
+                for exchange in trade['exchanges']:
+                    for item in exchange['wanted']['item']:
+                        names['wanted'].add(item.lower())
+                    names['given'].add(exchange['given']['item'].lower())
+        names['items'] = names['wanted'] | names['given']
+
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            for kind, vocabulary in names.items():
+                fn = self._file(kind)
+                temp = os.path.join(self.path,
+                                    f'.{os.getpid()}.{threading.get_ident()}'
+                                    f'.{kind}.txt')
+                with open(temp, 'w', encoding='utf-8', newline='\n') as f:
+                    f.writelines(name + '\n' for name in sorted(vocabulary)
+                                 if name and '\n' not in name)
+                os.replace(temp, fn)
+
+        except OSError as e:
+            handle_error(e, 'CompletionIndex.build()',
+                         'error writing completion index')
+            return False
+
+        return True
+
+
+    def exists(self) -> bool:
+        """
+        Determines if the index has been written.
+
+        Returns
+        -------
+        bool
+            True,  if every file of the index exists |
+            False, otherwise
+        """
+
+        return all(os.path.isfile(self._file(kind)) for kind in KINDS)
+
+
+    def complete(self, kind: str, prefix: str) -> list[str]:
+        """
+        Finds the names of a kind that start with a prefix, by binary
+        search of the sorted names.
+
+        Parameters
+        ----------
+        kind : str
+            one of KINDS
+        prefix : str
+            the start of the name, in any case
+
+        Returns
+        -------
+        list[str]
+            the matching names, sorted, empty if there is no index
+        """
+
+        fn = self._file(kind)
+        try:
+            mtime = os.stat(fn).st_mtime_ns
+        except OSError:
+            return []
+
+        with self._lock:
+            cached = self._cache.get(kind)
+            if cached is None or cached[0] != mtime:
+                with open(fn, 'r', encoding='utf-8') as f:
+                    cached = (mtime, f.read().splitlines())
+                self._cache[kind] = cached
+        names = cached[1]
+
+        prefix = prefix.lower()
+        start = bisect.bisect_left(names, prefix)
+        end = start
+        while end < len(names) and names[end].startswith(prefix):
+            end += 1
+
+        return names[start:end]
+
+
+    def script(self, shell: str, python: str, main: str) -> str:
+        """
+        Makes the completion script of a shell, which defines the
+        villager-trades command and completes its args from the index.
+
+        Parameters
+        ----------
+        shell : str
+            'bash', 'zsh' or 'fish'
+        python : str
+            path of the python interpreter to run the script with
+        main : str
+            path of main.py
+
+        Returns
+        -------
+        str
+            the completion script
+
+        Raises
+        ------
+        KeyError
+            if the shell is not supported
+        """
+
+        return SCRIPTS[shell].format(
+            command = COMMAND,
+            name    = COMMAND.replace('-', '_'),
+            flags   = FLAGS,
+            python  = python,
+            main    = main,
+            dir     = self.path
+        ).lstrip()
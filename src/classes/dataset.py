@@ -0,0 +1,222 @@
+"""dataset.py
+
+Contains a class that shares the villager data between threads, as
+immutable snapshots that are swapped in whole when the data changes.
+"""
+
+# python native
+import time, threading
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, NamedTuple
+
+
+def freeze(obj: Any) -> Any:
+    """
+    Makes a read-only copy of JSON-like data: dicts become read-only
+    mappings and lists become tuples, all the way down.
+
+    Parameters
+    ----------
+    obj : Any
+        the data
+
+    Returns
+    -------
+    Any
+        the read-only copy
+    """
+
+    if isinstance(obj, Mapping):
+        return MappingProxyType({key: freeze(value)
+                                 for key, value in obj.items()})
+    if isinstance(obj, (list, tuple)):
+        return tuple(freeze(value) for value in obj)
+
+    return obj
+
+
+def thaw(obj: Any) -> Any:
+    """
+    Makes a mutable copy of data made read-only by freeze.
+
+    Parameters
+    ----------
+    obj : Any
+        the read-only data
+
+    Returns
+    -------
+    Any
+        the mutable copy, with dicts and lists
+    """
+
+    if isinstance(obj, Mapping):
+        return {key: thaw(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [thaw(value) for value in obj]
+
+    return obj
+
+
+class Snapshot(NamedTuple):
+    """
+    A read-only version of the villager data.
+
+    Attributes
+    ----------
+    data : tuple[Mapping[str, Any]]
+        the villager data, read-only
+    professions : Mapping[str, Mapping[str, Any]]
+        the data of each profession, keyed by name
+    version : int
+        the number of the snapshot, counting up from 1
+    time : float
+        when the snapshot was published, as time.time()
+    """
+
+    data: tuple
+    professions: Mapping
+    version: int
+    time: float
+
+
+class Dataset:
+    """
+    A class that shares the villager data between threads. Readers get
+    the current snapshot, which never changes, so they need no lock and
+    a snapshot stays whole however long it is used. Updates build the
+    next snapshot off to the side and then replace the current one with
+    a single assignment (read-copy-update), so a reader sees either the
+    old data or the new, never a mix.
+
+    Only updates take a lock, so that two updates do not both load the
+    data or publish versions out of order.
+
+    Attributes
+    ----------
+    load : Callable[[], list[dict[str, Any]] | None]
+        gets the villager data for the first snapshot and each refresh
+
+    Methods
+    -------
+    snapshot():
+        gets the current snapshot, loading the data the first time
+    publish(data):
+        replaces the current snapshot with one of the given data
+    refresh():
+        loads the data again and publishes it
+    """
+
+    def __init__(self,
+                 load: Callable[[], list[dict[str, Any]] | None]) -> None:
+        """
+        Creates Dataset instance. No data is loaded until the first
+        snapshot is needed.
+
+        Parameters
+        ----------
+        load : Callable[[], list[dict[str, Any]] | None]
+            gets the villager data, returning None if it could not
+        """
+
+        self.load = load
+        self._current = None
+        self._version = 0
+        self._update_lock = threading.Lock()
+
+
+    def snapshot(self) -> Snapshot | None:
+        """
+        Gets the current snapshot, loading the data the first time.
+
+        Returns
+        -------
+        Snapshot
+            the current snapshot |
+            None, if there is no data yet and it could not be loaded
+        """
+
+        current = self._current
+        if current is not None:
+            return current
+
+        with self._update_lock:
+            if self._current is None:
+                data = self.load()
+                if data is not None:
+                    self._swap(data)
+
+        return self._current
+
+
+    def _swap(self, data: list[dict[str, Any]]) -> Snapshot:
+        """
+        Builds a snapshot of the data and makes it the current one.
+        Should be called holding the update lock.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data, copied so later changes to it are not seen
+
+        Returns
+        -------
+        Snapshot
+            the new snapshot
+        """
+
+        frozen = freeze(data)
+        snapshot = Snapshot(
+            data        = frozen,
+            professions = MappingProxyType({prof['profession']: prof
+                                            for prof in frozen}),
+            version     = self._version + 1,
+            time        = time.time()
+        )
+
+        # the snapshot is whole before it is assigned, and assigning an
+        # attribute is atomic, so readers never see a partial update
+        self._version = snapshot.version
+        self._current = snapshot
+
+        return snapshot
+
+
+    def publish(self, data: list[dict[str, Any]]) -> Snapshot:
+        """
+        Replaces the current snapshot with one of the given data.
+        Readers holding the old snapshot keep it unchanged.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data
+
+        Returns
+        -------
+        Snapshot
+            the new snapshot
+        """
+
+        with self._update_lock:
+            return self._swap(data)
+
+
+    def refresh(self) -> Snapshot | None:
+        """
+        Loads the data again and publishes it. The current snapshot is
+        kept if the data could not be loaded.
+
+        Returns
+        -------
+        Snapshot
+            the current snapshot, new if the data was loaded |
+            None, if there is no data
+        """
+
+        with self._update_lock:
+            data = self.load()
+            if data is not None:
+                self._swap(data)
+
+        return self._current
@@ -0,0 +1,66 @@
+"""file_compact_json.py
+
+Contains a class that handles JSON file IO for files only read by the
+script, such as indexes.
+"""
+
+# python native
+import json
+from typing import Any
+
+# in project
+from .file_json import JSONFile
+from .useful_methods import *
+
+
+class CompactJSONFile(JSONFile):
+    """
+    Class that handles JSON file IO, writing the file on a single line
+    without spaces. Indented JSON can only be written by the json
+    module's pure python encoder, so large files only read by the
+    script are written several times faster this way, and are smaller.
+
+    Attributes
+    ----------
+    fn : str
+        filename of the file
+    codec : str | None
+        compression codec chosen by the file suffix
+
+    Methods
+    -------
+    read():
+        opens the file and returns its data
+    write(data):
+        writes data to file
+    """
+
+    def write(self, data : Any) -> bool:
+        """
+        Writes data to JSON file, on a single line.
+
+        Parameters
+        ----------
+        data : Any
+            the data to write to the file
+
+        Returns
+        -------
+        bool
+            True,  if the data was written to the file |
+            False, otherwise
+        """
+
+        saved = False
+        try:
+            text = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+            with self.open('w') as f:
+                f.write(text)
+                saved = True
+
+        except Exception as e:
+            handle_error(e, 'CompactJSONFile.write()',
+                         'error writing to file')
+
+        finally:
+            return saved
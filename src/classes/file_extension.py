@@ -2,12 +2,30 @@
 
 Contains a class that handles file IO for a specific file format.
 Class is written as an abstract class.
+
+Files whose name ends in a compression suffix (.gz, .zst, .xz, .lzma)
+are transparently compressed on write and decompressed on read.
 """
 
 # python native
-import os
+import os, gzip, lzma
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, IO
+
+# optional
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# constants
+COMPRESSION_SUFFIXES = {
+    '.gz'   : 'gzip',
+    '.zst'  : 'zstd',
+    '.xz'   : 'lzma',
+    '.lzma' : 'lzma'
+}
 
 
 class FileExtension(ABC):
@@ -18,10 +36,17 @@ class FileExtension(ABC):
     ----------
     fn : str
         filename of the file
+    codec : str | None
+        compression codec chosen by the file suffix, None if uncompressed
 
     Methods
     -------
-    open():
+    open(mode='r'):
+        opens the file as a stream, compressing or decompressing
+        as needed
+    sidecars():
+        gets the files written alongside the file
+    read():
         opens the file and returns its data
     write(data):
         writes data to file
@@ -38,8 +63,63 @@ class FileExtension(ABC):
         """
         
         self.fn = fn
+        self.codec = COMPRESSION_SUFFIXES.get(os.path.splitext(fn)[1])
+
+
+    def open(self, mode: str='r', newline: str | None=None) -> IO:
+        """
+        Opens the file as a text stream. Data is compressed as it is
+        written and decompressed as it is read, based on the codec.
+
+        Parameters
+        ----------
+        mode : str, default='r'
+            'r' to read the file, 'w' to write the file
+        newline : str | None, default=None
+            how line endings are translated, see the built-in open,
+            '' to write them as they are on every platform
+
+        Returns
+        -------
+        IO
+            the opened text stream
+
+        Raises
+        ------
+        ModuleNotFoundError
+            if the file is zstd compressed and zstandard is not installed
+        """
+
+        if self.codec is None:
+            return open(self.fn, mode, newline=newline)
+
+        mode = mode + 't'
+        if self.codec == 'gzip':
+            return gzip.open(self.fn, mode, newline=newline)
+        if self.codec == 'lzma':
+            return lzma.open(self.fn, mode, newline=newline)
+
+        if zstandard is None:
+            raise ModuleNotFoundError(
+                'zstandard is required to open .zst files'
+            )
+        return zstandard.open(self.fn, mode, newline=newline)
     
     
+    def sidecars(self) -> list[str]:
+        """
+        Gets the files, such as indexes, that are written alongside
+        the file and must be replaced along with it.
+
+        Returns
+        -------
+        list[str]
+            paths of the files, none by default
+        """
+
+        return []
+
+
     @abstractmethod
     def read(self) -> Any:
         """
@@ -4,7 +4,7 @@ Contains class that handles a single file.
 """
 
 # python native
-import sys, os
+import os, threading
 from pathlib import Path
 from typing import Type, Any
 
@@ -14,7 +14,9 @@ from .useful_methods import *
 
 
 # constants
-SCRIPT_ROOT = sys.path[0]
+# the directory of main.py, found from this file rather than sys.path,
+# so the data is found when the script is imported by another program
+SCRIPT_ROOT = str(Path(__file__).resolve().parent.parent)
 
 
 class FileHandler:
@@ -39,10 +41,15 @@ class FileHandler:
         determines if file already exists
     is_empty():
         determines if file is empty
+    data_fingerprint():
+        gets a fingerprint that changes whenever the file is written
     read():
         opens file and returns its data
     write(data):
         writes to file
+    @staticmethod
+    atomic_write(extension, data):
+        writes to a temporary file that replaces the file
     """
 
     def __init__(self, fn: str, 
@@ -63,11 +70,12 @@ class FileHandler:
 
         self.path = os.path.join(SCRIPT_ROOT, dir, fn)
         self.extention = extension(self.path)
+        # only printed when interactive, i.e. not to a library's stdout
         if not self.file_exists():
             if self.create_file():
-                print_internal(f'{self.path} created successfully')
+                LOG.info(f'{self.path} created successfully')
             else:
-                print_internal(f'error creating file {self.path}')
+                LOG.error(f'error creating file {self.path}')
 
 
     @staticmethod
@@ -117,7 +125,7 @@ class FileHandler:
 
         val = False
         try:
-            if FileHandler.create_dir():
+            if FileHandler.create_dir(os.path.dirname(self.path)):
                 with open(self.path, 'a+'):
                     val = True
 
@@ -161,6 +169,25 @@ class FileHandler:
         return os.stat(self.path).st_size == 0
     
 
+    def data_fingerprint(self) -> str | None:
+        """
+        Gets a fingerprint that changes whenever the file is written,
+        without opening the file.
+
+        Returns
+        -------
+        str
+            the size and modification time of the file |
+            None, if the file is empty
+        """
+
+        if not self.file_exists() or self.is_empty():
+            return None
+
+        stat = os.stat(self.path)
+        return f'{stat.st_size}-{stat.st_mtime_ns}'
+    
+
     def read(self) -> Any | None:
         """
         Opens file and returns its data.
@@ -177,7 +204,9 @@ class FileHandler:
 
     def write(self, data: Any) -> bool:
         """
-        Writes data to file.
+        Writes data to file. The data is written to a temporary file
+        that then replaces the file, so readers never see a partially
+        written file.
 
         Parameters
         ----------
@@ -191,4 +220,51 @@ class FileHandler:
             False, otherwise
         """
 
-        return self.extention.write(data)
\ No newline at end of file
+        return FileHandler.atomic_write(self.extention, data)
+
+
+    @staticmethod
+    def atomic_write(extension: FileExtension, data: Any) -> bool:
+        """
+        Writes data to a temporary file that then replaces the file
+        handled by the given extension, along with its sidecar files.
+
+        Parameters
+        ----------
+        extension : FileExtension
+            handles file IO of the file to replace
+        data : Any
+            data to write to the file
+        
+        Returns
+        -------
+        bool
+            True,  if the data was written to the file successfully |
+            False, otherwise
+        """
+
+        # unique to the process and thread, so concurrent writers
+        # never share a temporary file
+        directory, fn = os.path.split(extension.fn)
+        temp = extension.__class__(os.path.join(
+            directory, f'.{os.getpid()}.{threading.get_ident()}.{fn}'
+        ))
+
+        if not temp.write(data):
+            if os.path.isfile(temp.fn):
+                os.remove(temp.fn)
+            return False
+
+        try:
+            for temp_sidecar, sidecar in zip(temp.sidecars(), 
+                                             extension.sidecars()):
+                if os.path.isfile(temp_sidecar):
+                    os.replace(temp_sidecar, sidecar)
+            os.replace(temp.fn, extension.fn)
+
+        except OSError as e:
+            handle_error(e, 'FileHandler.atomic_write()', 
+                         'error writing to file')
+            return False
+
+        return True
\ No newline at end of file
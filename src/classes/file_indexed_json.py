@@ -0,0 +1,297 @@
+"""file_indexed_json.py
+
+Contains a class that handles villager data JSON file IO, along with
+an index of where each profession and trade level is in the file.
+"""
+
+# python native
+import os, json, textwrap
+from typing import Any
+
+# in project
+from .file_json import JSONFile
+from .logger import LOG
+from .useful_methods import *
+
+
+class IndexedJSONFile(JSONFile):
+    """
+    Class that handles villager data JSON file IO. Writing the file also
+    writes an index of the byte range of each profession and trade level,
+    so a single profession can be decoded without loading the whole file.
+
+    The file itself is written exactly as JSONFile writes it. Compressed
+    files are not indexed, as they cannot be read from an offset.
+
+    Attributes
+    ----------
+    fn : str
+        filename of the file
+    codec : str | None
+        compression codec chosen by the file suffix
+    index : JSONFile
+        handles file IO of the index
+
+    Methods
+    -------
+    sidecars():
+        gets the files written alongside the file
+    read():
+        opens the file and returns its data
+    read_index():
+        opens the index if it is up to date with the file
+    read_slice(profession, level=None):
+        decodes a single profession or trade level from the file
+    read_professions(professions):
+        decodes the given professions from the file
+    write(data):
+        writes data and its index to file
+    """
+
+    def __init__(self, fn: str) -> None:
+        """
+        Creates IndexedJSONFile instance.
+
+        Attributes
+        ----------
+        fn : str
+            filename of the desired file
+        """
+
+        super().__init__(fn)
+        self.index = JSONFile(os.path.splitext(fn)[0] + '.index.json')
+
+
+    def sidecars(self) -> list[str]:
+        """
+        Gets the files written alongside the file.
+
+        Returns
+        -------
+        list[str]
+            path of the index
+        """
+
+        return [self.index.fn] if self.codec is None else []
+
+
+    def read_index(self) -> dict[str, Any] | None:
+        """
+        Opens the index if it is up to date with the file.
+
+        Returns
+        -------
+        dict[str, Any]
+            the byte ranges of each profession and trade level |
+            None, if there is no index or it is stale
+        """
+
+        if self.codec is not None or not os.path.isfile(self.index.fn):
+            return None
+
+        try:
+            stat = os.stat(self.fn)
+            with open(self.index.fn, 'r') as f:
+                index = json.load(f)
+
+        except (OSError, ValueError):
+            return None
+
+        if index.get('size') != stat.st_size \
+           or index.get('mtime') != stat.st_mtime_ns:
+            return None
+
+        return index
+
+
+    def read_slice(self, profession: str, level: str | None=None,
+                   index: dict[str, Any] | None=None) -> Any | None:
+        """
+        Decodes a single profession or trade level from the file.
+
+        Parameters
+        ----------
+        profession : str
+            the name of the profession
+        level : str | None, default=None
+            the trade level of the profession, None for the profession
+        index : dict[str, Any] | None, default=None
+            an already opened index, None to open the index
+
+        Returns
+        -------
+        Any
+            the data of the profession or trade level |
+            None, if the index is stale or the slice is not indexed
+        """
+
+        index = index or self.read_index()
+        if index is None or profession not in index['professions']:
+            return None
+
+        entry = index['professions'][profession]
+        if level is None:
+            start, end = entry['range']
+        elif level in entry['levels']:
+            start, end = entry['levels'][level]
+        else:
+            return None
+
+        try:
+            with open(self.fn, 'rb') as f:
+                f.seek(start)
+                return json.loads(f.read(end - start)
+                                  .decode(index['encoding']))
+
+        except (OSError, ValueError) as e:
+            LOG.warning('could not read index slice', file=self.fn,
+                        error=str(e))
+            return None
+
+
+    def read_professions(self, professions: tuple[str]
+                         ) -> list[dict[str, Any]] | None:
+        """
+        Decodes the given professions from the file, in file order.
+
+        Parameters
+        ----------
+        professions : tuple[str]
+            the names of the professions
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            the data of the professions |
+            None, if the index is stale and the file must be read fully
+        """
+
+        index = self.read_index()
+        if index is None:
+            return None
+
+        data = []
+        for name in index['order']:
+            if name not in professions:
+                continue
+
+            profession = self.read_slice(name, index=index)
+            if profession is None:
+                return None
+            data.append(profession)
+
+        return data
+
+
+    def write(self, data: Any) -> bool:
+        """
+        Writes data to JSON file, along with its index.
+
+        Parameters
+        ----------
+        data : Any
+            the data to write to the file
+
+        Returns
+        -------
+        bool
+            True,  if the data was written to the file |
+            False, otherwise
+        """
+
+        indexable = self.codec is None and isinstance(data, list) and \
+                    all(isinstance(prof, dict) and 'profession' in prof
+                        for prof in data)
+        if not indexable:
+            return super().write(data)
+
+        saved = False
+        try:
+            # newlines are not translated, so the byte ranges counted
+            # are those of the file on every platform
+            with self.open('w', newline='') as f:
+                index = _write_indexed(f, data)
+
+            stat = os.stat(self.fn)
+            index['size'] = stat.st_size
+            index['mtime'] = stat.st_mtime_ns
+            saved = self.index.write(index)
+
+        except Exception as e:
+            handle_error(e, 'IndexedJSONFile.write()',
+                         'error writing to file')
+
+        finally:
+            return saved
+
+
+
+def _write_indexed(f: Any, data: list[dict[str, Any]]) -> dict[str, Any]:
+    """
+    Writes villager data to an open file exactly as json.dump with an
+    indent of 2 does, while recording the byte range of each profession
+    and trade level.
+
+    Parameters
+    ----------
+    f : TextIO
+        the file to write to
+    data : list[dict[str, Any]]
+        the villager data to write
+
+    Returns
+    -------
+    dict[str, Any]
+        the index of the written data
+    """
+
+    encoding = f.encoding
+    index = {
+        'encoding'    : encoding,
+        'order'       : [],
+        'professions' : {}
+    }
+
+    def dumps(obj: Any, depth: int) -> str:
+        # nested values are indented by their depth after the first line
+        text = json.dumps(obj, ensure_ascii=False, indent=2)
+        return textwrap.indent(text, ' ' * depth)[depth:]
+
+    offset = 0
+    def write(text: str) -> None:
+        nonlocal offset
+        f.write(text)
+        offset += len(text.encode(encoding))
+
+    if not data:
+        write('[]')
+        return index
+
+    write('[\n')
+    for i, profession in enumerate(data):
+        write('  ')
+        text = dumps(profession, 2)
+        start = offset
+
+        levels = {}
+        cursor = 0
+        for trade in profession.get('trades', []):
+            trade_text = dumps(trade, 6)
+            position = text.index(trade_text, cursor)
+            trade_start = start + len(text[:position].encode(encoding))
+            levels[trade['level']] = [
+                trade_start, trade_start + len(trade_text.encode(encoding))
+            ]
+            cursor = position + len(trade_text)
+
+        write(text)
+        index['order'].append(profession['profession'])
+        index['professions'][profession['profession']] = {
+            'range'  : [start, offset],
+            'levels' : levels
+        }
+
+        write(',\n' if i < len(data) - 1 else '\n')
+    write(']')
+
+    return index
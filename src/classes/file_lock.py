@@ -0,0 +1,191 @@
+"""file_lock.py
+
+Contains a class that holds an exclusive lock on a file, shared between
+processes, using fcntl on unix and msvcrt on windows.
+"""
+
+# python native
+import os, time
+
+# platform specific
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """
+    A class that holds an exclusive lock on a lock file, so that only
+    one process (or thread) at a time runs a section of code. The lock
+    is released by the operating system if the process exits.
+
+    Can be used as a context manager:
+        with FileLock(path):
+            ...
+
+    Attributes
+    ----------
+    path : str
+        path of the lock file, created if it does not exist
+    poll_interval : float
+        seconds between attempts while waiting with a timeout
+
+    Methods
+    -------
+    acquire(blocking=True, timeout=None):
+        takes the lock, waiting for it if it is held
+    release():
+        gives the lock back
+    locked():
+        determines if this instance holds the lock
+    """
+
+    def __init__(self, path: str, poll_interval: float=0.05) -> None:
+        """
+        Creates FileLock instance.
+
+        Parameters
+        ----------
+        path : str
+            path of the lock file
+        poll_interval : float, default=0.05
+            seconds between attempts while waiting with a timeout
+        """
+
+        self.path = path
+        self.poll_interval = poll_interval
+        self._fd = None
+
+
+    def _try_lock(self, fd: int, blocking: bool) -> bool:
+        """
+        Makes one attempt to lock an open lock file.
+
+        Parameters
+        ----------
+        fd : int
+            file descriptor of the lock file
+        blocking : bool
+            True,  to wait until the lock is free |
+            False, to fail at once if it is held
+
+        Returns
+        -------
+        bool
+            True,  if the lock was taken |
+            False, otherwise
+        """
+
+        try:
+            if fcntl is not None:
+                flags = fcntl.LOCK_EX if blocking \
+                        else fcntl.LOCK_EX | fcntl.LOCK_NB
+                fcntl.flock(fd, flags)
+            else:
+                # msvcrt.LK_LOCK gives up after 10 seconds, so retry
+                mode = msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK
+                while True:
+                    try:
+                        os.lseek(fd, 0, os.SEEK_SET)
+                        msvcrt.locking(fd, mode, 1)
+                        break
+                    except OSError:
+                        if not blocking:
+                            raise
+
+        except OSError:
+            return False
+
+        return True
+
+
+    def acquire(self, blocking: bool=True,
+                timeout: float | None=None) -> bool:
+        """
+        Takes the lock, waiting for it if it is held.
+
+        Parameters
+        ----------
+        blocking : bool, default=True
+            True,  to wait for the lock |
+            False, to fail at once if it is held
+        timeout : float | None, default=None
+            most seconds to wait, None to wait as long as it takes
+
+        Returns
+        -------
+        bool
+            True,  if the lock was taken |
+            False, if it is held elsewhere
+        """
+
+        if self._fd is not None:
+            return True
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+
+        if blocking and timeout is None:
+            taken = self._try_lock(fd, True)
+        else:
+            deadline = time.monotonic() + (timeout or 0)
+            taken = self._try_lock(fd, False)
+            while not taken and blocking and time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                taken = self._try_lock(fd, False)
+
+        if not taken:
+            os.close(fd)
+            return False
+
+        self._fd = fd
+        return True
+
+
+    def release(self) -> None:
+        """
+        Gives the lock back. The lock file is left in place, as removing
+        it could let two processes lock different files.
+        """
+
+        if self._fd is None:
+            return
+
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            else:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
+
+        return
+
+
+    def locked(self) -> bool:
+        """
+        Determines if this instance holds the lock.
+
+        Returns
+        -------
+        bool
+            True,  if the lock is held by this instance |
+            False, otherwise
+        """
+
+        return self._fd is not None
+
+
+    def __enter__(self) -> 'FileLock':
+        # blocking locks can still give up, i.e. msvcrt retries ten times
+        if not self.acquire():
+            raise TimeoutError(f'could not lock {self.path}')
+        return self
+
+
+    def __exit__(self, *exc_info) -> None:
+        self.release()
@@ -19,6 +19,8 @@ class TxtFile(FileExtension):
     ----------
     fn : str
         filename of the file
+    codec : str | None
+        compression codec chosen by the file suffix
     
     Methods
     -------
@@ -54,7 +56,7 @@ class TxtFile(FileExtension):
 
         data = None
         try:
-            with open(self.fn, 'r') as f:
+            with self.open('r') as f:
                 data = f.readlines()
 
         except IOError as e:
@@ -87,7 +89,7 @@ class TxtFile(FileExtension):
 
         saved = False
         try: 
-            with open(self.fn, 'w') as f:
+            with self.open('w') as f:
                 f.writelines(line + '\n' for line in data)
                 saved = True
         
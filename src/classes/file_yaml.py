@@ -20,6 +20,8 @@ class YAMLFile(FileExtension):
     ----------
     fn : str
         filename of the file
+    codec : str | None
+        compression codec chosen by the file suffix
     
     Methods
     -------
@@ -55,7 +57,7 @@ class YAMLFile(FileExtension):
 
         data = None
         try:
-            with open(self.fn, 'r') as f:
+            with self.open('r') as f:
                 data = yaml.safe_load(f)
 
         except IOError as e:
@@ -88,7 +90,7 @@ class YAMLFile(FileExtension):
 
         saved = False
         try: 
-            with open(self.fn, 'w') as f:
+            with self.open('w') as f:
                 yaml.dump(data, f)
                 saved = True
         
@@ -0,0 +1,417 @@
+"""history_store.py
+
+Contains a class that keeps a versioned history of villager data.
+"""
+
+# python native
+import os, json, copy, hashlib
+from datetime import datetime
+from typing import Any
+
+# in project
+from .file_handler import FileHandler, SCRIPT_ROOT
+from .file_json import JSONFile
+from .useful_methods import *
+
+
+# constants
+KEYFRAME_INTERVAL = 16  # every nth snapshot lists every profession
+
+
+class HistoryStore:
+    """
+    A class that keeps every version of the villager data as a snapshot.
+
+    Data is stored content-addressed, like a git object store: each
+    exchange is an object named by its hash, and each profession is a
+    tree object listing the hashes of its exchanges by level. Objects
+    shared between snapshots are only stored once.
+
+    A snapshot records only the professions whose tree changed since
+    the snapshot before it (a delta), except every KEYFRAME_INTERVAL
+    snapshots, which record every tree (a keyframe), so that any
+    snapshot is rebuilt from at most KEYFRAME_INTERVAL records.
+
+    Attributes
+    ----------
+    path : str
+        directory the history is stored in
+    log : JSONFile
+        handles file IO of the list of snapshots
+
+    Methods
+    -------
+    @staticmethod
+    object_hash(obj):
+        gets the hash an object is stored under
+    snapshots():
+        gets the list of snapshots, oldest first
+    add(data, label=''):
+        stores the data as a new snapshot, if it changed
+    read(snapshot=None):
+        rebuilds the villager data of a snapshot
+    exchange_history(profession, item):
+        finds how an exchange changed across the snapshots
+    """
+
+    def __init__(self, dir: str='data/history') -> None:
+        """
+        Creates HistoryStore instance.
+
+        Parameters
+        ----------
+        dir : str, default='data/history'
+            directory to store the history in
+        """
+
+        self.path = os.path.join(SCRIPT_ROOT, dir)
+        self.log = JSONFile(os.path.join(self.path, 'snapshots.json'))
+        self._objects = {}   # objects already read, they never change
+        self._stored = set() # hashes of objects known to be stored
+
+
+    @staticmethod
+    def object_hash(obj: Any) -> str:
+        """
+        Gets the hash an object is stored under.
+
+        Parameters
+        ----------
+        obj : Any
+            the object, must be JSON serializable
+
+        Returns
+        -------
+        str
+            sha256 hash of the object
+        """
+
+        text = json.dumps(obj, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+
+    def _object_file(self, digest: str) -> JSONFile:
+        """
+        Gets the file of an object, in a directory named by the first
+        two characters of its hash.
+
+        Parameters
+        ----------
+        digest : str
+            the hash of the object
+
+        Returns
+        -------
+        JSONFile
+            handles file IO of the object
+        """
+
+        return JSONFile(os.path.join(self.path, 'objects',
+                                     digest[:2], digest[2:] + '.json'))
+
+
+    def _put(self, obj: Any) -> str | None:
+        """
+        Stores an object, unless an object with its hash is stored.
+
+        Parameters
+        ----------
+        obj : Any
+            the object, must be JSON serializable
+
+        Returns
+        -------
+        str
+            the hash of the object |
+            None, if there was an error writing it
+        """
+
+        digest = HistoryStore.object_hash(obj)
+        file = self._object_file(digest)
+        if digest not in self._stored and not os.path.isfile(file.fn):
+            os.makedirs(os.path.dirname(file.fn), exist_ok=True)
+            if not FileHandler.atomic_write(file, obj):
+                return None
+
+        self._stored.add(digest)
+        return digest
+
+
+    def _get(self, digest: str) -> Any:
+        """
+        Reads an object.
+
+        Parameters
+        ----------
+        digest : str
+            the hash of the object
+
+        Returns
+        -------
+        Any
+            the object |
+            None, if there was an error reading it
+        """
+
+        if digest not in self._objects:
+            obj = self._object_file(digest).read()
+            if obj is None:
+                return None
+            self._objects[digest] = obj
+
+        return self._objects[digest]
+
+
+    def snapshots(self) -> list[dict[str, Any]]:
+        """
+        Gets the list of snapshots, oldest first.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            the id, time, label and recorded trees of each snapshot
+        """
+
+        if not os.path.isfile(self.log.fn):
+            return []
+
+        return self.log.read() or []
+
+
+    def _trees(self, log: list[dict[str, Any]],
+               index: int) -> dict[str, str]:
+        """
+        Gets the tree of every profession in a snapshot, starting from
+        the keyframe before it and applying each delta after it.
+
+        Parameters
+        ----------
+        log : list[dict[str, Any]]
+            the list of snapshots
+        index : int
+            the position of the snapshot in the list
+
+        Returns
+        -------
+        dict[str, str]
+            the hash of each profession's tree, in wiki order
+        """
+
+        start = index
+        while 'keyframe' not in log[start]:
+            start -= 1
+
+        trees = dict(log[start]['keyframe'])
+        for record in log[start+1 : index+1]:
+            trees.update(record['changed'])
+            trees = {name: trees[name] for name in record['professions']}
+
+        return trees
+
+
+    def add(self, data: list[dict[str, Any]], label: str='') -> str | None:
+        """
+        Stores the data as a new snapshot. Nothing is stored if the data
+        is the same as the latest snapshot's.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data
+        label : str, default=''
+            a description of the snapshot, i.e. the wiki revision
+
+        Returns
+        -------
+        str
+            the id of the snapshot, which is the hash of its trees |
+            None, if there was an error writing it
+        """
+
+        trees = {}
+        for prof in data:
+            tree = {
+                'profession'     : prof['profession'],
+                'job-site-block' : prof['job-site-block'],
+                'trades'         : []
+            }
+            for trade in prof['trades']:
+                exchanges = [self._put(exchange)
+                             for exchange in trade['exchanges']]
+                if None in exchanges:
+                    return None
+                tree['trades'].append({'level'     : trade['level'],
+                                       'exchanges' : exchanges})
+
+            trees[prof['profession']] = self._put(tree)
+            if trees[prof['profession']] is None:
+                return None
+
+        snapshot_id = HistoryStore.object_hash(list(trees.items()))
+
+        log = self.snapshots()
+        if log and log[-1]['id'] == snapshot_id:
+            return snapshot_id
+        previous = self._trees(log, len(log) - 1) if log else {}
+
+        record = {
+            'id'     : snapshot_id,
+            'time'   : datetime.now().isoformat(timespec='seconds'),
+            'label'  : label
+        }
+        if len(log) % KEYFRAME_INTERVAL == 0:
+            record['keyframe'] = list(trees.items())
+        else:
+            record['professions'] = list(trees)
+            record['changed'] = {
+                name: digest for name, digest in trees.items()
+                if previous.get(name) != digest
+            }
+        log.append(record)
+
+        os.makedirs(self.path, exist_ok=True)
+        if not FileHandler.atomic_write(self.log, log):
+            return None
+
+        return snapshot_id
+
+
+    def _find(self, log: list[dict[str, Any]], snapshot: str | None) -> int:
+        """
+        Finds the position of a snapshot in the list of snapshots.
+
+        Parameters
+        ----------
+        log : list[dict[str, Any]]
+            the list of snapshots
+        snapshot : str | None
+            the id of the snapshot, or the start of it, None for the
+            latest snapshot
+
+        Returns
+        -------
+        int
+            the position of the snapshot |
+            -1, if there is no such snapshot
+        """
+
+        if snapshot is None:
+            return len(log) - 1
+
+        for i in range(len(log) - 1, -1, -1):
+            if log[i]['id'].startswith(snapshot):
+                return i
+
+        return -1
+
+
+    def read(self, snapshot: str | None=None
+             ) -> list[dict[str, Any]] | None:
+        """
+        Rebuilds the villager data of a snapshot.
+
+        Parameters
+        ----------
+        snapshot : str | None, default=None
+            the id of the snapshot, or the start of it, None for the
+            latest snapshot
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            the villager data |
+            None, if there is no such snapshot or there was an error
+        """
+
+        log = self.snapshots()
+        index = self._find(log, snapshot)
+        if index == -1:
+            return None
+
+        data = []
+        for digest in self._trees(log, index).values():
+            tree = self._get(digest)
+            if tree is None:
+                return None
+
+            trades = []
+            for trade in tree['trades']:
+                exchanges = [self._get(ex) for ex in trade['exchanges']]
+                if None in exchanges:
+                    return None
+                trades.append({'level'     : trade['level'],
+                               'exchanges' : exchanges})
+
+            data.append({**tree, 'trades': trades})
+
+        # the objects are shared with the cache, which must not change
+        return copy.deepcopy(data)
+
+
+    def exchange_history(self, profession: str,
+                         item: str) -> list[dict[str, Any]]:
+        """
+        Finds how the exchanges of a profession that want or give an
+        item changed across the snapshots. Snapshots where the
+        profession's tree did not change are skipped without reading
+        any objects.
+
+        Parameters
+        ----------
+        profession : str
+            the name of the profession
+        item : str
+            part of the name of an item wanted or given
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            the id, time and label of each snapshot where the matching
+            exchanges changed, along with the level of each exchange
+            and the exchange itself
+        """
+
+        item = item.lower()
+        log = self.snapshots()
+        history = []
+        last_tree = None
+        last_found = []
+
+        trees = {}
+        for record in log:
+            if 'keyframe' in record:
+                trees = dict(record['keyframe'])
+            else:
+                trees.update(record['changed'])
+                trees = {name: trees[name] for name in record['professions']}
+
+            digest = trees.get(profession)
+            if digest == last_tree:
+                continue
+            last_tree = digest
+
+            found = []
+            tree = self._get(digest) if digest is not None else None
+            for trade in tree['trades'] if tree is not None else []:
+                for exchange_hash in trade['exchanges']:
+                    exchange = self._get(exchange_hash)
+                    items = exchange['wanted']['item'] + \
+                            [exchange['given']['item']]
+                    if any(item in name.lower() for name in items):
+                        found.append((trade['level'], exchange_hash))
+
+            if found == last_found:
+                continue
+            last_found = found
+
+            history.append({
+                'id'        : record['id'],
+                'time'      : record['time'],
+                'label'     : record['label'],
+                'exchanges' : [
+                    {'level': level, **copy.deepcopy(self._get(digest))}
+                    for level, digest in found
+                ]
+            })
+
+        return history
@@ -0,0 +1,327 @@
+"""item_catalog.py
+
+Contains a class that gives every traded item a canonical ID.
+"""
+
+# python native
+import re, threading, unicodedata
+from typing import Any
+
+# in project
+from .file_handler import FileHandler
+from .aho_corasick import AhoCorasick
+from .useful_methods import *
+
+
+# constants
+NAMESPACE = 'minecraft'
+NOTE_TEXT = r'\[note \d+\]|\[.*$'  # notes, or a note cut off by the parser
+ID_PATTERN = r'[a-z0-9_.-]+:[a-z0-9_./-]+'
+
+
+def item_id(name: str) -> str:
+    """
+    Makes the namespace ID of an item from its display name, in the
+    style of the game's IDs (i.e. 'Enchanted Book' ->
+    'minecraft:enchanted_book'). Accents, punctuation and leftover note
+    text are dropped, so names that only differ by these share an ID.
+    A name that is already an ID, such as the items of modded trades
+    (i.e. 'create:brass_ingot'), is kept as it is.
+
+    Parameters
+    ----------
+    name : str
+        the display name of the item
+
+    Returns
+    -------
+    str
+        the namespace ID of the item
+    """
+
+    if re.fullmatch(ID_PATTERN, name.strip()):
+        return name.strip()
+
+    text = re.sub(NOTE_TEXT, '', name)
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    slug = re.sub(r'[^a-z0-9]+', '_', text.lower()).strip('_')
+
+    return f'{NAMESPACE}:{slug or "unknown"}'
+
+
+class ItemCatalog:
+    """
+    A class that keeps the catalog of every distinct traded item. Each
+    item has a namespace ID (i.e. 'minecraft:emerald'), a stable integer
+    index in the order it was first seen, a display name and aliases,
+    the lowercase display names it was scraped under.
+
+    Items are looked up by ID, index or alias with a dict, so a lookup
+    takes the same time however many items there are, and a search
+    only matches each distinct item once rather than each exchange.
+
+    Attributes
+    ----------
+    file : FileHandler
+        the file the catalog is stored in
+    items : list[dict[str, Any]]
+        the id, name and aliases of each item, by index
+
+    Methods
+    -------
+    get(key):
+        gets an item by ID, index or alias
+    add(name):
+        adds an item under a display name, if it is not in the catalog
+    add_alias(alias, id):
+        adds another name an item can be looked up by
+    matching(queries):
+        finds the IDs of the items any query refers to
+    assign_ids(data):
+        stores the ID of each item in each exchange
+    save():
+        writes the catalog to its file, if it changed
+    """
+
+    def __init__(self, file: FileHandler) -> None:
+        """
+        Creates ItemCatalog instance.
+
+        Parameters
+        ----------
+        file : FileHandler
+            the file to store the catalog in
+        """
+
+        self.file = file
+        self.items = None
+        self._by_key = {}   # id, index and alias -> item
+        self._changed = False
+        self._lock = threading.Lock()
+
+
+    def _load(self) -> None:
+        """
+        Reads the catalog from its file, the first time it is needed.
+        """
+
+        if self.items is not None:
+            return
+
+        items = self.file.read()
+        self.items = []
+        for item in items or []:
+            self._index(item)
+
+        return
+
+
+    def _index(self, item: dict[str, Any]) -> None:
+        """
+        Adds an item to the catalog and its lookup table.
+
+        Parameters
+        ----------
+        item : dict[str, Any]
+            the id, name and aliases of the item
+        """
+
+        item['index'] = len(self.items)
+        self.items.append(item)
+
+        self._by_key[item['id']] = item
+        self._by_key[item['index']] = item
+        for alias in item['aliases']:
+            self._by_key.setdefault(alias, item)
+
+        return
+
+
+    def get(self, key: str | int) -> dict[str, Any] | None:
+        """
+        Gets an item by ID, index or alias.
+
+        Parameters
+        ----------
+        key : str | int
+            the namespace ID, the index or any alias of the item,
+            aliases in any case
+
+        Returns
+        -------
+        dict[str, Any]
+            the id, index, name and aliases of the item |
+            None, if there is no such item
+        """
+
+        with self._lock:
+            self._load()
+
+        if isinstance(key, str):
+            key = key.strip().lower()
+
+        return self._by_key.get(key)
+
+
+    def add(self, name: str) -> dict[str, Any]:
+        """
+        Adds an item under a display name, if it is not in the catalog.
+        A new display name of an item already in the catalog is added as
+        an alias.
+
+        Parameters
+        ----------
+        name : str
+            the display name of the item
+
+        Returns
+        -------
+        dict[str, Any]
+            the id, index, name and aliases of the item
+        """
+
+        alias = name.strip().lower()
+
+        with self._lock:
+            self._load()
+
+            item = self._by_key.get(alias)
+            if item is not None:
+                return item
+
+            key = item_id(name)
+            item = self._by_key.get(key)
+            if item is None:
+                self._index({'id': key, 'name': name.strip(),
+                             'aliases': [alias]})
+                item = self._by_key[key]
+            else:
+                item['aliases'].append(alias)
+                self._by_key[alias] = item
+            self._changed = True
+
+        return item
+
+
+    def add_alias(self, alias: str, id: str) -> bool:
+        """
+        Adds another name an item can be looked up by.
+
+        Parameters
+        ----------
+        alias : str
+            the other name
+        id : str
+            the namespace ID of the item
+
+        Returns
+        -------
+        bool
+            True,  if the alias was added |
+            False, if there is no such item or the alias is taken
+        """
+
+        alias = alias.strip().lower()
+
+        with self._lock:
+            self._load()
+
+            item = self._by_key.get(id)
+            if item is None or alias in self._by_key:
+                return False
+
+            item['aliases'].append(alias)
+            self._by_key[alias] = item
+            self._changed = True
+
+        return True
+
+
+    def matching(self, queries: tuple[str]) -> set[str]:
+        """
+        Finds the IDs of the items any query refers to: the item with
+        the query as its ID, or every item with the query in one of its
+        aliases (i.e. 'quartz' for 'quartz pillar').
+
+        Parameters
+        ----------
+        queries : tuple[str]
+            the individual search queries, in lowercase
+
+        Returns
+        -------
+        set[str]
+            the namespace IDs of the matching items
+        """
+
+        with self._lock:
+            self._load()
+
+        matcher = AhoCorasick(queries)
+        ids = {item['id'] for item in self.items
+               if any(matcher.matches(alias) for alias in item['aliases'])}
+        ids.update(self._by_key[query]['id'] for query in queries
+                   if re.fullmatch(ID_PATTERN, query)
+                   and query in self._by_key)
+
+        return ids
+
+
+    def assign_ids(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Stores the ID of each item in each exchange, adding items not in
+        the catalog. Equal item names are replaced by a single copy of the
+        string, so they share memory.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data, modified in place
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            the given villager data
+        """
+
+        names = {}
+
+        def intern(name: str) -> tuple[str, str]:
+            if name not in names:
+                names[name] = (name, self.add(name)['id'])
+            return names[name]
+
+        for profession in data:
+            for trade in profession['trades']:
+                for exchange in trade['exchanges']:
+                    wanted, given = exchange['wanted'], exchange['given']
+
+                    wanted_items = [intern(item) for item in wanted['item']]
+                    wanted['item'] = [name for name, _ in wanted_items]
+                    wanted['id'] = [id for _, id in wanted_items]
+                    given['item'], given['id'] = intern(given['item'])
+
+        return data
+
+
+    def save(self) -> bool:
+        """
+        Writes the catalog to its file, if it changed.
+
+        Returns
+        -------
+        bool
+            True,  if the catalog is saved |
+            False, if there was an error writing it
+        """
+
+        with self._lock:
+            if not self._changed:
+                return True
+
+            items = [{'id': item['id'], 'name': item['name'],
+                      'aliases': item['aliases']} for item in self.items]
+            self._changed = not self.file.write(items)
+
+            return not self._changed
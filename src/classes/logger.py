@@ -0,0 +1,274 @@
+"""logger.py
+
+Contains a class that records structured log events as JSON lines,
+buffered in memory and written to a rotating file in the background.
+"""
+
+# python native
+import sys, os, json, atexit, threading
+from datetime import datetime
+from typing import Any
+
+
+# constants
+LEVELS = {
+    'debug'   : 10,
+    'info'    : 20,
+    'warning' : 30,
+    'error'   : 40
+}
+
+
+class Logger:
+    """
+    A class that records log events as lines of JSON. Events are kept
+    in a buffer and written by a background thread, so logging does not
+    open the file on every call. The file is rotated once it reaches
+    max_bytes. Events at or above echo_level are also printed, in the
+    format of print_internal. Loggers without an echo_level print from
+    default_echo_level, which is raised to warnings while the script
+    is not interactive, see set_interactive.
+
+    Nothing is written, and no thread is started, until the first event
+    is logged.
+
+    Attributes
+    ----------
+    path : str
+        path of the log file
+    level : int
+        events below this level are ignored
+    echo_level : int | None
+        events at or above this level are printed, None to use
+        default_echo_level
+    default_echo_level : int
+        echo_level of loggers not given one, shared by every logger
+    max_bytes : int
+        size the file is rotated at
+    backups : int
+        number of rotated files kept, i.e. script.log.1
+    flush_interval : float
+        seconds between background writes
+    buffer_size : int
+        number of buffered events that causes an early write
+
+    Methods
+    -------
+    log(level, message, echo=None, **fields):
+        records an event
+    debug(message, **fields), info(...), warning(...), error(...):
+        records an event at that level
+    flush():
+        writes the buffered events to the file
+    close():
+        stops the background thread and writes the remaining events
+    """
+
+    default_echo_level = LEVELS['info']
+
+    def __init__(self, path: str, level: str='info',
+                 echo_level: str | None=None, max_bytes: int=1_000_000,
+                 backups: int=3, flush_interval: float=1.0,
+                 buffer_size: int=1000) -> None:
+        """
+        Creates Logger instance.
+
+        Parameters
+        ----------
+        path : str
+            path of the log file
+        level : str, default='info'
+            name of the lowest level recorded
+        echo_level : str | None, default=None
+            name of the lowest level printed, None to use
+            default_echo_level
+        max_bytes : int, default=1_000_000
+            size the file is rotated at
+        backups : int, default=3
+            number of rotated files kept
+        flush_interval : float, default=1.0
+            seconds between background writes
+        buffer_size : int, default=1000
+            number of buffered events that causes an early write
+        """
+
+        self.path = path
+        self.level = LEVELS[level]
+        self.echo_level = None if echo_level is None else LEVELS[echo_level]
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.buffer_size = buffer_size
+
+        self._buffer = []
+        self._lock = threading.Lock()        # guards the buffer
+        self._write_lock = threading.Lock()  # guards the file
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+
+    def log(self, level: str, message: Any, echo: bool | None=None,
+            **fields: Any) -> None:
+        """
+        Records an event.
+
+        Parameters
+        ----------
+        level : str
+            name of the level of the event
+        message : Any
+            description of the event
+        echo : bool | None, default=None
+            True,  to print the event |
+            False, to only record it |
+            None,  to print it if it is at or above echo_level
+        **fields : Any
+            additional data of the event, must be JSON serializable
+            or convertible to a string
+        """
+
+        number = LEVELS[level]
+        echo_level = Logger.default_echo_level if self.echo_level is None \
+                     else self.echo_level
+        if echo if echo is not None else number >= echo_level:
+            prefix = '[ERROR]' if number >= LEVELS['error'] else ']'
+            print(f'{prefix} {message}')
+
+        if number < self.level:
+            return
+
+        record = {
+            'time'    : datetime.now().isoformat(timespec='milliseconds'),
+            'level'   : level,
+            'message' : str(message),
+            **fields
+        }
+        line = json.dumps(record, ensure_ascii=False, default=str)
+
+        with self._lock:
+            self._buffer.append(line)
+            full = len(self._buffer) >= self.buffer_size
+            if self._thread is None:
+                self._start()
+
+        if full:
+            self._wake.set()
+
+        return
+
+
+    def debug(self, message: Any, **fields: Any) -> None:
+        """Records an event at the debug level, see log()"""
+        self.log('debug', message, **fields)
+
+
+    def info(self, message: Any, **fields: Any) -> None:
+        """Records an event at the info level, see log()"""
+        self.log('info', message, **fields)
+
+
+    def warning(self, message: Any, **fields: Any) -> None:
+        """Records an event at the warning level, see log()"""
+        self.log('warning', message, **fields)
+
+
+    def error(self, message: Any, **fields: Any) -> None:
+        """Records an event at the error level, see log()"""
+        self.log('error', message, **fields)
+
+
+    def _start(self) -> None:
+        """
+        Starts the background thread. Called with the buffer locked.
+        """
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        return
+
+
+    def _run(self) -> None:
+        """
+        Writes the buffered events every flush_interval seconds, or
+        sooner if the buffer fills, until closed.
+        """
+
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+        return
+
+
+    def flush(self) -> None:
+        """
+        Writes the buffered events to the file, rotating it first if
+        it would grow past max_bytes.
+        """
+
+        with self._lock:
+            lines, self._buffer = self._buffer, []
+
+        if not lines:
+            return
+
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+
+        with self._write_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                if os.path.isfile(self.path) and \
+                   os.path.getsize(self.path) + len(data) > self.max_bytes:
+                    self._rotate()
+
+                with open(self.path, 'ab') as f:
+                    f.write(data)
+
+            except OSError as e:
+                # handle_error logs through here, so report directly
+                print(f'[ERROR] could not write log {self.path}: {e}',
+                      file=sys.stderr)
+
+        return
+
+
+    def _rotate(self) -> None:
+        """
+        Renames the file to path.1, shifting older files along and
+        removing the oldest. Called with the file locked.
+        """
+
+        for i in range(self.backups, 0, -1):
+            older = f'{self.path}.{i-1}' if i > 1 else self.path
+            if os.path.isfile(older):
+                os.replace(older, f'{self.path}.{i}')
+
+        if self.backups == 0:
+            os.remove(self.path)
+
+        return
+
+
+    def close(self) -> None:
+        """
+        Stops the background thread and writes the remaining events.
+        """
+
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None and \
+           self._thread is not threading.current_thread():
+            self._thread.join()
+
+        self.flush()
+        return
+
+
+
+# log of the script, in the data directory beside the other files,
+# found from this file so it is the same however the script is run
+LOG = Logger(os.path.join(os.path.dirname(os.path.dirname(
+                 os.path.abspath(__file__))), 'data', 'script.log'))
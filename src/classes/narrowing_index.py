@@ -0,0 +1,88 @@
+"""narrowing_index.py
+
+Contains a class that filters rows of text as a query is typed, one
+keystroke at a time.
+"""
+
+
+class NarrowingIndex:
+    """
+    A class that finds the rows containing every word of a query, for
+    a query that changes a keystroke at a time.
+
+    A row that contains every word of a query also contains every word
+    of any query the query starts with, so the matches of a longer
+    query are always among the matches of a shorter one. The matches of
+    each query typed are kept on a stack, so typing a character only
+    checks the rows the last query matched, and deleting one goes back
+    to matches already found. Only a query that shares no start with
+    the stack scans every row.
+
+    Attributes
+    ----------
+    texts : list[str]
+        the lowercase text searched of each row
+    stack : list[tuple[str, list[int]]]
+        each query typed, shortest first, with the rows it matched
+
+    Methods
+    -------
+    filter(query):
+        finds the rows that contain every word of a query
+    """
+
+    def __init__(self, texts: list[str]) -> None:
+        """
+        Creates NarrowingIndex instance.
+
+        Parameters
+        ----------
+        texts : list[str]
+            the text searched of each row
+        """
+
+        self.texts = [text.lower() for text in texts]
+        self.stack = [('', list(range(len(self.texts))))]
+
+
+    def filter(self, query: str) -> list[int]:
+        """
+        Finds the rows that contain every word of a query.
+
+        Parameters
+        ----------
+        query : str
+            the query, in any case
+
+        Returns
+        -------
+        list[int]
+            the positions of the matching rows, in order
+        """
+
+        query = query.lower()
+
+        # go back to the longest query typed that this one starts with,
+        # the empty query always matches every row
+        while not query.startswith(self.stack[-1][0]):
+            self.stack.pop()
+
+        previous, rows = self.stack[-1]
+        if query == previous:
+            return rows
+
+        # words of the last query are in every row it matched, so only
+        # the words that are new or longer need checking
+        checked = set(previous.split())
+        words = [word for word in query.split() if word not in checked]
+        texts = self.texts
+        if len(words) == 1:
+            word = words[0]
+            rows = [row for row in rows if word in texts[row]]
+        elif words:
+            rows = [row for row in rows
+                    if all(word in texts[row] for word in words)]
+
+        self.stack.append((query, rows))
+
+        return rows
@@ -0,0 +1,189 @@
+"""page_scanner.py
+
+Contains a class that scans the Trading page for its job sites and
+trade tables without building the DOM of the whole page.
+"""
+
+# python native
+import re
+from html.parser import HTMLParser
+
+
+# constants
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+                 'link', 'meta', 'param', 'source', 'track', 'wbr'}
+
+
+class PageScanner(HTMLParser):
+    """
+    A class that scans a page as a stream of tags, keeping only a stack
+    of the open tags, and collects:
+    * the text of each job site, matching the selector
+      'h3 ~ p > a[href^="/wiki/"] > span > span.sprite-text'
+    * the raw HTML of each table.wikitable, in page order
+
+    Each table can then be parsed on its own and released, so the DOM
+    of the page never exists at once.
+
+    Attributes
+    ----------
+    job_sites : list[str]
+        the lowercase text of each job site
+    tables : list[str]
+        the HTML of each table.wikitable
+
+    Methods
+    -------
+    scan(text):
+        scans a page
+    """
+
+    def __init__(self) -> None:
+        """
+        Creates PageScanner instance.
+        """
+
+        super().__init__(convert_charrefs=True)
+        self.job_sites = []
+        self.tables = []
+
+        self._text = ''
+        self._line_starts = [0]
+        self._stack = [{'tag': None, 'attrs': {}, 'seen-h3': False}]
+        self._job_text = None
+
+
+    def scan(self, text: str) -> None:
+        """
+        Scans a page.
+
+        Parameters
+        ----------
+        text : str
+            the HTML of the page
+        """
+
+        self._text = text
+        self._line_starts = [0] + [match.end()
+                                   for match in re.finditer('\n', text)]
+
+        self.feed(text)
+        self.close()
+
+        # tables left open run to the end of the page
+        while len(self._stack) > 1:
+            self._pop(len(text))
+
+        self._text = ''
+        self._line_starts = [0]
+        return
+
+
+    def _offset(self) -> int:
+        """
+        Gets the position in the page of the tag being handled.
+
+        Returns
+        -------
+        int
+            the index of the tag's first character
+        """
+
+        line, column = self.getpos()
+        return self._line_starts[line - 1] + column
+
+
+    def _is_job_site(self) -> bool:
+        """
+        Determines if the open tags end with a job site's text span.
+
+        Returns
+        -------
+        bool
+            True,  if the innermost tag is a job site's text |
+            False, otherwise
+        """
+
+        if len(self._stack) < 5:
+            return False
+
+        p, a, span, text = self._stack[-4:]
+        return p['tag'] == 'p' and p['after-h3'] \
+               and a['tag'] == 'a' \
+               and (a['attrs'].get('href') or '').startswith('/wiki/') \
+               and span['tag'] == 'span' and text['tag'] == 'span' \
+               and 'sprite-text' in (text['attrs'].get('class') or '').split()
+
+
+    def handle_starttag(self, tag: str, attrs: list[tuple]) -> None:
+        parent = self._stack[-1]
+        if tag == 'h3':
+            parent['seen-h3'] = True
+
+        if tag in VOID_ELEMENTS:
+            return
+
+        attrs = dict(attrs)
+        frame = {'tag'      : tag,
+                 'attrs'    : attrs,
+                 'seen-h3'  : False,
+                 'after-h3' : parent['seen-h3']}
+
+        if tag == 'table' and \
+           'wikitable' in (attrs.get('class') or '').split():
+            frame['table'] = len(self.tables)
+            frame['start'] = self._offset()
+            self.tables.append('')
+
+        self._stack.append(frame)
+
+        if self._job_text is None and self._is_job_site():
+            frame['job-site'] = True
+            self._job_text = []
+
+        return
+
+
+    def handle_data(self, data: str) -> None:
+        if self._job_text is not None:
+            self._job_text.append(data)
+        return
+
+
+    def handle_endtag(self, tag: str) -> None:
+        # close any tags left open inside this one, as browsers do
+        for depth in range(len(self._stack) - 1, 0, -1):
+            if self._stack[depth]['tag'] == tag:
+                break
+        else:
+            return
+
+        start = self._offset()
+        end = self._text.find('>', start) + 1 or len(self._text)
+        while len(self._stack) > depth + 1:
+            self._pop(start)
+        self._pop(end)
+
+        return
+
+
+    def _pop(self, end: int) -> None:
+        """
+        Closes the innermost open tag.
+
+        Parameters
+        ----------
+        end : int
+            the position in the page the tag ends at
+        """
+
+        frame = self._stack.pop()
+
+        if frame.get('job-site'):
+            self.job_sites.append(''.join(self._job_text).lower())
+            self._job_text = None
+
+        if 'table' in frame:
+            self.tables[frame['table']] = self._text[frame['start'] : end]
+
+        return
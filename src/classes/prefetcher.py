@@ -0,0 +1,197 @@
+"""prefetcher.py
+
+Contains a class that runs a task in the background, with progress
+reporting and cancellation.
+"""
+
+# python native
+import time, threading
+from typing import Any, Callable
+
+
+class Prefetcher:
+    """
+    A class that runs a task on a background thread, so its result is
+    ready (or closer to ready) by the time it is needed.
+
+    The task is given the Prefetcher, and should call report() as it
+    progresses and return early if cancelled() becomes True.
+
+    Attributes
+    ----------
+    stage : str
+        description of what the task is currently doing
+    progress : float | None
+        fraction of the current stage that is done, None if unknown
+    result : Any
+        the value the task returned, None until it is done
+    error : Exception | None
+        the exception the task raised, if any
+    finished : float | None
+        time.monotonic() when the task finished, None until it does
+
+    Methods
+    -------
+    start():
+        starts the task on a background thread
+    report(stage, progress=None):
+        updates the progress of the task
+    cancel():
+        asks the task to stop
+    cancelled():
+        determines if the task was asked to stop
+    done():
+        determines if the task has finished
+    age():
+        gets the seconds since the task finished
+    wait(show_progress=True):
+        waits for the task to finish and returns its result
+    """
+
+    def __init__(self, task: Callable[['Prefetcher'], Any]) -> None:
+        """
+        Creates Prefetcher instance.
+
+        Parameters
+        ----------
+        task : Callable[[Prefetcher], Any]
+            the task to run, given this Prefetcher
+        """
+
+        self.stage = 'waiting to start'
+        self.progress = None
+        self.result = None
+        self.error = None
+        self.finished = None
+
+        self._task = task
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+
+    def _run(self) -> None:
+        """
+        Runs the task, storing its result or the exception it raised.
+        """
+
+        try:
+            self.result = self._task(self)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.finished = time.monotonic()
+            self._done.set()
+
+        return
+
+
+    def start(self) -> None:
+        """
+        Starts the task on a background thread.
+        """
+
+        self._thread.start()
+        return
+
+
+    def report(self, stage: str, progress: float | None=None) -> None:
+        """
+        Updates the progress of the task.
+
+        Parameters
+        ----------
+        stage : str
+            description of what the task is currently doing
+        progress : float | None, default=None
+            fraction of the stage that is done, None if unknown
+        """
+
+        self.stage = stage
+        self.progress = progress
+        return
+
+
+    def cancel(self) -> None:
+        """
+        Asks the task to stop.
+        """
+
+        self._cancel.set()
+        return
+
+
+    def cancelled(self) -> bool:
+        """
+        Determines if the task was asked to stop.
+
+        Returns
+        -------
+        bool
+            True,  if the task was cancelled |
+            False, otherwise
+        """
+
+        return self._cancel.is_set()
+
+
+    def done(self) -> bool:
+        """
+        Determines if the task has finished.
+
+        Returns
+        -------
+        bool
+            True,  if the task has finished |
+            False, otherwise
+        """
+
+        return self._done.is_set()
+
+
+    def age(self) -> float:
+        """
+        Gets the seconds since the task finished.
+
+        Returns
+        -------
+        float
+            the seconds since the task finished, 0 if it has not
+        """
+
+        if self.finished is None:
+            return 0
+        return time.monotonic() - self.finished
+
+
+    def wait(self, show_progress: bool=True) -> Any:
+        """
+        Waits for the task to finish, displaying its progress.
+
+        Parameters
+        ----------
+        show_progress : bool, default=True
+            True,  if progress should be displayed while waiting |
+            False, otherwise
+
+        Returns
+        -------
+        Any
+            the value the task returned |
+            None, if the task raised an exception or was cancelled
+        """
+
+        spinner = '|/-\\'
+        ticks = 0
+        while not self._done.wait(0.1):
+            if show_progress:
+                percent = '' if self.progress is None \
+                          else f' ({self.progress:.0%})'
+                print(f'\r] {self.stage}{percent} {spinner[ticks % 4]}  ',
+                      end='', flush=True)
+                ticks += 1
+
+        if ticks:
+            print(f'\r] {self.stage} done' + ' ' * 10)
+
+        return self.result
@@ -0,0 +1,387 @@
+"""relevance_index.py
+
+Contains a class that ranks trades by how relevant they are to a
+search, with BM25 scores precomputed when the data is saved.
+"""
+
+# python native
+import re, math, heapq, bisect, threading, unicodedata
+from typing import Any
+
+# in project
+from .file_handler import FileHandler
+from .item_catalog import ID_PATTERN
+
+
+# constants
+K1 = 1.2              # how quickly repeating a word stops adding to a score
+B = 0.75              # how much longer fields are penalized
+FIELDS = ('wanted', 'given', 'profession')
+FIELD_WEIGHT = {      # weight of the profession and level of a trade
+    'profession' : 0.5
+}
+
+
+def terms(text: str) -> list[str]:
+    """
+    Splits text into lowercase words, without accents or punctuation.
+
+    Parameters
+    ----------
+    text : str
+        the text
+
+    Returns
+    -------
+    list[str]
+        the words of the text
+    """
+
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return re.findall(r'[a-z0-9]+', text)
+
+
+class RelevanceIndex:
+    """
+    A class that keeps an inverted index of the words of every exchange:
+    the items wanted, the item given, and the profession and level of
+    the trade, each a separate field. The catalog IDs of the items are
+    indexed as words of their own (i.e. 'minecraft:book'), so a query
+    that is an ID only finds that item.
+
+    The BM25 score of each word in each exchange depends only on the
+    data, so it is computed once when the data is saved, and stored
+    with the exchange in the word's posting list. Ranking a search then
+    only adds up the stored scores of the postings of its words, and
+    only the best exchanges are copied into results.
+
+    Attributes
+    ----------
+    file : FileHandler
+        the file the index is stored in
+
+    Methods
+    -------
+    build(data, fingerprint):
+        computes and saves the index of the villager data
+    load(fingerprint):
+        loads the saved index, if it is of the current data
+    rank(field, queries, limit, candidates):
+        orders the exchanges matching the queries by relevance
+    top(data, field, queries, limit, candidates):
+        gets the villager data of the most relevant exchanges, best first
+    """
+
+    def __init__(self, file: FileHandler) -> None:
+        """
+        Creates RelevanceIndex instance.
+
+        Parameters
+        ----------
+        file : FileHandler
+            the file to store the index in
+        """
+
+        self.file = file
+        self._index = None  # the loaded index, replaced as a whole
+        self._lock = threading.Lock()
+
+
+    def build(self, data: list[dict[str, Any]],
+              fingerprint: str | None) -> bool:
+        """
+        Computes the BM25 score of every word of every exchange, and
+        saves the index.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data
+        fingerprint : str | None
+            fingerprint of the saved data, see FileHandler
+
+        Returns
+        -------
+        bool
+            True,  if the index was saved |
+            False, otherwise
+        """
+
+        # the same items are traded many times, so each is split once
+        split = {}
+        def item_terms(items: list[str]) -> list[str]:
+            words = []
+            for item in items:
+                if item not in split:
+                    split[item] = terms(item)
+                words.extend(split[item])
+            return words
+
+        docs = []
+        words = {field: [] for field in FIELDS}
+        for p, profession in enumerate(data):
+            for t, trade in enumerate(profession['trades']):
+                about = terms(profession['profession'] + ' ' + trade['level'])
+                for e, exchange in enumerate(trade['exchanges']):
+                    docs.append([p, t, e])
+                    wanted, given = exchange['wanted'], exchange['given']
+                    words['wanted'].append(item_terms(wanted['item']) +
+                                           wanted.get('id', []))
+                    words['given'].append(item_terms([given['item']]) +
+                                          ([given['id']] if 'id' in given
+                                           else []))
+                    words['profession'].append(about)
+
+        fields = {}
+        for field, fields_words in words.items():
+            # number of exchanges each word is in, and the average length
+            frequency = {}
+            for doc_words in fields_words:
+                for word in set(doc_words):
+                    frequency[word] = frequency.get(word, 0) + 1
+            average = sum(map(len, fields_words)) / len(docs) if docs else 0
+
+            postings = {}
+            for doc, doc_words in enumerate(fields_words):
+                norm = K1 * (1 - B + B * len(doc_words) / (average or 1))
+                counts = {}
+                for word in doc_words:
+                    counts[word] = counts.get(word, 0) + 1
+                for word, count in counts.items():
+                    df = frequency[word]
+                    idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+                    score = idf * count * (K1 + 1) / (count + norm)
+                    posting = postings.setdefault(word, [[], []])
+                    posting[0].append(doc)
+                    posting[1].append(round(score, 4))
+            fields[field] = postings
+
+        index = {
+            'fingerprint' : fingerprint,
+            'docs'        : docs,
+            'fields'      : fields
+        }
+        saved = self.file.write(index)
+        with self._lock:
+            self._index = self._prepare(index)
+
+        return saved
+
+
+    @staticmethod
+    def _prepare(index: dict[str, Any]) -> dict[str, Any]:
+        """
+        Adds the sorted words of each field to an index, to find words
+        by their start, and the number of each exchange by its position.
+
+        Parameters
+        ----------
+        index : dict[str, Any]
+            the index, as saved
+
+        Returns
+        -------
+        dict[str, Any]
+            the index, with the words of each field under 'words' and
+            the exchanges by position under 'positions'
+        """
+
+        index['words'] = {field: sorted(postings)
+                          for field, postings in index['fields'].items()}
+        index['positions'] = {tuple(doc): i
+                              for i, doc in enumerate(index['docs'])}
+        return index
+
+
+    def load(self, fingerprint: str | None) -> bool:
+        """
+        Loads the saved index, unless it is already loaded.
+
+        Parameters
+        ----------
+        fingerprint : str | None
+            fingerprint of the saved data, see FileHandler
+
+        Returns
+        -------
+        bool
+            True,  if the loaded index is of the current data |
+            False, if it is out of date or there is none
+        """
+
+        if fingerprint is None:
+            return False
+
+        with self._lock:
+            index = self._index
+            if index is None or index['fingerprint'] != fingerprint:
+                index = self.file.read()
+                if not isinstance(index, dict) or \
+                   index.get('fingerprint') != fingerprint:
+                    return False
+                self._index = self._prepare(index)
+
+        return True
+
+
+    @staticmethod
+    def _matches(index: dict[str, Any], field: str, word: str) -> list[str]:
+        """
+        Finds the words of a field a query word matches: the word
+        itself if it is a whole word of the field, otherwise the words
+        it starts, so 'ench' matches 'enchanted', but 'book' does not
+        match 'bookshelf'.
+
+        Parameters
+        ----------
+        index : dict[str, Any]
+            the loaded index
+        field : str
+            the field
+        word : str
+            the query word
+
+        Returns
+        -------
+        list[str]
+            the matching words of the field
+        """
+
+        if word in index['fields'][field]:
+            return [word]
+
+        vocabulary = index['words'][field]
+        start = bisect.bisect_left(vocabulary, word)
+        end = bisect.bisect_left(vocabulary, word + '{')
+        # a word only starts an ID if it has a namespace
+        return [match for match in vocabulary[start:end]
+                if ':' in word or ':' not in match]
+
+
+    def rank(self, field: str, queries: tuple[str],
+             limit: int | None=None,
+             candidates: set[tuple[int, int, int]] | None=None
+             ) -> list[tuple[int, int, int]]:
+        """
+        Orders the exchanges that match the queries, most relevant
+        first, by the sum of the scores of the query words in the field
+        searched and in the profession and level.
+
+        The matches are the candidates if given (i.e. the trades a
+        filter found), otherwise the exchanges whose items match every
+        word of any query, see _matches. The profession and level only
+        order the matches, they do not find any.
+
+        Parameters
+        ----------
+        field : str
+            'wanted' or 'given', the items searched
+        queries : tuple[str]
+            the individual search queries
+        limit : int | None, default=None
+            the number of exchanges to find, None for every match
+        candidates : set[tuple[int, int, int]] | None, default=None
+            the positions of the profession, trade and exchange of the
+            matches, None to find them with the index
+
+        Returns
+        -------
+        list[tuple[int, int, int]]
+            the positions of the profession, trade and exchange of each
+            match, best first, ties in the order of the data
+        """
+
+        index = self._index
+        if index is None:
+            return []
+
+        query_words = []
+        for query in queries:
+            query = query.strip().lower()
+            query_words.append([query] if re.fullmatch(ID_PATTERN, query)
+                               else terms(query))
+
+        if candidates is not None:
+            positions = index['positions']
+            found = {positions[doc] for doc in candidates if doc in positions}
+        else:
+            # every word of a query must match, any query can
+            found = set()
+            postings = index['fields'][field]
+            for words in query_words:
+                docs = None
+                for word in words:
+                    word_docs = {doc for match in
+                                 self._matches(index, field, word)
+                                 for doc in postings[match][0]}
+                    docs = word_docs if docs is None else docs & word_docs
+                found |= docs or set()
+
+        scores = dict.fromkeys(found, 0)
+        for name in (field, 'profession'):
+            weight = FIELD_WEIGHT.get(name, 1)
+            postings = index['fields'][name]
+            for word in {word for words in query_words for word in words}:
+                for match in self._matches(index, name, word):
+                    for doc, score in zip(*postings[match]):
+                        if doc in scores:
+                            scores[doc] += weight * score
+
+        # only the best exchanges are sorted
+        key = lambda item: (item[1], -item[0])
+        if limit:
+            best = heapq.nlargest(limit, scores.items(), key=key)
+        else:
+            best = sorted(scores.items(), key=key, reverse=True)
+
+        docs = index['docs']
+        return [tuple(docs[doc]) for doc, _ in best]
+
+
+    def top(self, data: list[dict[str, Any]], field: str,
+            queries: tuple[str], limit: int | None=None,
+            candidates: set[tuple[int, int, int]] | None=None
+            ) -> list[dict[str, Any]]:
+        """
+        Gets the villager data of the exchanges most relevant to the
+        queries, best first. Exchanges next to each other of the same
+        profession and level are kept together under one heading.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data the index was built from
+        field : str
+            'wanted' or 'given', the items searched
+        queries : tuple[str]
+            the individual search queries
+        limit : int | None, default=None
+            the number of exchanges to get, None for every match
+        candidates : set[tuple[int, int, int]] | None, default=None
+            the positions of the matches, see rank
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            the villager data of the matching exchanges
+        """
+
+        results = []
+        last = None
+        for p, t, e in self.rank(field, queries, limit, candidates):
+            profession = data[p]
+            trade = profession['trades'][t]
+            if last != (p, t):
+                results.append({
+                    'profession'     : profession['profession'],
+                    'job-site-block' : profession['job-site-block'],
+                    'trades'         : [{
+                        'level'     : trade['level'],
+                        'exchanges' : []
+                    }]
+                })
+                last = (p, t)
+            results[-1]['trades'][0]['exchanges'].append(trade['exchanges'][e])
+
+        return results
@@ -0,0 +1,513 @@
+"""result_views.py
+
+Contains a class that sorts and groups villager data for display, with
+the sort keys and orders precomputed when the data is saved.
+"""
+
+# python native
+import re, gc, threading
+from typing import Any
+
+# in project
+from .file_handler import FileHandler
+
+
+# constants
+# each sort, the text of an exchange its value is read from, and
+# whether the highest values come first
+SORTS = {
+    'default' : None,
+    'xp'      : (lambda exchange: exchange['xp-to-villager'], True),
+    'price'   : (lambda exchange: '|'.join(
+                     exchange['wanted']['default-quantity']), False),
+    'uses'    : (lambda exchange: exchange['trades-until-disabled'], True)
+}
+GROUPS = ('profession', 'given', 'level', 'none')
+NUMBER = r'\d+(?:\.\d+)?'
+
+
+def sort_value(text: str) -> float | None:
+    """
+    Reads the value to sort by from the text of an exchange: the first
+    number of each part separated by '|', added up (i.e. the item
+    counts of a price, '10-20|1' -> 11).
+
+    Parameters
+    ----------
+    text : str
+        the text, see SORTS
+
+    Returns
+    -------
+    float
+        the value |
+        None, if the text has no numbers
+    """
+
+    numbers = [re.search(NUMBER, part) for part in str(text).split('|')]
+    numbers = [float(number.group()) for number in numbers if number]
+
+    return sum(numbers) if numbers else None
+
+
+class ResultViews:
+    """
+    A class that sorts villager data by the xp, price or uses of its
+    exchanges, and groups it by profession, item given or level.
+
+    Each exchange's value to sort by is read from its text when the
+    data is saved, as is the order of every exchange by each sort, and
+    the order of the groups. Sorting the whole saved data, when the
+    caller says that is what it is given, then walks the saved order
+    without parsing or sorting, and sorting any other data (i.e. search
+    results) only looks up the saved values. Values missing from the
+    saved views (i.e. of data fetched but not yet saved) are read from
+    their text.
+
+    Attributes
+    ----------
+    file : FileHandler
+        the file the views are stored in
+
+    Methods
+    -------
+    build(data, fingerprint):
+        computes and saves the sort keys, orders and groups of the data
+    load(fingerprint):
+        loads the saved views, if they are of the current data
+    arrange(villagers, sort, group, whole):
+        sorts and groups villager data
+    """
+
+    def __init__(self, file: FileHandler) -> None:
+        """
+        Creates ResultViews instance.
+
+        Parameters
+        ----------
+        file : FileHandler
+            the file to store the views in
+        """
+
+        self.file = file
+        self._views = None  # the loaded views, replaced as a whole
+        self._lock = threading.Lock()
+
+
+    def build(self, data: list[dict[str, Any]],
+              fingerprint: str | None) -> bool:
+        """
+        Computes the value of every exchange by each sort, the order of
+        every exchange by each sort, and the order of the groups, and
+        saves them.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data
+        fingerprint : str | None
+            fingerprint of the saved data, see FileHandler
+
+        Returns
+        -------
+        bool
+            True,  if the views were saved |
+            False, otherwise
+        """
+
+        docs = [(p, t, e, exchange)
+                for p, profession in enumerate(data)
+                for t, trade in enumerate(profession['trades'])
+                for e, exchange in enumerate(trade['exchanges'])]
+
+        values, orders = {}, {}
+        for sort, spec in SORTS.items():
+            if spec is None:
+                continue
+            text, descending = spec
+            texts = [text(doc[3]) for doc in docs]
+            values[sort] = {raw: sort_value(raw) for raw in set(texts)}
+            key = self._key(values[sort], descending)
+            ranked = sorted(range(len(docs)), key=lambda i: key(texts[i]))
+            orders[sort] = [docs[i][:3] for i in ranked]
+
+        given = {doc[3]['given']['item'] for doc in docs}
+        levels = [trade['level'] for profession in data
+                  for trade in profession['trades']]
+        views = {
+            'fingerprint' : fingerprint,
+            'shape'       : self._shape(data),
+            'values'      : values,
+            'orders'      : orders,
+            'groups'      : {
+                'given' : sorted(given, key=str.casefold),
+                'level' : list(dict.fromkeys(levels))
+            }
+        }
+
+        saved = self.file.write(views)
+        with self._lock:
+            self._views = self._prepare(views)
+
+        return saved
+
+
+    @staticmethod
+    def _shape(villagers: list[dict[str, Any]]) -> list[list[int]]:
+        """
+        Gets the number of exchanges of each trade of each profession.
+
+        Parameters
+        ----------
+        villagers : list[dict[str, Any]]
+            the villager data
+
+        Returns
+        -------
+        list[list[int]]
+            the number of exchanges of each trade, by profession
+        """
+
+        return [[len(trade['exchanges']) for trade in profession['trades']]
+                for profession in villagers]
+
+
+    @staticmethod
+    def _prepare(views: dict[str, Any]) -> dict[str, Any]:
+        """
+        Adds the position of each group in its order to views.
+
+        Parameters
+        ----------
+        views : dict[str, Any]
+            the views, as saved
+
+        Returns
+        -------
+        dict[str, Any]
+            the views, with the position of each group under 'ranks'
+        """
+
+        views['ranks'] = {group: {name: i for i, name in enumerate(names)}
+                          for group, names in views['groups'].items()}
+        return views
+
+
+    @staticmethod
+    def _key(values: dict[str, float | None], descending: bool):
+        """
+        Makes the key of a sort, which puts exchanges without a value
+        last.
+
+        Parameters
+        ----------
+        values : dict[str, float | None]
+            the saved value of each text, read from the text if missing
+        descending : bool
+            True, for the highest values first
+
+        Returns
+        -------
+        Callable
+            the key, taking the text of an exchange
+        """
+
+        sign = -1 if descending else 1
+
+        def key(text: str) -> tuple[bool, float]:
+            value = values[text] if text in values else sort_value(text)
+            return (value is None, sign * value if value is not None else 0)
+
+        return key
+
+
+    def load(self, fingerprint: str | None) -> bool:
+        """
+        Loads the saved views, unless they are already loaded.
+
+        Parameters
+        ----------
+        fingerprint : str | None
+            fingerprint of the saved data, see FileHandler
+
+        Returns
+        -------
+        bool
+            True,  if the loaded views are of the current data |
+            False, if they are out of date or there are none
+        """
+
+        if fingerprint is None:
+            return False
+
+        with self._lock:
+            views = self._views
+            if views is None or views['fingerprint'] != fingerprint:
+                views = self.file.read()
+                if not isinstance(views, dict) or \
+                   views.get('fingerprint') != fingerprint:
+                    self._views = None
+                    return False
+                self._views = self._prepare(views)
+
+        return True
+
+
+    def arrange(self, villagers: list[dict[str, Any]], sort: str='default',
+                group: str='profession',
+                whole: bool=False) -> list[dict[str, Any]]:
+        """
+        Sorts and groups villager data. Each group is displayed as a
+        profession would be, under the group's name, with its exchanges
+        under their profession and level. Exchanges that are equal by
+        the sort keep their order.
+
+        Parameters
+        ----------
+        villagers : list[dict[str, Any]]
+            the villager data, i.e. the saved data or search results
+        sort : str, default='default'
+            one of SORTS, 'default' to keep the order of the exchanges
+        group : str, default='profession'
+            one of GROUPS:
+            'profession' to sort the exchanges of each profession and
+            level, as the data is displayed by default,
+            'given' or 'level' to group the exchanges by item given or
+            level, 'none' to sort every exchange together
+        whole : bool, default=False
+            True,  if villagers is the saved data the views were built
+            from, in its saved order, to walk the saved order |
+            False, for any other data, i.e. search results
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            the arranged villager data, sharing the exchanges
+
+        Raises
+        ------
+        KeyError
+            if the sort or group is not one of SORTS or GROUPS
+        """
+
+        if group not in GROUPS:
+            raise KeyError(group)
+        if sort == 'default' and group == 'profession':
+            return villagers
+
+        # arranging only makes objects without reference cycles, so
+        # collecting them is wasted work, which grows with the number
+        # of objects already held
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._arrange(villagers, sort, group, self._views, whole)
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+
+    def _arrange(self, villagers: list[dict[str, Any]], sort: str,
+                 group: str, views: dict[str, Any] | None,
+                 whole: bool) -> list[dict[str, Any]]:
+        """
+        Sorts and groups villager data, see arrange.
+
+        Parameters
+        ----------
+        villagers : list[dict[str, Any]]
+            the villager data
+        sort : str
+            one of SORTS
+        group : str
+            one of GROUPS
+        views : dict[str, Any] | None
+            the loaded views
+        whole : bool
+            whether villagers is the saved data, see arrange
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            the arranged villager data
+        """
+
+        docs = self._sorted(villagers, sort, views, whole)
+
+        if group == 'profession':
+            # the professions and levels are kept in the order they are
+            # first given, search results can list one more than once
+            first = {}
+            for p, profession in enumerate(villagers):
+                for t, trade in enumerate(profession['trades']):
+                    first.setdefault(
+                        (profession['profession'], trade['level']), (p, t))
+            buckets = {}
+            for p, t, exchange in docs:
+                name = (villagers[p]['profession'],
+                        villagers[p]['trades'][t]['level'])
+                buckets.setdefault(first[name], []).append(exchange)
+            return self._runs(villagers, sorted(buckets.items()))
+
+        if group == 'none':
+            return self._runs(villagers, self._consecutive(docs))
+
+        ranks = views['ranks'][group] if views else {}
+        buckets = {}
+        for p, t, exchange in docs:
+            name = exchange['given']['item'] if group == 'given' \
+                   else villagers[p]['trades'][t]['level']
+            buckets.setdefault(name, []).append((p, t, exchange))
+
+        # groups missing from the saved order go last, items given by
+        # name and levels in the order of the data
+        if group == 'given':
+            unsaved = {name: name.casefold() for name in buckets}
+        else:
+            levels = dict.fromkeys(trade['level'] for profession in villagers
+                                   for trade in profession['trades'])
+            unsaved = {name: i for i, name in enumerate(levels)}
+        order = sorted(buckets, key=lambda name: (ranks.get(name, len(ranks)),
+                                                  unsaved[name]))
+        results = []
+        for name in order:
+            trades = []
+            for (p, t), exchanges in self._consecutive(buckets[name]):
+                profession = villagers[p]
+                level = profession['trades'][t]['level']
+                trades.append({
+                    'level'     : profession['profession'] if group == 'level'
+                                  else f'{profession["profession"]} {level}',
+                    'exchanges' : exchanges
+                })
+            results.append({
+                'profession'     : name,
+                'job-site-block' : '',
+                'trades'         : trades
+            })
+
+        return results
+
+
+    def _sorted(self, villagers: list[dict[str, Any]], sort: str,
+                views: dict[str, Any] | None,
+                whole: bool) -> list[tuple[int, int, dict]]:
+        """
+        Gets every exchange with the positions of its profession and
+        trade, in the order of a sort.
+
+        Parameters
+        ----------
+        villagers : list[dict[str, Any]]
+            the villager data
+        sort : str
+            one of SORTS
+        views : dict[str, Any] | None
+            the loaded views
+        whole : bool
+            whether villagers is the saved data, see arrange
+
+        Returns
+        -------
+        list[tuple[int, int, dict]]
+            the positions of the profession and trade of each exchange,
+            and the exchange
+
+        Raises
+        ------
+        KeyError
+            if the sort is not one of SORTS
+        """
+
+        if SORTS[sort] is None:
+            return [(p, t, exchange)
+                    for p, profession in enumerate(villagers)
+                    for t, trade in enumerate(profession['trades'])
+                    for exchange in trade['exchanges']]
+
+        # other data of the same shape (i.e. reordered results) cannot
+        # be told apart from the saved data, so the caller must say so,
+        # the shape only guards against the caller being wrong
+        if whole and views is not None \
+           and self._shape(villagers) == views['shape']:
+            return [(p, t, villagers[p]['trades'][t]['exchanges'][e])
+                    for p, t, e in views['orders'][sort]]
+
+        text, descending = SORTS[sort]
+        key = self._key(views['values'][sort] if views else {}, descending)
+
+        docs = [(p, t, exchange)
+                for p, profession in enumerate(villagers)
+                for t, trade in enumerate(profession['trades'])
+                for exchange in trade['exchanges']]
+        return sorted(docs, key=lambda doc: key(text(doc[2])))
+
+
+    @staticmethod
+    def _consecutive(docs: list[tuple[int, int, dict]]
+                     ) -> list[tuple[tuple[int, int], list[dict]]]:
+        """
+        Gathers exchanges next to each other of the same profession and
+        trade.
+
+        Parameters
+        ----------
+        docs : list[tuple[int, int, dict]]
+            the positions of the profession and trade of each exchange,
+            and the exchange
+
+        Returns
+        -------
+        list[tuple[tuple[int, int], list[dict]]]
+            the positions of the profession and trade of each run, and
+            its exchanges
+        """
+
+        runs = []
+        for p, t, exchange in docs:
+            if not runs or runs[-1][0] != (p, t):
+                runs.append(((p, t), []))
+            runs[-1][1].append(exchange)
+
+        return runs
+
+
+    @staticmethod
+    def _runs(villagers: list[dict[str, Any]],
+              runs: list[tuple[tuple[int, int], list[dict]]]
+              ) -> list[dict[str, Any]]:
+        """
+        Makes villager data of runs of exchanges, each under its
+        profession and level, merging runs of the same profession next
+        to each other.
+
+        Parameters
+        ----------
+        villagers : list[dict[str, Any]]
+            the villager data the runs are of
+        runs : list[tuple[tuple[int, int], list[dict]]]
+            the positions of the profession and trade of each run, and
+            its exchanges
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            the villager data
+        """
+
+        results = []
+        for (p, t), exchanges in runs:
+            profession = villagers[p]
+            if not results or \
+               results[-1]['profession'] != profession['profession']:
+                results.append({
+                    'profession'     : profession['profession'],
+                    'job-site-block' : profession['job-site-block'],
+                    'trades'         : []
+                })
+            results[-1]['trades'].append({
+                'level'     : profession['trades'][t]['level'],
+                'exchanges' : exchanges
+            })
+
+        return results
@@ -0,0 +1,216 @@
+"""search_cache.py
+
+Contains a class that caches search results across runs of the script.
+"""
+
+# python native
+import json, atexit, threading
+from typing import Any
+
+# in project
+from .file_handler import FileHandler
+from .useful_methods import *
+
+
+class SearchCache:
+    """
+    A class that keeps a size-bounded, least recently used cache of
+    rendered search results in a file. Entries are keyed by the dataset
+    fingerprint, so entries from an older dataset are never returned
+    and are evicted as soon as a newer dataset is seen.
+
+    Hits only reorder the entries in memory, so reading the cache never
+    writes the file. The new order is written with the next put, or
+    when the script exits.
+
+    Attributes
+    ----------
+    file : FileHandler
+        the file the cache is stored in
+    max_entries : int
+        the most results that are kept
+
+    Methods
+    -------
+    @staticmethod
+    key(choice, queries, fingerprint, *display):
+        makes the key of a search
+    get(key):
+        gets the cached results of a search
+    put(key, lines):
+        caches the results of a search
+    flush():
+        writes the order of the entries hit since the last write
+    """
+
+    def __init__(self, file: FileHandler, max_entries: int=64) -> None:
+        """
+        Creates SearchCache instance.
+
+        Parameters
+        ----------
+        file : FileHandler
+            the file to store the cache in
+        max_entries : int, default=64
+            the most results to keep
+        """
+
+        self.file = file
+        self.max_entries = max_entries
+
+        self._hits = []  # keys hit since the last write, oldest first
+        self._lock = threading.Lock()
+        self._flush_registered = False
+
+
+    @staticmethod
+    def key(choice: int, queries: tuple[str], fingerprint: str,
+            *display: Any) -> str:
+        """
+        Makes the key of a search. Queries are normalized so that
+        searches for the same items in a different order or case
+        share a key.
+
+        Parameters
+        ----------
+        choice : int
+            the int corresponding to the search type
+        queries : tuple[str]
+            the individual search queries
+        fingerprint : str
+            fingerprint of the dataset being searched
+        *display : Any
+            display settings the results were rendered with
+
+        Returns
+        -------
+        str
+            the key of the search
+        """
+
+        normalized = sorted({query.strip().lower() for query in queries})
+        return json.dumps([fingerprint, choice, normalized, *display])
+
+
+    def _read(self) -> dict[str, Any]:
+        """
+        Opens the cache file.
+
+        Returns
+        -------
+        dict[str, Any]
+            the dataset fingerprint and entries, least recent first
+        """
+
+        cache = self.file.read() if not self.file.is_empty() else None
+        return cache or {'fingerprint': None, 'entries': {}}
+
+
+    def get(self, key: str) -> list[str] | None:
+        """
+        Gets the cached results of a search, and marks them as the most
+        recently used.
+
+        Parameters
+        ----------
+        key : str
+            the key of the search
+
+        Returns
+        -------
+        list[str]
+            the rendered lines of the results |
+            None, if the search is not cached
+        """
+
+        lines = self._read()['entries'].get(key)
+        if lines is None:
+            return None
+
+        with self._lock:
+            if key in self._hits:
+                self._hits.remove(key)
+            self._hits.append(key)
+            if not self._flush_registered:
+                atexit.register(self.flush)
+                self._flush_registered = True
+
+        return lines
+
+
+    def _apply_hits(self, cache: dict[str, Any]) -> bool:
+        """
+        Moves the entries hit since the last write to the end of the
+        cache, most recent last. Called with the hits locked.
+
+        Parameters
+        ----------
+        cache : dict[str, Any]
+            the cache, as read from the file
+
+        Returns
+        -------
+        bool
+            True,  if any entries were moved |
+            False, otherwise
+        """
+
+        entries = cache['entries']
+        moved = False
+        for key in self._hits:
+            if key in entries:
+                entries[key] = entries.pop(key)
+                moved = True
+        self._hits.clear()
+
+        return moved
+
+
+    def flush(self) -> None:
+        """
+        Writes the order of the entries hit since the last write.
+        """
+
+        with self._lock:
+            if not self._hits:
+                return
+            cache = self._read()
+            if self._apply_hits(cache):
+                self.file.write(cache)
+
+        return
+
+
+    def put(self, key: str, lines: list[str]) -> None:
+        """
+        Caches the results of a search, evicting the least recently used
+        results if the cache is full, and every result of another
+        dataset.
+
+        Parameters
+        ----------
+        key : str
+            the key of the search
+        lines : list[str]
+            the rendered lines of the results
+        """
+
+        fingerprint = json.loads(key)[0]
+
+        with self._lock:
+            cache = self._read()
+            self._apply_hits(cache)
+
+            if cache['fingerprint'] != fingerprint:
+                cache = {'fingerprint': fingerprint, 'entries': {}}
+
+            entries = cache['entries']
+            entries.pop(key, None)
+            entries[key] = lines
+
+            while len(entries) > self.max_entries:
+                del entries[next(iter(entries))]
+
+            self.file.write(cache)
+
+        return
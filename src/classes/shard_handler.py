@@ -0,0 +1,284 @@
+"""shard_handler.py
+
+Contains a class that stores villager data as one file per profession.
+"""
+
+# python native
+import os, re, json, hashlib
+from typing import Any
+
+# in project
+from .file_handler import FileHandler, SCRIPT_ROOT
+from .file_json import JSONFile
+from .useful_methods import *
+
+
+class ShardHandler:
+    """
+    A class that stores villager data as one file (shard) per profession,
+    plus a manifest that lists the professions in order along with a
+    fingerprint of each profession's data.
+
+    Attributes
+    ----------
+    path : str
+        directory the shards and manifest are stored in
+    suffix : str
+        suffix added to each shard's filename, i.e. '.json.gz'
+    manifest : JSONFile
+        handles file IO of the manifest
+
+    Methods
+    -------
+    @staticmethod
+    fingerprint(profession):
+        gets the fingerprint of a profession's data
+    file_exists():
+        determines if the manifest exists
+    is_empty():
+        determines if there are no shards
+    read_manifest():
+        opens the manifest and returns its data
+    data_fingerprint():
+        gets a fingerprint of every shard from the manifest
+    read(professions=None):
+        opens the shards and returns their data
+    changed(data):
+        gets the professions whose data differs from the shards
+    write(data):
+        writes the shards whose data changed
+    """
+
+    def __init__(self, dir: str='data/professions',
+                 suffix: str='.json') -> None:
+        """
+        Creates ShardHandler instance.
+
+        Parameters
+        ----------
+        dir : str, default='data/professions'
+            directory to put the shards in
+        suffix : str, default='.json'
+            suffix added to each shard's filename, compressed if it
+            ends in a compression suffix
+        """
+
+        self.path = os.path.join(SCRIPT_ROOT, dir)
+        self.suffix = suffix
+        self.manifest = JSONFile(os.path.join(self.path, 'manifest.json'))
+
+        os.makedirs(self.path, exist_ok=True)
+
+
+    @staticmethod
+    def fingerprint(profession: dict[str, Any]) -> str:
+        """
+        Gets the fingerprint of a profession's data.
+
+        Parameters
+        ----------
+        profession : dict[str, Any]
+            the profession's villager data
+
+        Returns
+        -------
+        str
+            sha256 hash of the data
+        """
+
+        text = json.dumps(profession, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+
+    def _shard(self, profession: str) -> JSONFile:
+        """
+        Gets the file of a profession's shard.
+
+        Parameters
+        ----------
+        profession : str
+            the name of the profession
+
+        Returns
+        -------
+        JSONFile
+            handles file IO of the shard
+        """
+
+        name = re.sub(r'[^\w-]', '_', profession)
+        return JSONFile(os.path.join(self.path, name + self.suffix))
+
+
+    def file_exists(self) -> bool:
+        """
+        Determines if the manifest exists.
+
+        Returns
+        -------
+        bool
+            True,  if the manifest exists |
+            False, otherwise
+        """
+
+        return os.path.isfile(self.manifest.fn)
+
+
+    def is_empty(self) -> bool:
+        """
+        Determines if there are no shards.
+
+        Returns
+        -------
+        bool
+            True,  if there are no shards |
+            False, otherwise
+        """
+
+        return not self.read_manifest()['professions']
+
+
+    def read_manifest(self) -> dict[str, Any]:
+        """
+        Opens the manifest and returns its data.
+
+        Returns
+        -------
+        dict[str, Any]
+            the professions in order and the fingerprint of each
+        """
+
+        manifest = None
+        if self.file_exists():
+            manifest = self.manifest.read()
+
+        return manifest or {'professions': [], 'fingerprints': {}}
+
+
+    def data_fingerprint(self) -> str | None:
+        """
+        Gets a fingerprint of every shard from the manifest.
+
+        Returns
+        -------
+        str
+            sha256 hash of the professions' fingerprints |
+            None, if there are no shards
+        """
+
+        manifest = self.read_manifest()
+        if not manifest['professions']:
+            return None
+
+        return ShardHandler.fingerprint(manifest)
+
+
+    def read(self, professions: tuple[str] | None=None
+             ) -> list[dict[str, Any]] | None:
+        """
+        Opens the shards and returns their data.
+
+        Parameters
+        ----------
+        professions : tuple[str] | None, default=None
+            the names of the professions to read, None reads every shard
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            the data of the professions, in wiki order |
+            None, if there are no shards or there was an error
+        """
+
+        names = self.read_manifest()['professions']
+        if not names:
+            return None
+
+        data = []
+        for name in names:
+            if professions is not None and name not in professions:
+                continue
+
+            shard = self._shard(name).read()
+            if shard is None:
+                return None
+            data.append(shard)
+
+        return data
+
+
+    def changed(self, data: list[dict[str, Any]]) -> list[str]:
+        """
+        Gets the professions whose data differs from the shards,
+        comparing fingerprints so that no shard has to be opened.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data to compare
+
+        Returns
+        -------
+        list[str]
+            names of the professions that were added, removed or changed
+        """
+
+        manifest = self.read_manifest()
+        fingerprints = manifest['fingerprints']
+
+        changed = [
+            prof['profession'] for prof in data
+            if fingerprints.get(prof['profession'])
+               != ShardHandler.fingerprint(prof)
+        ]
+
+        names = {prof['profession'] for prof in data}
+        changed += [name for name in manifest['professions']
+                    if name not in names]
+
+        return changed
+
+
+    def write(self, data: list[dict[str, Any]]) -> bool:
+        """
+        Writes the shards whose data changed, each replaced atomically,
+        then the manifest. Shards of removed professions are deleted.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data to write
+
+        Returns
+        -------
+        bool
+            True,  if the data was written successfully |
+            False, otherwise
+        """
+
+        manifest = self.read_manifest()
+        old_names = manifest['professions']
+        fingerprints = {}
+
+        for prof in data:
+            name = prof['profession']
+            fingerprints[name] = ShardHandler.fingerprint(prof)
+
+            if manifest['fingerprints'].get(name) == fingerprints[name] \
+               and os.path.isfile(self._shard(name).fn):
+                continue
+
+            if not FileHandler.atomic_write(self._shard(name), prof):
+                return False
+
+        if not FileHandler.atomic_write(self.manifest, {
+            'professions'  : [prof['profession'] for prof in data],
+            'fingerprints' : fingerprints
+        }):
+            return False
+
+        for name in old_names:
+            shard = self._shard(name).fn
+            if name not in fingerprints and os.path.isfile(shard):
+                os.remove(shard)
+
+        return True
@@ -0,0 +1,298 @@
+"""trade_browser.py
+
+Contains a class that lets the user browse every trade in the terminal,
+filtering them as a query is typed.
+"""
+
+# python native
+from typing import Any
+
+# optional, not included with python on windows
+# (pip install windows-curses)
+try:
+    import curses
+except ImportError:
+    curses = None
+
+# in project
+from .narrowing_index import NarrowingIndex
+
+
+# constants
+BACKSPACE = ('\b', '\x7f')
+ESCAPE = '\x1b'
+KEYS = {} if curses is None else {
+    curses.KEY_UP        : 'up',
+    curses.KEY_DOWN      : 'down',
+    curses.KEY_PPAGE     : 'page-up',
+    curses.KEY_NPAGE     : 'page-down',
+    curses.KEY_HOME      : 'home',
+    curses.KEY_END       : 'end',
+    curses.KEY_BACKSPACE : 'backspace',
+    curses.KEY_RESIZE    : 'resize'
+}
+HELP = 'type to filter, arrows/PgUp/PgDn to scroll, Esc to exit'
+
+
+class TradeBrowser:
+    """
+    A class that shows every exchange as a row, filtered as the user
+    types to the rows containing each word typed. Each keystroke only
+    narrows the rows the last query matched (see NarrowingIndex), and
+    only the rows that fit on the screen are drawn, so the screen
+    updates at once however many trades there are.
+
+    Attributes
+    ----------
+    lines : list[str]
+        the row of each exchange
+    details : list[str]
+        the quantities, xp and uses of each exchange
+    index : NarrowingIndex
+        filters the rows
+    query : str
+        the query typed
+    matches : list[int]
+        the positions of the rows matching the query
+    selected : int
+        the position of the selected row among the matches
+    top : int
+        the position of the first row shown among the matches
+
+    Methods
+    -------
+    @staticmethod
+    available():
+        determines if the terminal can be used
+    handle_key(key):
+        updates the query or selection for a key
+    visible(height):
+        gets the rows that fit on the screen
+    run():
+        shows the browser until the user exits
+    """
+
+    def __init__(self, data: list[dict[str, Any]]) -> None:
+        """
+        Creates TradeBrowser instance.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data
+        """
+
+        self.lines = []
+        self.details = []
+        texts = []
+
+        for profession in data:
+            name = profession['profession'].title()
+            for trade in profession['trades']:
+                level = trade['level'].title()
+                for exchange in trade['exchanges']:
+                    wanted, given = exchange['wanted'], exchange['given']
+                    line = f'{name:<14}{level:<12}' + \
+                           f'{", ".join(wanted["item"])} -> {given["item"]}'
+
+                    self.lines.append(line)
+                    texts.append(line + ' ' + profession['job-site-block'])
+                    self.details.append(
+                        ', '.join(f'{quantity} {item}' for quantity, item
+                                  in zip(wanted['default-quantity'],
+                                         wanted['item'])) +
+                        f' -<{wanted["price-multiplier"]}>-> ' +
+                        f'{given["quantity"]} {given["item"]}, ' +
+                        f'{exchange["xp-to-villager"]} XP to villager, ' +
+                        f'{exchange["trades-until-disabled"]} until disabled'
+                    )
+
+        self.index = NarrowingIndex(texts)
+        self.query = ''
+        self.matches = self.index.filter('')
+        self.selected = 0
+        self.top = 0
+        self._page = 1  # rows shown at once, set on each draw
+
+
+    @staticmethod
+    def available() -> bool:
+        """
+        Determines if the terminal can be used, which needs the curses
+        module.
+
+        Returns
+        -------
+        bool
+            True,  if curses is installed |
+            False, otherwise
+        """
+
+        return curses is not None
+
+
+    def handle_key(self, key: int | str) -> bool:
+        """
+        Updates the query or selection for a key.
+
+        Parameters
+        ----------
+        key : int | str
+            a character typed, a curses key code, or the name of a key
+            in KEYS
+
+        Returns
+        -------
+        bool
+            True,  to keep browsing |
+            False, if the user exits
+        """
+
+        key = KEYS.get(key, key)
+
+        if key == ESCAPE:
+            return False
+
+        if key == 'backspace' or key in BACKSPACE:
+            self._set_query(self.query[:-1])
+        elif isinstance(key, str) and len(key) == 1 and key.isprintable():
+            self._set_query(self.query + key)
+        elif key == 'up':
+            self.selected -= 1
+        elif key == 'down':
+            self.selected += 1
+        elif key == 'page-up':
+            self.selected -= self._page
+        elif key == 'page-down':
+            self.selected += self._page
+        elif key == 'home':
+            self.selected = 0
+        elif key == 'end':
+            self.selected = len(self.matches) - 1
+
+        self.selected = max(0, min(self.selected, len(self.matches) - 1))
+
+        return True
+
+
+    def _set_query(self, query: str) -> None:
+        """
+        Filters the rows by a new query, selecting the first match.
+
+        Parameters
+        ----------
+        query : str
+            the query
+        """
+
+        self.query = query
+        self.matches = self.index.filter(query)
+        self.selected = 0
+        self.top = 0
+
+        return
+
+
+    def visible(self, height: int) -> list[tuple[str, bool]]:
+        """
+        Gets the rows that fit on the screen, scrolled so the selected
+        row is shown. Only these rows are ever drawn.
+
+        Parameters
+        ----------
+        height : int
+            the number of rows that fit
+
+        Returns
+        -------
+        list[tuple[str, bool]]
+            each row shown, and whether it is selected
+        """
+
+        self._page = max(height, 1)
+        if self.selected < self.top:
+            self.top = self.selected
+        elif self.selected >= self.top + self._page:
+            self.top = self.selected - self._page + 1
+
+        shown = self.matches[self.top : self.top + self._page]
+        return [(self.lines[row], self.top + i == self.selected)
+                for i, row in enumerate(shown)]
+
+
+    def _draw(self, screen: Any) -> None:
+        """
+        Draws the query, the rows that fit, the details of the selected
+        row and the number of matches.
+
+        Parameters
+        ----------
+        screen : curses.window
+            the screen to draw on
+        """
+
+        height, width = screen.getmaxyx()
+        width -= 1  # writing the last column of a line can fail
+        screen.erase()
+
+        for i, (line, selected) in enumerate(self.visible(height - 3)):
+            screen.addnstr(i + 1, 0, line.ljust(width), width,
+                           curses.A_REVERSE if selected else curses.A_NORMAL)
+
+        if self.matches:
+            selected = self.matches[self.selected]
+            screen.addnstr(height - 2, 0, self.details[selected], width,
+                           curses.A_BOLD)
+        status = f'{len(self.matches)} of {len(self.lines)} trades | {HELP}'
+        screen.addnstr(height - 1, 0, status, width, curses.A_DIM)
+
+        prompt = f'Filter: {self.query}'
+        screen.addnstr(0, 0, prompt, width)
+        screen.move(0, min(len(prompt), width))
+        screen.refresh()
+
+        return
+
+
+    def _loop(self, screen: Any) -> None:
+        """
+        Draws the browser and handles keys until the user exits.
+
+        Parameters
+        ----------
+        screen : curses.window
+            the screen to draw on
+        """
+
+        screen.keypad(True)
+        try:
+            curses.set_escdelay(25)
+        except AttributeError:
+            pass
+
+        while True:
+            self._draw(screen)
+            if not self.handle_key(screen.get_wch()):
+                return
+
+
+    def run(self) -> None:
+        """
+        Shows the browser until the user exits, restoring the terminal
+        afterwards.
+
+        Raises
+        ------
+        ModuleNotFoundError
+            if curses is not installed
+        """
+
+        if curses is None:
+            raise ModuleNotFoundError('curses is required to browse trades')
+
+        try:
+            curses.wrapper(self._loop)
+        except KeyboardInterrupt:
+            pass
+
+        return
@@ -0,0 +1,333 @@
+"""trade_pack.py
+
+Contains a class that reads trade definitions from data files, such as
+those of modpacks or data packs, into the same format as the wiki data.
+"""
+
+# python native
+import os, gc, json, time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+
+# constants
+LEVELS = ['novice', 'apprentice', 'journeyman', 'expert', 'master']
+EXTENSIONS = ('.json',)
+OFFER_DEFAULT = {
+    'price-multiplier' : 0.05,
+    'max-uses'         : 12,
+    'xp'               : 1
+}
+
+
+def parse_offer(offer: dict[str, Any]) -> dict[str, Any]:
+    """
+    Makes an exchange from an offer of a trade definition. An offer is
+    either an exchange as in the wiki data, or has the short form:
+        {"wanted": [{"item": "Wheat", "count": 20}],
+         "given": {"item": "Emerald", "count": 1},
+         "price-multiplier": 0.05, "max-uses": 16, "xp": 2}
+    where "wanted" can also be a single item, and any count or setting
+    left out takes its default.
+
+    Parameters
+    ----------
+    offer : dict[str, Any]
+        the offer
+
+    Returns
+    -------
+    dict[str, Any]
+        the exchange, with every value as a string like the wiki data
+
+    Raises
+    ------
+    KeyError
+        if the offer has no items wanted or given
+    """
+
+    wanted, given = offer['wanted'], offer['given']
+
+    # already in the format of the wiki data
+    if isinstance(wanted, dict) and 'default-quantity' in wanted:
+        return {
+            'wanted' : {
+                'item'             : [str(item) for item in wanted['item']],
+                'default-quantity' : [str(quantity) for quantity
+                                      in wanted['default-quantity']],
+                'price-multiplier' : str(wanted.get('price-multiplier',
+                                         OFFER_DEFAULT['price-multiplier']))
+            },
+            'given' : {
+                'item'     : str(given['item']),
+                'quantity' : str(given.get('quantity', 1))
+            },
+            'trades-until-disabled' : str(offer.get('trades-until-disabled',
+                                          OFFER_DEFAULT['max-uses'])),
+            'xp-to-villager'        : str(offer.get('xp-to-villager',
+                                          OFFER_DEFAULT['xp']))
+        }
+
+    if isinstance(wanted, dict):
+        wanted = [wanted]
+    settings = {**OFFER_DEFAULT, **offer}
+
+    return {
+        'wanted' : {
+            'item'             : [str(item['item']) for item in wanted],
+            'default-quantity' : [str(item.get('count', 1))
+                                  for item in wanted],
+            'price-multiplier' : str(settings['price-multiplier'])
+        },
+        'given' : {
+            'item'     : str(given['item']),
+            'quantity' : str(given.get('count', 1))
+        },
+        'trades-until-disabled' : str(settings['max-uses']),
+        'xp-to-villager'        : str(settings['xp'])
+    }
+
+
+def parse_profession(definition: dict[str, Any]) -> dict[str, Any]:
+    """
+    Makes the villager data of a profession from its trade definition:
+        {"profession": "beekeeper", "job-site-block": "beehive",
+         "trades": {"novice": [offer, ...], "apprentice": [...]}}
+    where "trades" can also be a list of levels as in the wiki data.
+    A profession can have any levels, the five of the game are put in
+    the game's order, before any others. Levels without offers are
+    left out.
+
+    Parameters
+    ----------
+    definition : dict[str, Any]
+        the trade definition of the profession
+
+    Returns
+    -------
+    dict[str, Any]
+        the villager data of the profession
+
+    Raises
+    ------
+    KeyError
+        if the definition has no profession or trades
+    """
+
+    trades = definition['trades']
+    if isinstance(trades, dict):
+        trades = [{'level': level, 'exchanges': offers}
+                  for level, offers in trades.items()]
+
+    levels = [{
+        'level'     : str(trade['level']).lower(),
+        'exchanges' : [parse_offer(offer) for offer in trade['exchanges']]
+    } for trade in trades if trade['exchanges']]
+
+    # sorted is stable, so other levels keep the order they were given
+    levels.sort(key=lambda trade: LEVELS.index(trade['level'])
+                if trade['level'] in LEVELS else len(LEVELS))
+
+    return {
+        'profession'     : str(definition['profession']).lower(),
+        'job-site-block' : str(definition.get('job-site-block', '')).lower(),
+        'trades'         : levels
+    }
+
+
+def read_trade_file(path: str) -> tuple[list[dict[str, Any]], str | None]:
+    """
+    Reads the professions of a trade definition file, which holds a
+    single profession, a list of them, or {"professions": [...]}.
+    Runs in a worker process, so errors are returned rather than
+    handled.
+
+    Parameters
+    ----------
+    path : str
+        path of the file
+
+    Returns
+    -------
+    tuple[list[dict[str, Any]], str | None]
+        the villager data of each profession in the file, and a
+        description of the error, None if there was no error
+    """
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            contents = json.load(f)
+
+        if isinstance(contents, dict):
+            contents = contents.get('professions', [contents])
+
+        return ([parse_profession(definition) for definition in contents],
+                None)
+
+    except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+        return ([], f'{path}: {type(e).__name__} {e}')
+
+
+class TradePackLoader:
+    """
+    A class that reads every trade definition file in a set of
+    directories (searched recursively) into villager data. Files are
+    read in parallel across worker processes and their professions
+    merged as each file is done, so only the merged professions are
+    held at once.
+
+    Files are merged in sorted path order, the directories in the order
+    given, and a profession defined again replaces the earlier
+    definition, like the load order of data packs.
+
+    Attributes
+    ----------
+    dirs : list[str]
+        the directories to read
+    workers : int | None
+        the number of worker processes, None for one per CPU, 1 to
+        read every file in this process
+    stats : dict[str, Any]
+        the counts, errors and time taken of the last load
+
+    Methods
+    -------
+    files():
+        finds every trade definition file in the directories
+    load():
+        reads every file into the villager data of each profession
+    @staticmethod
+    merge(data, professions):
+        merges professions into villager data
+    """
+
+    # below this many files, starting worker processes costs more
+    # than reading the files in this process
+    PARALLEL_THRESHOLD = 8
+
+    def __init__(self, dirs: list[str], workers: int | None=None) -> None:
+        """
+        Creates TradePackLoader instance.
+
+        Parameters
+        ----------
+        dirs : list[str]
+            the directories to read
+        workers : int | None, default=None
+            the number of worker processes, None for one per CPU, 1 to
+            read every file in this process
+        """
+
+        self.dirs = list(dirs)
+        self.workers = workers
+        self.stats = {}
+
+
+    def files(self) -> list[str]:
+        """
+        Finds every trade definition file in the directories.
+
+        Returns
+        -------
+        list[str]
+            the path of each file, in merge order
+        """
+
+        paths = []
+        for dir in self.dirs:
+            found = []
+            for root, _, names in os.walk(dir):
+                found.extend(os.path.join(root, name) for name in names
+                             if name.endswith(EXTENSIONS))
+            paths.extend(sorted(found))
+
+        return paths
+
+
+    def load(self) -> list[dict[str, Any]]:
+        """
+        Reads every file into the villager data of each profession.
+        The number of files, professions and exchanges read, the errors
+        and the time taken are kept in stats.
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            the villager data of each profession, in the order each
+            was first defined
+        """
+
+        start = time.perf_counter()
+        paths = self.files()
+        professions = {}
+        errors = []
+
+        workers = self.workers or os.cpu_count() or 1
+        if workers == 1 or len(paths) < TradePackLoader.PARALLEL_THRESHOLD:
+            results = map(read_trade_file, paths)
+            pool = None
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers,
+                                       initializer=gc.disable)
+            # large enough chunks that each worker is not kept waiting
+            chunksize = max(1, min(64, len(paths) // (workers * 4)))
+            results = pool.map(read_trade_file, paths, chunksize=chunksize)
+
+        # parsing only makes objects without reference cycles, so
+        # collecting them is wasted work, which grows with the number
+        # of objects already held
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            for parsed, error in results:
+                if error is not None:
+                    errors.append(error)
+                for profession in parsed:
+                    professions[profession['profession']] = profession
+        finally:
+            if gc_enabled:
+                gc.enable()
+            if pool is not None:
+                pool.shutdown()
+
+        seconds = time.perf_counter() - start
+        exchanges = sum(len(trade['exchanges'])
+                        for profession in professions.values()
+                        for trade in profession['trades'])
+        self.stats = {
+            'files'       : len(paths),
+            'professions' : len(professions),
+            'exchanges'   : exchanges,
+            'errors'      : errors,
+            'seconds'     : seconds,
+            'files-per-s' : len(paths) / seconds if seconds else 0.0
+        }
+
+        return list(professions.values())
+
+
+    @staticmethod
+    def merge(data: list[dict[str, Any]],
+              professions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Merges professions into villager data. A profession already in
+        the data is replaced where it is, the rest are added at the end.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data, i.e. from the wiki
+        professions : list[dict[str, Any]]
+            the professions to merge in
+
+        Returns
+        -------
+        list[dict[str, Any]]
+            the merged villager data
+        """
+
+        merged = {profession['profession']: profession for profession in data}
+        merged.update((profession['profession'], profession)
+                      for profession in professions)
+
+        return list(merged.values())
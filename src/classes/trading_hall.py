@@ -0,0 +1,322 @@
+"""trading_hall.py
+
+Contains a class that simulates the economy of a trading hall over a
+number of game days, using the villager data.
+
+Needs the numpy package, which is optional for the rest of the script,
+so this module is not imported by the classes package.
+"""
+
+# python native
+import re
+from typing import Any
+
+# optional
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# constants
+LEVELS = ['novice', 'apprentice', 'journeyman', 'expert', 'master']
+LEVEL_XP = [10, 70, 150, 250]  # villager xp needed to reach each level
+RESTOCKS_PER_DAY = 2
+MAX_COST = 64                  # a price never exceeds a full stack
+CURE_REPUTATION = 125          # from the gossip of a single cure
+SCENARIO_DEFAULT = {
+    'name'       : 'default',
+    'demand'     : 1.0,   # fraction of each offer's uses traded per restock
+    'cured'      : False, # every villager was cured from a zombie villager
+    'hero-level' : 0      # level of Hero of the Village, 0 for none
+}
+
+
+def first_number(text: str, default: float) -> float:
+    """
+    Gets the first number in a value of the villager data, which can be
+    a range (i.e. '5-19') or not a number at all (i.e. '—').
+
+    Parameters
+    ----------
+    text : str
+        the value
+    default : float
+        the number to use if the value has no number
+
+    Returns
+    -------
+    float
+        the first number in the value
+    """
+
+    match = re.search(r'\d+(?:\.\d+)?', str(text))
+    return float(match.group(0)) if match is not None else default
+
+
+class TradingHall:
+    """
+    A class that simulates a trading hall, a number of villagers of each
+    profession traded with every day, under several scenarios at once.
+
+    Every villager's offers are held in arrays of shape (villagers,
+    offers), padded to the profession with the most offers, and the
+    simulation state in arrays of shape (scenarios, villagers, offers),
+    so each restock is a handful of numpy operations however many
+    villagers and scenarios there are.
+
+    Like in the game, each villager only has two offers of each level,
+    chosen at random from the profession's offers of that level.
+
+    The model, per restock:
+    * the villager's offers of its level and below are unlocked
+    * the price of the first wanted item rises with demand, as
+      base + floor(base * demand * price multiplier), less any discount
+      from a cure or Hero of the Village, and stays within 1 to 64
+    * the player trades each unlocked offer demand * uses times
+    * the villager gains the xp of each trade, and levels up
+    * demand changes by the uses traded less the uses left
+
+    Attributes
+    ----------
+    professions : list[str]
+        the profession of each villager
+    offers : dict[str, np.ndarray]
+        the values of each villager's offers, shape (villagers, offers)
+
+    Methods
+    -------
+    simulate(days, scenarios):
+        simulates the hall for a number of days under each scenario
+    """
+
+    def __init__(self, data: list[dict[str, Any]],
+                 layout: dict[str, int], offers_per_level: int=2,
+                 seed: int=0) -> None:
+        """
+        Creates TradingHall instance.
+
+        Parameters
+        ----------
+        data : list[dict[str, Any]]
+            the villager data
+        layout : dict[str, int]
+            the number of villagers of each profession in the hall
+        offers_per_level : int, default=2
+            the number of offers each villager has of each level
+        seed : int, default=0
+            seed of the random choice of offers, so that results can
+            be repeated
+
+        Raises
+        ------
+        ModuleNotFoundError
+            if numpy is not installed
+        KeyError
+            if the layout has a profession not in the data
+        """
+
+        if np is None:
+            raise ModuleNotFoundError(
+                'numpy is required to simulate a trading hall'
+            )
+
+        by_name = {prof['profession']: prof for prof in data}
+        tables = {name: self._offer_table(by_name[name]) for name in layout}
+        width = max([len(table) for table in tables.values()] + [1])
+
+        # one row per profession, repeated for each of its villagers
+        rows = [tables[name] + [None] * (width - len(tables[name]))
+                for name in layout]
+        counts = list(layout.values())
+        self.professions = [name for name, count in layout.items()
+                            for _ in range(count)]
+
+        def column(key: str) -> np.ndarray:
+            values = np.array([
+                [0 if offer is None else offer[key] for offer in row]
+                for row in rows
+            ], dtype=float).reshape(len(rows), width)
+            return np.repeat(values, counts, axis=0)
+
+        self.offers = {
+            'valid'      : column('valid') > 0,
+            'level'      : column('level'),
+            'cost'       : column('cost'),
+            'multiplier' : column('multiplier'),
+            'max-uses'   : column('max-uses'),
+            'xp'         : column('xp'),
+            'given'      : column('given'),
+            'buys-item'  : column('buys-item') > 0,
+            'sells-item' : column('sells-item') > 0
+        }
+
+        # the offers of each level with the smallest random keys are
+        # the ones each villager has
+        keys = np.random.default_rng(seed).random(self.offers['cost'].shape)
+        chosen = np.zeros(keys.shape, dtype=bool)
+        for level in range(len(LEVELS)):
+            in_level = self.offers['valid'] & (self.offers['level'] == level)
+            level_keys = np.where(in_level, keys, np.inf)
+            kth = np.sort(level_keys, axis=1)[:, offers_per_level-1 : 
+                                                 offers_per_level]
+            if kth.size:
+                chosen |= in_level & (level_keys <= kth)
+        self.offers['valid'] = chosen
+
+        # keep only the columns of offers the villagers have, which is
+        # usually far fewer than the profession's offers
+        width = max(int(chosen.sum(axis=1).max(initial=0)), 1)
+        order = np.argsort(~chosen, axis=1, kind='stable')[:, :width]
+        self.offers = {key: np.take_along_axis(value, order, axis=1)
+                       for key, value in self.offers.items()}
+
+
+    @staticmethod
+    def _offer_table(profession: dict[str, Any]) -> list[dict[str, float]]:
+        """
+        Gets the numeric values of each of a profession's offers.
+
+        Parameters
+        ----------
+        profession : dict[str, Any]
+            the profession's villager data
+
+        Returns
+        -------
+        list[dict[str, float]]
+            the values of each offer
+        """
+
+        table = []
+        for trade in profession['trades']:
+            level = LEVELS.index(trade['level']) \
+                    if trade['level'] in LEVELS else 0
+            for exchange in trade['exchanges']:
+                wanted, given = exchange['wanted'], exchange['given']
+                table.append({
+                    'valid'      : 1,
+                    'level'      : level,
+                    'cost'       : first_number(
+                                       wanted['default-quantity'][0], 1),
+                    'multiplier' : first_number(
+                                       wanted['price-multiplier'], 0.05),
+                    'max-uses'   : first_number(
+                                       exchange['trades-until-disabled'], 12),
+                    'xp'         : first_number(exchange['xp-to-villager'], 1),
+                    'given'      : first_number(given['quantity'], 1),
+                    # emeralds for an item, or an item for emeralds
+                    'buys-item'  : given['item'].lower() == 'emerald',
+                    'sells-item' : wanted['item'][0].lower() == 'emerald'
+                })
+
+        return table
+
+
+    def simulate(self, days: int,
+                 scenarios: list[dict[str, Any]]) -> dict[str, np.ndarray]:
+        """
+        Simulates the hall for a number of days under each scenario.
+
+        Parameters
+        ----------
+        days : int
+            the number of game days
+        scenarios : list[dict[str, Any]]
+            the settings of each scenario, see SCENARIO_DEFAULT
+
+        Returns
+        -------
+        dict[str, np.ndarray]
+            totals for each scenario, shape (scenarios,): emeralds
+            spent and earned, items bought, trades made and the
+            fraction of villagers that reached master
+        """
+
+        scenarios = [{**SCENARIO_DEFAULT, **scenario}
+                     for scenario in scenarios]
+        offers = {key: value[None] for key, value in self.offers.items()}
+        count, villagers, width = len(scenarios), *self.offers['cost'].shape
+        shape = (count, villagers, width)
+
+        def setting(key: str) -> np.ndarray:
+            return np.array([scenario[key] for scenario in scenarios],
+                            dtype=float).reshape(count, 1, 1)
+
+        demand_rate = np.clip(setting('demand'), 0, 1)
+        hero = setting('hero-level')
+
+        # discounts do not change, so are worked out once
+        discount = np.where(setting('cured') > 0,
+                            np.floor(CURE_REPUTATION * offers['multiplier']),
+                            0)
+        hero_discount = np.maximum(
+            np.floor((0.3 + 0.0625 * (hero - 1)) * offers['cost']), 1
+        )
+        discount = discount + np.where(hero > 0, hero_discount, 0)
+
+        # the state is float32 and updated in place, as each restock is
+        # limited by memory bandwidth rather than arithmetic
+        f32 = np.float32
+        base = np.broadcast_to(offers['cost'] - discount, shape).astype(f32)
+        slope = (offers['cost'] * offers['multiplier']).astype(f32)
+        traded = np.broadcast_to(np.floor(demand_rate * offers['max-uses']),
+                                 shape).astype(f32)
+        traded_sells = traded * offers['sells-item']
+        max_uses = offers['max-uses'].astype(f32)
+        offer_xp = self.offers['xp'].astype(f32)
+        offer_level = offers['level'].astype(f32)
+        thresholds = np.array(LEVEL_XP, dtype=f32)
+
+        level = np.zeros((count, villagers, 1), dtype=f32)
+        xp = np.zeros((count, villagers), dtype=f32)
+        demand = np.zeros(shape, dtype=f32)
+        price, trades, temp = (np.empty(shape, dtype=f32) for _ in range(3))
+        traded_total = np.zeros(shape, dtype=f32)
+        spent = np.zeros(shape, dtype=f32)
+        level_changed = True
+
+        for _ in range(days * RESTOCKS_PER_DAY):
+            # offers only unlock when a villager levels up
+            if level_changed:
+                unlocked = offers['valid'] & (offer_level <= level)
+                np.multiply(traded, unlocked, out=trades)
+
+            # base + floor(base * demand * multiplier), less discounts
+            np.multiply(demand, slope, out=price)
+            np.floor(price, out=price)
+            np.maximum(price, 0, out=price)
+            price += base
+            np.clip(price, 1, MAX_COST, out=price)
+
+            traded_total += trades
+            np.multiply(traded_sells, unlocked, out=temp)
+            temp *= price
+            spent += temp
+
+            xp += np.einsum('svt,vt->sv', trades, offer_xp)
+            new_level = np.searchsorted(thresholds, xp.ravel(), 
+                                        side='right') \
+                        .reshape(count, villagers, 1).astype(f32)
+            level_changed = not np.array_equal(new_level, level)
+            level = new_level
+
+            # restock, offers traded out become pricier, unused cheaper
+            np.multiply(trades, 2, out=temp)
+            temp -= max_uses
+            temp *= unlocked
+            demand += temp
+
+        def total(weights: np.ndarray | None=None) -> np.ndarray:
+            values = traded_total if weights is None \
+                     else traded_total * weights
+            return values.sum(axis=(1, 2), dtype=float)
+
+        return {
+            'emeralds-spent'  : spent.sum(axis=(1, 2), dtype=float),
+            'emeralds-earned' : total(offers['buys-item'] * offers['given']),
+            'items-bought'    : total(offers['sells-item'] * offers['given']),
+            'trades'          : total(),
+            'master'          : (level[:, :, 0] == len(LEVEL_XP))
+                                .sum(axis=1) / max(villagers, 1)
+        }
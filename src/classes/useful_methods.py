@@ -4,20 +4,42 @@ Contains various functions for use across different files.
 """
 
 # python native
+import sys, json, threading
+from datetime import datetime
 from typing import Any
 
+# in project
+from .logger import LOG, LEVELS, Logger
+
 
 # constants
 DEVELOPING = True
 
+# False when running without a user to respond to prompts
+INTERACTIVE = True
+
+# exit codes, the first error handled decides the code of the run
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_USAGE = 2
+EXIT_NETWORK = 3
+EXIT_FILE = 4
+
+# every error handled so far, as structured records
+ERRORS: list[dict[str, Any]] = []
 
-def handle_error(error: Exception, 
-                 function: str, default_error: str) -> None:
+
+def handle_error(error: Exception | str, function: str, 
+                 default_error: str, code: int | None=None) -> None:
     """
     Displays error message and what function the error occurred in.
     Either displays the full error message or just the error text,
     depending on whether the script is being developed or not.
 
+    The error is also recorded in ERRORS. If the script is not
+    interactive, it is written to stderr as a line of JSON instead,
+    and the user is not prompted.
+
     Parameters
     ----------
     error : Exception
@@ -27,32 +49,141 @@ def handle_error(error: Exception,
     default_error : str
         the error message to be displayed to the user, non-technical
         such that the user can more obviously know what to do
+    code : int | None, default=None
+        the exit code of the error, None to choose it from the error
     """
 
+    record = {
+        'time'     : datetime.now().isoformat(timespec='seconds'),
+        'function' : function,
+        'type'     : type(error).__name__ if isinstance(error, Exception)
+                     else 'Error',
+        'message'  : default_error,
+        'detail'   : str(error),
+        'code'     : error_code(error) if code is None else code
+    }
+    ERRORS.append(record)
+    LOG.log('error', default_error, echo=False,
+            **{key: value for key, value in record.items()
+               if key not in ('time', 'message')})
+
+    if not INTERACTIVE:
+        print(json.dumps(record), file=sys.stderr, flush=True)
+        return
+
     if DEVELOPING:
-        print_internal('Error in function: ' + function, True)
-        print_internal(type(error), True)
-        print_internal(error, True)
+        print_internal('Error in function: ' + function, True, False)
+        print_internal(type(error), True, False)
+        print_internal(error, True, False)
     else:
-        print_internal(default_error)
+        print_internal(default_error, record=False)
 
     etc()
     return
 
 
+def error_code(error: Exception | str) -> int:
+    """
+    Chooses the exit code for an error.
+
+    Parameters
+    ----------
+    error : Exception | str
+        the error that occurred
+
+    Returns
+    -------
+    int
+        EXIT_NETWORK, if the error is from connecting to the wiki |
+        EXIT_FILE,    if the error is from reading or writing a file |
+        EXIT_ERROR,   otherwise
+    """
+
+    # requests' exceptions derive from OSError, so check them first
+    modules = [cls.__module__ for cls in type(error).__mro__]
+    if any(module.startswith(('requests', 'urllib3')) for module in modules) \
+       or isinstance(error, (ConnectionError, TimeoutError)):
+        return EXIT_NETWORK
+
+    if isinstance(error, OSError):
+        return EXIT_FILE
+
+    return EXIT_ERROR
+
+
+def exit_code(default: int=EXIT_OK) -> int:
+    """
+    Gets the exit code for the run so far.
+
+    Parameters
+    ----------
+    default : int, default=EXIT_OK
+        the code to use if no error has been handled
+
+    Returns
+    -------
+    int
+        the code of the first error handled |
+        default, if there were no errors
+    """
+
+    return ERRORS[0]['code'] if ERRORS else default
+
+
 def etc() -> None:
     """
     Displays prompt to user to press Enter to continue.
+    Does nothing if the script is not interactive, or if called from
+    a background thread, which would compete with the menu for input.
+    If stdin is closed, the script becomes non-interactive.
     """
 
-    input('Press Enter to continue\n')
+    if INTERACTIVE and threading.current_thread() is threading.main_thread():
+        try:
+            input('Press Enter to continue\n')
+        except EOFError:
+            set_interactive(False)
     return
 
 
-def print_internal(text: Any, display_error_notice: bool=False) -> None:
+def set_interactive(interactive: bool) -> None:
+    """
+    Sets whether the script can prompt the user for input. While it
+    cannot, loggers only print warnings and errors, see Logger.
+
+    Parameters
+    ----------
+    interactive : bool
+        True,  if the user can respond to prompts |
+        False, if prompts should be skipped
+    """
+
+    global INTERACTIVE
+    INTERACTIVE = interactive
+    Logger.default_echo_level = LEVELS['info' if interactive else 'warning']
+    return
+
+
+def is_interactive() -> bool:
+    """
+    Determines if the script can prompt the user for input.
+
+    Returns
+    -------
+    bool
+        True,  if the user can respond to prompts |
+        False, otherwise
+    """
+
+    return INTERACTIVE
+
+
+def print_internal(text: Any, display_error_notice: bool=False,
+                   record: bool=True) -> None:
     """
     Prints a message with an indent indicating an internal message,
-    a message that appears during setup of the script.
+    a message that appears during setup of the script. The message is
+    also recorded in the script log, see Logger.
 
     Parameters
     ----------
@@ -61,16 +192,14 @@ def print_internal(text: Any, display_error_notice: bool=False) -> None:
     display_error_notice : bool, default=False
         true if "[ERROR]" prefix is desired
         false if "]" prefix is desired
+    record : bool, default=True
+        true if the message should be recorded in the log
+        false if it should only be printed
     """
 
-    if display_error_notice:
-        print(f'[ERROR] {text}')
+    level = 'error' if display_error_notice else 'info'
+    if record:
+        LOG.log(level, text, echo=True)
     else:
-        print(f'] {text}')
+        print(f'[ERROR] {text}' if display_error_notice else f'] {text}')
     return
-
-
-
-def save_log(filename: str, data: Any) -> None:
-    with open(filename, 'a+', encoding="utf-8") as f:
-        f.write(str(data))
\ No newline at end of file
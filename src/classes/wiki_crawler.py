@@ -0,0 +1,289 @@
+"""wiki_crawler.py
+
+Contains a class that fetches many wiki pages over pooled connections.
+"""
+
+# python native
+import os, re, time, hashlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import quote
+
+# install required
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup
+
+# in project
+from .logger import LOG
+from .useful_methods import *
+
+
+# constants
+WIKI_URL = 'https://minecraft.fandom.com/wiki/'
+
+# https://www.zenrows.com/blog/403-web-scraping#complete-your-headers
+# needed to imitate a full browser request to prevent 403 error
+WIKI_HEADERS = {
+    'authority': 'www.google.com',
+    'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
+    'accept-language': 'en-US,en;q=0.9',
+    'cache-control': 'max-age=0',
+    'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36',
+}
+
+
+class WikiCrawler:
+    """
+    A class that fetches wiki pages with bounded concurrency,
+    connection pooling, retries and an on-disk content cache.
+
+    Attributes
+    ----------
+    base_url : str
+        url that page titles are appended to
+    cache_dir : str | None
+        directory that fetched pages are cached in, None disables caching
+    max_workers : int
+        maximum number of pages fetched at the same time
+    session : requests.Session
+        session holding the pooled connections
+
+    Methods
+    -------
+    @staticmethod
+    page_title(name):
+        converts an item name into a wiki page title
+    fetch(title, use_cache=True):
+        fetches a single page and returns its content
+    fetch_all(titles, use_cache=True):
+        fetches many pages concurrently
+    close():
+        closes the pooled connections
+    """
+
+    def __init__(self, base_url: str=WIKI_URL,
+                 cache_dir: str | None=None,
+                 max_workers: int=8,
+                 retries: int=3,
+                 backoff: float=0.5,
+                 timeout: float=10) -> None:
+        """
+        Creates WikiCrawler instance.
+
+        Parameters
+        ----------
+        base_url : str, default=WIKI_URL
+            url that page titles are appended to, can point to a
+            local stand-in server
+        cache_dir : str | None, default=None
+            directory to cache fetched pages in, None disables caching
+        max_workers : int, default=8
+            maximum number of pages fetched at the same time
+        retries : int, default=3
+            number of times a failed request is retried
+        backoff : float, default=0.5
+            backoff factor in seconds between retries
+        timeout : float, default=10
+            seconds to wait for a response
+        """
+
+        self.base_url = base_url
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=['GET']
+        )
+        adapter = HTTPAdapter(pool_connections=max_workers,
+                              pool_maxsize=max_workers,
+                              max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.headers.update(WIKI_HEADERS)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        if cache_dir is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+
+
+    @staticmethod
+    def page_title(name: str) -> str:
+        """
+        Converts an item name into the title of its wiki page.
+
+        Parameters
+        ----------
+        name : str
+            the name of the item, i.e. 'enchanted book'
+
+        Returns
+        -------
+        str
+            the page title, i.e. 'Enchanted_book'
+        """
+
+        title = name.strip().replace(' ', '_')
+        return title[:1].upper() + title[1:]
+
+
+    def _cache_path(self, title: str) -> str:
+        """
+        Gets the path a page is cached at.
+
+        Parameters
+        ----------
+        title : str
+            the title of the page
+
+        Returns
+        -------
+        str
+            path of the cached page
+        """
+
+        key = hashlib.sha1((self.base_url + title).encode()).hexdigest()
+        return os.path.join(self.cache_dir, key + '.html')
+
+
+    def fetch(self, title: str, use_cache: bool=True) -> bytes | None:
+        """
+        Fetches a single page, reading from the cache if possible.
+
+        Parameters
+        ----------
+        title : str
+            the title of the page
+        use_cache : bool, default=True
+            True,  if a cached copy of the page may be used |
+            False, to always request the page
+
+        Returns
+        -------
+        bytes
+            the content of the page |
+            None, if the page could not be fetched
+        """
+
+        cache_path = None
+        if self.cache_dir is not None:
+            cache_path = self._cache_path(title)
+            if use_cache and os.path.isfile(cache_path):
+                with open(cache_path, 'rb') as f:
+                    return f.read()
+
+        content = None
+        try:
+            page = self.session.get(self.base_url + quote(title),
+                                    timeout=self.timeout)
+            if page.status_code == 200:
+                content = page.content
+
+        except requests.exceptions.RequestException as e:
+            LOG.warning('could not fetch page', title=title, error=str(e))
+
+        if content is not None and cache_path is not None:
+            with open(cache_path, 'wb') as f:
+                f.write(content)
+
+        return content
+
+
+    def fetch_all(self, titles: list[str],
+                  use_cache: bool=True) -> dict[str, bytes | None]:
+        """
+        Fetches many pages concurrently and reports the throughput.
+
+        Parameters
+        ----------
+        titles : list[str]
+            the titles of the pages
+        use_cache : bool, default=True
+            True,  if cached copies of the pages may be used |
+            False, to always request the pages
+
+        Returns
+        -------
+        dict[str, bytes | None]
+            the content of each page, keyed by title
+        """
+
+        titles = list(dict.fromkeys(titles))
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pages = pool.map(lambda t: self.fetch(t, use_cache), titles)
+            results = dict(zip(titles, pages))
+
+        elapsed = time.perf_counter() - start
+        rate = len(titles) / elapsed if elapsed > 0 else float('inf')
+        LOG.info(f'fetched {len(titles)} pages in {elapsed:.2f}s ' +
+                 f'({rate:.1f} pages/sec)', pages=len(titles),
+                 seconds=round(elapsed, 3), rate=round(rate, 1))
+
+        return results
+
+
+    def close(self) -> None:
+        """
+        Closes the pooled connections.
+        """
+
+        self.session.close()
+        return
+
+
+
+def parse_item_page(content: bytes) -> dict[str, Any]:
+    """
+    Parses the infobox of an item page for the item's details.
+
+    Parameters
+    ----------
+    content : bytes
+        the content of the item page
+
+    Returns
+    -------
+    dict[str, Any]
+        the stack size, renewable flag and icon url of the item,
+        each None if not present on the page
+    """
+
+    dom = BeautifulSoup(content, 'html.parser')
+    details = {
+        'stack-size' : None,
+        'renewable'  : None,
+        'icon-url'   : None
+    }
+
+    for row in dom.select('table.infobox-rows tr'):
+        header, value = row.find('th'), row.find('td')
+        if header is None or value is None:
+            continue
+
+        name = header.get_text(strip=True).lower()
+        text = value.get_text(' ', strip=True)
+
+        if name == 'stackable':
+            # i.e. 'Yes (64)' or 'No', a malformed size is left out
+            size = re.search(r'\((\d+)\)', text)
+            if size is not None:
+                details['stack-size'] = int(size.group(1))
+            elif text.lower().startswith('no'):
+                details['stack-size'] = 1
+
+        elif name == 'renewable':
+            details['renewable'] = text.lower().startswith('yes')
+
+    icon = dom.select_one('.infobox-imagearea img')
+    if icon is not None:
+        details['icon-url'] = icon.get('data-src') or icon.get('src')
+
+    return details
@@ -0,0 +1,368 @@
+"""wikitext.py
+
+Contains a class that gets page wikitext through the MediaWiki API,
+and functions that parse the tables and text within wikitext.
+"""
+
+# python native
+import re, html
+from typing import Any
+
+# install required
+import requests
+
+# in project
+from .wiki_crawler import WIKI_HEADERS
+from .useful_methods import *
+
+
+# constants
+API_URL = 'https://minecraft.fandom.com/api.php'
+COMMENT = re.compile(r'<!--.*?-->', re.DOTALL)
+REF = re.compile(r'<ref[^>/]*/>|<ref[^>]*>.*?</ref>', re.DOTALL | re.I)
+TEMPLATE = re.compile(r'\{\{([^{}]*)\}\}')
+LINK = re.compile(r'\[\[([^\[\]|]*)(?:\|([^\[\]]*))?\]\]')
+BREAK = re.compile(r'<br\s*/?>', re.I)
+TAG = re.compile(r'<[^>]+>')
+
+
+class WikiAPI:
+    """
+    A class that requests page wikitext through the MediaWiki API,
+    which is much smaller than the rendered page.
+
+    Attributes
+    ----------
+    api_url : str
+        url of the wiki's api.php, can point to a local stand-in
+    session : requests.Session
+        session the requests are made with
+
+    Methods
+    -------
+    wikitext(page, section=None):
+        gets the wikitext of a page or one of its sections
+    """
+
+    def __init__(self, api_url: str=API_URL, timeout: float=30) -> None:
+        """
+        Creates WikiAPI instance.
+
+        Parameters
+        ----------
+        api_url : str, default=API_URL
+            url of the wiki's api.php
+        timeout : float, default=30
+            seconds to wait for a response
+        """
+
+        self.api_url = api_url
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers['user-agent'] = WIKI_HEADERS['user-agent']
+
+
+    def _parse(self, page: str, **params: Any) -> dict[str, Any] | None:
+        """
+        Makes an action=parse request.
+
+        Parameters
+        ----------
+        page : str
+            title of the page
+        **params : Any
+            additional parameters of the request
+
+        Returns
+        -------
+        dict[str, Any]
+            the parse result |
+            None, if there was an error
+        """
+
+        try:
+            response = self.session.get(self.api_url, timeout=self.timeout,
+                                        params={
+                                            'action'        : 'parse',
+                                            'page'          : page,
+                                            'format'        : 'json',
+                                            'formatversion' : 2,
+                                            **params
+                                        })
+            response.raise_for_status()
+            result = response.json()
+
+        except (requests.exceptions.RequestException, ValueError) as e:
+            handle_error(e, 'WikiAPI._parse()', 'error connecting to wiki')
+            return None
+
+        if 'error' in result:
+            handle_error(Exception(result['error'].get('info')),
+                         'WikiAPI._parse()', 'error reading wiki page')
+            return None
+
+        return result['parse']
+
+
+    def wikitext(self, page: str, section: int | None=None) -> str | None:
+        """
+        Gets the wikitext of a page or one of its sections.
+
+        Parameters
+        ----------
+        page : str
+            title of the page
+        section : int | None, default=None
+            index of the section, None for the whole page
+
+        Returns
+        -------
+        str
+            the wikitext |
+            None, if there was an error
+        """
+
+        params = {'prop': 'wikitext'}
+        if section is not None:
+            params['section'] = section
+
+        result = self._parse(page, **params)
+        return None if result is None else result['wikitext']
+
+
+
+def render_template(inner: str) -> str:
+    """
+    Renders the text a template shows, without its icons.
+    Link templates (i.e. {{ItemLink|Coal}}) show their last positional
+    parameter or text=, note templates show a space, and any other
+    template shows nothing.
+
+    Parameters
+    ----------
+    inner : str
+        the text between the template's braces
+
+    Returns
+    -------
+    str
+        the rendered text
+    """
+
+    parts = split_outside(inner, '|')
+    name = parts[0].strip().lower()
+    positional = [part for part in parts[1:] if '=' not in part]
+    named = dict(part.split('=', 1) for part in parts[1:] if '=' in part)
+    named = {key.strip(): value for key, value in named.items()}
+
+    if name.endswith('link'):
+        if 'text' in named:
+            return named['text']
+        return positional[-1] if positional else ''
+
+    if name.endswith('sprite'):
+        return named.get('text', '')
+
+    if name in ('note', 'efn', 'ref', 'fn'):
+        return ' '
+
+    return ''
+
+
+def render(text: str) -> str:
+    """
+    Renders wikitext to the text it shows. Line breaks become newlines.
+
+    Parameters
+    ----------
+    text : str
+        the wikitext
+
+    Returns
+    -------
+    str
+        the rendered text
+    """
+
+    text = COMMENT.sub('', text)
+    text = REF.sub(' ', text)
+
+    # innermost templates first, so nested templates are rendered
+    count = 1
+    while count:
+        text, count = TEMPLATE.subn(
+            lambda match: render_template(match.group(1)), text
+        )
+
+    text = LINK.sub(
+        lambda match: '' if ':' in match.group(1)
+                      else match.group(2) or match.group(1),
+        text
+    )
+    text = text.replace("'''", '').replace("''", '')
+    text = BREAK.sub('\n', text)
+    text = TAG.sub('', text)
+
+    return html.unescape(text.replace('&nbsp;', ' '))
+
+
+def split_outside(text: str, separator: str) -> list[str]:
+    """
+    Splits text on a separator, except inside templates and links.
+
+    Parameters
+    ----------
+    text : str
+        the text to split
+    separator : str
+        the separator to split on
+
+    Returns
+    -------
+    list[str]
+        the split text
+    """
+
+    parts = []
+    depth = 0
+    start = 0
+    i = 0
+    while i < len(text):
+        pair = text[i:i+2]
+        if pair in ('{{', '[['):
+            depth += 1
+            i += 2
+        elif pair in ('}}', ']]') and depth:
+            depth -= 1
+            i += 2
+        elif depth == 0 and text.startswith(separator, i):
+            parts.append(text[start:i])
+            i += len(separator)
+            start = i
+        else:
+            i += 1
+
+    parts.append(text[start:])
+    return parts
+
+
+def parse_cell(text: str, header: bool) -> dict[str, Any]:
+    """
+    Parses a single table cell, separating its attributes from its
+    content.
+
+    Parameters
+    ----------
+    text : str
+        the wikitext of the cell, without its leading marker
+    header : bool
+        True,  if the cell is a header cell |
+        False, otherwise
+
+    Returns
+    -------
+    dict[str, Any]
+        whether the cell is a header, its attributes and its wikitext
+    """
+
+    attrs = {}
+    parts = split_outside(text, '|')
+    if len(parts) > 1 and '=' in parts[0] and '[[' not in parts[0] \
+       and '{{' not in parts[0]:
+        attrs = {
+            key.lower(): value
+            for key, value in re.findall(r'(\w+)\s*=\s*"?([^"\s]*)"?',
+                                         parts[0])
+        }
+        text = '|'.join(parts[1:])
+
+    return {'header': header, 'attrs': attrs, 'text': text.strip()}
+
+
+def parse_tables(text: str) -> list[list[list[dict[str, Any]]]]:
+    """
+    Parses every top level table in wikitext into rows of cells.
+
+    Parameters
+    ----------
+    text : str
+        the wikitext
+
+    Returns
+    -------
+    list[list[list[dict[str, Any]]]]
+        the tables, each a list of rows, each a list of cells
+    """
+
+    tables = []
+    rows = None
+    depth = 0
+
+    for line in text.split('\n'):
+        stripped = line.strip()
+
+        if stripped.startswith('{|'):
+            depth += 1
+            if depth == 1:
+                rows = [[]]
+                continue
+
+        if depth == 0:
+            continue
+
+        if stripped.startswith('|}'):
+            depth -= 1
+            if depth == 0:
+                tables.append([row for row in rows if row])
+                continue
+
+        if depth > 1:
+            if rows[-1]:
+                rows[-1][-1]['text'] += '\n' + line
+            continue
+
+        if stripped.startswith('|-'):
+            rows.append([])
+        elif stripped.startswith('|+'):
+            continue
+        elif stripped.startswith('!'):
+            for cell in split_outside(stripped[1:], '!!'):
+                for part in split_outside(cell, '||'):
+                    rows[-1].append(parse_cell(part, True))
+        elif stripped.startswith('|'):
+            for cell in split_outside(stripped[1:], '||'):
+                rows[-1].append(parse_cell(cell, False))
+        elif rows[-1]:
+            # continuation of the last cell
+            rows[-1][-1]['text'] += '\n' + line
+
+    return tables
+
+
+def parse_sections(text: str, level: int=3) -> list[tuple[str, str]]:
+    """
+    Splits wikitext into its sections at the given heading level.
+
+    Parameters
+    ----------
+    text : str
+        the wikitext
+    level : int, default=3
+        the heading level, i.e. 3 for ===Heading===
+
+    Returns
+    -------
+    list[tuple[str, str]]
+        the rendered heading and wikitext of each section
+    """
+
+    marks = '=' * level
+    heading = re.compile(rf'^{marks}(?!=)\s*(.*?)\s*{marks}\s*$', re.M)
+    matches = list(heading.finditer(text))
+
+    return [
+        (render(match.group(1)).strip(),
+         text[match.end() : matches[i+1].start()
+                            if i+1 < len(matches) else len(text)])
+        for i, match in enumerate(matches)
+    ]
@@ -14,13 +14,13 @@ Dependencies:
 """
 
 # python native
-import json, sys, re, getopt
+import json, sys, os, io, re, copy, getopt, time, random, hashlib, threading
 from pathlib import Path
-from typing import TextIO, Any
+from typing import TextIO, Any, Callable
 
 # install required
 import requests
-from bs4 import BeautifulSoup, Tag
+from bs4 import BeautifulSoup, Tag, UnicodeDammit
 
 # in project
 from classes import *
@@ -28,21 +28,41 @@ from classes import *
 
 # constants type hints
 MAX_WIDTH: int
-VILLAGER_DATA: FileHandler 
+VILLAGER_DATA: FileHandler | ShardHandler
 SAVED_DATA: FileHandler
+ITEM_DATA: FileHandler
+ITEM_CATALOG: ItemCatalog
+DATASET: Dataset
+COMPLETIONS: CompletionIndex
+RELEVANCE: RelevanceIndex
+VIEWS: ResultViews
 CONFIG_DATA: FileHandler
 CONFIG_DICT: dict[str, Any]
 
 # constants definitions
 MAX_WIDTH = 80
-VILLAGER_DATA = FileHandler('villager-data.json', JSONFile)
-SAVED_DATA = FileHandler('data-output.txt', TxtFile)
+REMOVE_NOTES = '\\[note \\d+\\]'
 
 # set up default config file
 CONFIG_DATA = FileHandler('config.yaml', YAMLFile)
 CONFIG_DEFAULT = {
     'display-mode'     : 'simple',
-    'display-job-site' : False
+    'display-job-site' : False,
+    'compression'      : 'none',
+    'storage-layout'   : 'single',
+    'search-cache-size': 64,
+    'ingest-source'    : 'html',
+    'prefetch'         : True,
+    'prefetch-max-age' : 300,
+    'log-level'        : 'info',
+    'history'          : True,
+    'watch-interval'   : 60,
+    'watch-jitter'     : 0.1,
+    'trade-packs'      : [],
+    'rank-results'     : True,
+    'result-limit'     : 0,
+    'sort-by'          : 'default',
+    'group-by'         : 'profession'
 }
 # set up default config if file is empty
 if CONFIG_DATA.is_empty():
@@ -54,6 +74,49 @@ else:
         CONFIG_DICT = CONFIG_DEFAULT
         CONFIG_DATA.write(CONFIG_DICT)
 
+# events below this level are not written to data/script.log
+LOG.level = LEVELS.get(CONFIG_DICT.get('log-level', 'info'), LEVELS['info'])
+
+# compressed files are chosen by suffix, see FileExtension
+COMPRESSION_SUFFIX = {
+    'none' : '',
+    'gzip' : '.gz',
+    'zstd' : '.zst',
+    'lzma' : '.xz'
+}.get(CONFIG_DICT.get('compression', 'none'), '')
+
+# trades are read from either the rendered page or its wikitext
+API_SOURCE = CONFIG_DICT.get('ingest-source', 'html') == 'api'
+
+# villager data is either one file or one file per profession
+SHARDED = CONFIG_DICT.get('storage-layout', 'single') == 'sharded'
+if SHARDED:
+    VILLAGER_DATA = ShardHandler(suffix='.json' + COMPRESSION_SUFFIX)
+else:
+    VILLAGER_DATA = FileHandler('villager-data.json' + COMPRESSION_SUFFIX, 
+                                IndexedJSONFile)
+SAVED_DATA = FileHandler('data-output.txt' + COMPRESSION_SUFFIX, TxtFile)
+ITEM_DATA = FileHandler('item-data.json', JSONFile)
+ITEM_CATALOG = ItemCatalog(FileHandler('item-catalog.json', JSONFile))
+ITEM_CACHE_DIR = os.path.join(SCRIPT_ROOT, 'data', 'cache', 'items')
+TABLE_CACHE_DIR = os.path.join(SCRIPT_ROOT, 'data', 'cache', 'tables')
+SEARCH_CACHE = SearchCache(FileHandler('search-cache.json', JSONFile),
+                           CONFIG_DICT.get('search-cache-size', 64))
+WATCH_STATE = FileHandler('watch-state.json', JSONFile)
+FETCH_LOCK = os.path.join(SCRIPT_ROOT, 'data', 'fetch.lock')
+HISTORY = HistoryStore()
+COMPLETIONS = CompletionIndex()
+RELEVANCE = RelevanceIndex(FileHandler('relevance-index.json',
+                                       CompactJSONFile))
+VIEWS = ResultViews(FileHandler('result-views.json', CompactJSONFile))
+# shared with other threads of a program the script is embedded in,
+# get_data is defined below
+DATASET = Dataset(lambda: get_data())
+WATCH_LOG = Logger(os.path.join(SCRIPT_ROOT, 'data', 'watch.log'))
+WATCH_LOG.level = LOG.level
+TRADING_URL = WIKI_URL + 'Trading'
+PREFETCH: Prefetcher | None = None  # wiki data fetched in the background
+
     
 
 #################################################
@@ -67,10 +130,13 @@ def main() -> None:
 
     # if command line args were given, exit program after done
     if handle_args():
-        exit(0)
+        sys.exit(exit_code())
 
     active = True  # controls the script runtime loop
 
+    # fetch and parse while the user reads the menu
+    start_prefetch()
+
     clear()
     print(  
             'Welcome to Minecraft Villager Trade Data!\n'+ 
@@ -92,13 +158,18 @@ def main() -> None:
         elif choice == 2:
             search()
         elif choice == 3:
-            check_for_updates()
+            browse_trades()
         elif choice == 4:
+            check_for_updates()
+        elif choice == 5:
             change_display_mode()
         else:
             active = False
             continue
 
+    if PREFETCH is not None:
+        PREFETCH.cancel()
+
     return
     
 
@@ -122,6 +193,7 @@ def display_menu() -> int:
         [
             'Display all trades',
             'Search by criteria',
+            'Browse trades (filter as you type)',
             'Check for updates',
             'Change display mode',
             'Exit'
@@ -141,10 +213,36 @@ def display_all_trades() -> None:
                      'Main.display_all_trades()',
                      'error obtaining data')
         print('Exiting...')
-        exit(1)
+        sys.exit(exit_code(EXIT_ERROR))
+
+    lines = render_data(data, whole=True)
+    print('\n'.join(lines))
+    prompt_to_save(lines)
+
+    return
+
+
+def browse_trades() -> None:
+    """
+    Lets the user browse every trade, filtering them as they type.
+    """
+
+    if not TradeBrowser.available():
+        print('Browsing needs the curses module, on Windows install it ' +
+              'with: pip install windows-curses\n')
+        return
+
+    data = get_data()
+
+    if data is None:
+        handle_error('No data was obtained from call to get_data()',
+                     'Main.browse_trades()',
+                     'error obtaining data')
+        print('Exiting...')
+        sys.exit(exit_code(EXIT_ERROR))
 
-    display_data(data)
-    prompt_to_save(data)
+    TradeBrowser(data).run()
+    clear()
 
     return
 
@@ -191,7 +289,7 @@ def check_for_updates() -> None:
     clear()
 
     # verify that file exists to compare in the first place
-    if VILLAGER_DATA.file_exists() and VILLAGER_DATA.is_empty():
+    if not VILLAGER_DATA.file_exists() or VILLAGER_DATA.is_empty():
         print(
             'There is no file to compare to, please first select ' +
             'option 1 on the main menu' 
@@ -199,22 +297,28 @@ def check_for_updates() -> None:
 
         etc()
         return
-    
-    file = get_data()
 
-    if file is None:
-        print('Exiting...')
-        sys.exit(1)
+    # get data from wiki to compare, prefetched if possible
+    data = take_prefetch()
+    if data is None:
+        data = fetch_data()
+        if data is None:
+            print('Exiting...')
+            sys.exit(exit_code(EXIT_ERROR))
+
+        data = merge_trade_packs(data)
+        merge_item_details(data, ITEM_DATA.read())
 
-    # get data from wiki to compare
-    dom = connect()
-    job_sites, trade_tables = get_list(dom)
-    data = make_into_dicts(job_sites, trade_tables)
+    changes = find_changes(data)
+    if changes is None:
+        print('Exiting...')
+        sys.exit(exit_code(EXIT_ERROR))
 
-    if file == data:
+    if not changes:
         print('Local data is up to date')
     else:
         print('Local data is out of sync with wiki.')
+        print(f'Changed professions: {", ".join(changes)}')
 
         choice = display_options(
             'Would you like to update the data?',
@@ -226,9 +330,13 @@ def check_for_updates() -> None:
         )
 
         if choice == 1:
-            VILLAGER_DATA.write(data)
+            save_data(data)
+            DATASET.publish(data)
             print('data updated')
 
+    # have the next check ready as well
+    start_prefetch()
+
     etc()
     clear()
 
@@ -256,14 +364,17 @@ def change_display_mode() -> None:
         'Full:\n' +
         '   * xp given to villager\n' +
         '   * trades until disabled\n' +
-        '*You can also toggle displaying the respective job site block*\n'
+        '*You can also toggle displaying the respective job site block*\n' +
+        '*and choose how trades are sorted and grouped*\n'
     )
 
     options = [
         'Simple',
         'Complex',
         'Full',
-        'Toggle Job Site Block'
+        'Toggle Job Site Block',
+        'Sort By',
+        'Group By'
     ]
 
     choice = display_options(
@@ -284,6 +395,22 @@ def change_display_mode() -> None:
             print('Job site is now: On')
         else:
             print('Job site is now: Off')
+
+    elif choice in (5, 6):
+        setting, values = ('sort-by', list(SORTS)) if choice == 5 \
+                          else ('group-by', list(GROUPS))
+        value = display_options(
+            f'Current: {view_settings()[choice - 5]}, choose one',
+            [value.title() for value in values],
+            backable=True
+        )
+        if value == 0:
+            clear()
+            return
+
+        CONFIG_DICT[setting] = values[value - 1]
+        print(f'{"Sort" if choice == 5 else "Group"} by now: ' +
+              CONFIG_DICT[setting])
     
     else:
         CONFIG_DICT['display-mode'] = options[choice-1].lower()
@@ -313,12 +440,28 @@ def handle_args() -> bool:
     args_list = sys.argv
     if len(args_list) == 1:
         return False
+
+    # command line runs are scripted, so never wait on a prompt
+    set_interactive(False)
     
     try:
-        options, queries = getopt.getopt(args_list[1:], 'wgp')
-        if len(options) == 0 or len(queries) == 0:
+        options, queries = getopt.getopt(args_list[1:], 'wgpe', 
+                                         ['watch', 'history', 'ingest',
+                                          'completion', 'top=', 'sort=',
+                                          'group='])
+        if len(options) == 0 or \
+           (len(queries) == 0 and 
+            options[0][0] not in ('-e', '--watch', '--history',
+                                  '--ingest')) or \
+           (options[0][0] == '--history' and len(queries) not in (0, 2)) or \
+           (options[0][0] == '--completion' and 
+            queries[0] not in ('bash', 'zsh', 'fish')) or \
+           any(not valid_option(options[0][0], option, value)
+               for option, value in options[1:]):
             raise getopt.GetoptError('incorrect format')
-    except getopt.GetoptError:
+    except getopt.GetoptError as e:
+        handle_error(e, 'main.handle_args()', 'incorrect arguments',
+                     EXIT_USAGE)
         print(
             'Use the following format for command line arguments:\n\n' +
             'py main.py [ARG] [QUERIES,]\n' +
@@ -328,23 +471,105 @@ def handle_args() -> bool:
             '* -w : search for item wanted\n' +
             '* -g : search for item given\n' +
             '* -p : search for profession\n' +
+            '* -e : fetch item details (no queries needed)\n' +
+            '* --watch : poll the wiki and apply updates, optionally ' +
+            'given the minutes between polls\n' +
+            '* --history : list the saved snapshots, or given a ' +
+            'profession and item, show how its trades changed\n' +
+            '* --ingest : read trade definition files into the data, ' +
+            'given the directories, or else the trade packs in config\n' +
+            '* --completion : print the completion script of a shell, ' +
+            'bash, zsh or fish\n' +
+            '* --top N : after -w or -g, display only the N most ' +
+            'relevant trades\n' +
+            '* --sort KEY : after -w, -g or -p, sort by ' +
+            f'{", ".join(SORTS)}\n' +
+            '* --group KEY : after -w, -g or -p, group by ' +
+            f'{", ".join(GROUPS)}\n' +
             '\nQUERIES\n' +
             'space separated list of items/jobs to search for, ' +
             'terms with spaces surrounded with double quotes\n' +
             '\nExample Usage\n' +
             'py main.py -p mason\n' +
-            'py main.py -g "enchanted diamond"\n'
+            'py main.py -g "enchanted diamond"\n' +
+            'py main.py -w --top 5 book\n' +
+            'py main.py -g --sort xp --group given emerald\n' +
+            'py main.py --history librarian "enchanted book"\n'
         )
-        exit(2)
+        sys.exit(EXIT_USAGE)
 
     flag = options[0][0]
     flags = ['', '-w', '-g', '-p']
 
-    execute_search(flags.index(flag), queries)
+    try:
+        if flag == '-e':
+            enrich_items()
+
+        elif flag == '--watch':
+            interval = CONFIG_DICT.get('watch-interval', 60)
+            if queries:
+                try:
+                    interval = float(queries[0])
+                except ValueError as e:
+                    handle_error(e, 'main.handle_args()',
+                                 f'invalid number of minutes: {queries[0]}',
+                                 EXIT_USAGE)
+                    sys.exit(EXIT_USAGE)
+
+            watch(interval * 60, CONFIG_DICT.get('watch-jitter', 0.1))
+
+        elif flag == '--history':
+            display_history(queries)
+
+        elif flag == '--ingest':
+            ingest_trade_packs(queries)
+
+        elif flag == '--completion':
+            print_completion(queries[0])
+
+        else:
+            settings = dict(options)
+            limit = settings.get('--top')
+            execute_search(flags.index(flag), queries,
+                           int(limit) if limit is not None else None,
+                           settings.get('--sort'), settings.get('--group'))
+
+    except Exception as e:
+        handle_error(e, 'main.handle_args()', 'unexpected error')
 
     return True
 
 
+def valid_option(flag: str, option: str, value: str) -> bool:
+    """
+    Determines if an option can follow the flag of the operation.
+
+    Parameters
+    ----------
+    flag : str
+        the flag of the operation, i.e. '-w'
+    option : str
+        the option, i.e. '--top'
+    value : str
+        the value given to the option
+
+    Returns
+    -------
+    bool
+        True,  if the option and its value are valid |
+        False, otherwise
+    """
+
+    if option == '--top':
+        return flag in ('-w', '-g') and value.isdigit()
+    if option == '--sort':
+        return flag in ('-w', '-g', '-p') and value in SORTS
+    if option == '--group':
+        return flag in ('-w', '-g', '-p') and value in GROUPS
+
+    return False
+
+
 def get_data() -> list[dict[str, Any]] | None:
     """
     Gets the list of dictionaries containing villager info.
@@ -355,28 +580,200 @@ def get_data() -> list[dict[str, Any]] | None:
         list of dicts containing villager data
     """
 
+    wait_for_prefetch()
+
     data = VILLAGER_DATA.read()
     if data is None:
-        dom = connect()
-        if dom is None:
-            return None
-        
-        job_sites, trade_tables = get_list(dom)
-        data = make_into_dicts(job_sites, trade_tables)
-        VILLAGER_DATA.write(data)
+        # only one process fetches, the others wait to read its result
+        with FileLock(FETCH_LOCK):
+            data = VILLAGER_DATA.read()
+            if data is None:
+                data = populate_data()
 
     return data if data != [] else None
 
 
-def prompt_to_save(data: list[dict[str, Any]], 
+def populate_data() -> list[dict[str, Any]] | None:
+    """
+    Gets the villager data from the cached tables, or else from the
+    wiki, and saves it. Should be called holding the fetch lock.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        list of dicts containing villager data |
+        None, if no data could be obtained
+    """
+
+    professions = cached_professions() if not API_SOURCE else None
+    if professions is not None:
+        data = [parse_cached_table(prof) for prof in professions]
+    else:
+        data = fetch_data()
+        if data is None:
+            return None
+
+    data = merge_trade_packs(data)
+    merge_item_details(data, ITEM_DATA.read())
+    save_data(data)
+
+    return data
+
+
+def save_data(data: list[dict[str, Any]]) -> bool:
+    """
+    Saves the villager data, and regenerates the shell completion index,
+    the relevance index and the sorted views from it.
+
+    Parameters
+    ----------
+    data : list[dict[str, Any]]
+        the villager data
+
+    Returns
+    -------
+    bool
+        True,  if the data was saved |
+        False, otherwise
+    """
+
+    if not VILLAGER_DATA.write(data):
+        return False
+
+    fingerprint = VILLAGER_DATA.data_fingerprint()
+    COMPLETIONS.build(data)
+    RELEVANCE.build(data, fingerprint)
+    VIEWS.build(data, fingerprint)
+    return True
+
+
+def get_professions(queries: tuple[str]) -> list[dict[str, Any]] | None:
+    """
+    Gets the villager info of the given professions. If there is no
+    saved data yet, only the tables of the given professions are parsed,
+    and the rest are parsed and saved in the background.
+
+    Parameters
+    ----------
+    queries : tuple[str]
+        the names of the professions
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        list of dicts containing the professions' villager data |
+        None, if no data could be obtained
+    """
+
+    wait_for_prefetch()
+
+    if not VILLAGER_DATA.is_empty() or API_SOURCE:
+        if SHARDED and not VILLAGER_DATA.is_empty():
+            return VILLAGER_DATA.read(queries)
+
+        # decode only the professions' slices of the file if the
+        # index is up to date, otherwise fall back to a full load,
+        # which also fetches the data if there are no shards yet
+        if not SHARDED:
+            data = VILLAGER_DATA.extention.read_professions(queries)
+            if data is not None:
+                return data
+
+        data = get_data()
+        if data is None:
+            return None
+        return [prof for prof in data if prof['profession'] in queries]
+
+    # only one process fetches, the others wait and use the saved data,
+    # the lock is held until the remaining tables are saved
+    lock = FileLock(FETCH_LOCK)
+    if not lock.acquire():
+        return None
+
+    # the lock is handed to the background thread once it starts,
+    # until then it is released on any failure
+    try:
+        if not VILLAGER_DATA.is_empty():
+            lock.release()
+            return get_professions(queries)
+
+        professions = cached_professions()
+        if professions is not None:
+            parsed = {
+                prof: parse_cached_table(prof) 
+                for prof in professions if prof in queries
+            }
+        else:
+            tables = fetch_tables()
+            if tables is None:
+                lock.release()
+                return None
+
+            professions = [html_profession(table) for table in tables[1]]
+            parsed = {
+                prof: parse_table_html(job_site, table)
+                for prof, job_site, table in zip(professions, *tables)
+                if prof in queries
+            }
+
+        results = [parsed[prof] for prof in professions if prof in parsed]
+        merge_item_details(results, ITEM_DATA.read())
+
+        threading.Thread(
+            target=save_remaining_tables, 
+            args=(professions, copy.deepcopy(parsed), lock)
+        ).start()
+
+    except BaseException:
+        lock.release()
+        raise
+
+    return results
+
+
+def save_remaining_tables(professions: list[str], 
+                          parsed: dict[str, dict[str, Any]],
+                          lock: FileLock) -> None:
+    """
+    Parses the cached tables that have not been parsed yet and
+    saves the villager data of every profession.
+
+    Parameters
+    ----------
+    professions : list[str]
+        the names of every cached profession, in wiki order
+    parsed : dict[str, dict[str, Any]]
+        the professions that have already been parsed
+    lock : FileLock
+        the held fetch lock, released once the data is saved
+    """
+
+    try:
+        data = [
+            parsed[prof] if prof in parsed else parse_cached_table(prof)
+            for prof in professions
+        ]
+        data = merge_trade_packs(data)
+        merge_item_details(data, ITEM_DATA.read())
+
+        if VILLAGER_DATA.is_empty():
+            save_data(data)
+
+    finally:
+        lock.release()
+
+    return
+
+
+def prompt_to_save(lines: list[str], 
                    file: FileHandler=SAVED_DATA) -> None:
     """
     Prompt the user to save the console output to a file.
 
     Parameters
     ----------
-    data : list[dict[str, Any]]
-        the data to be saved
+    lines : list[str]
+        the rendered lines of output to be saved
     file : FileHandler, default = SAVED_DATA
         where the data should be saved
     """
@@ -390,21 +787,21 @@ def prompt_to_save(data: list[dict[str, Any]],
     )
 
     if option == 1:
-        if file.file_exists():
-            with open(file.path, 'w') as f:
-                out = sys.stdout
-                sys.stdout = f
-                display_data(data)
-                sys.stdout = out
-            etc()
+        file.write(lines)
+        etc()
 
     clear()
     return
 
 
-def execute_search(choice: int, queries: tuple[str]) -> None:
+def execute_search(choice: int, queries: tuple[str],
+                   limit: int | None=None, sort: str | None=None,
+                   group: str | None=None) -> None:
     """
-    Gets the data and performs the search based on given queries
+    Performs the search based on given queries and displays the results.
+    Item searches are ranked by relevance, unless turned off in the
+    config. Results are cached across runs, so a repeated search does
+    not load or scan the data.
     
     Parameters
     ----------
@@ -412,181 +809,640 @@ def execute_search(choice: int, queries: tuple[str]) -> None:
         the int corresponding to the user's search query
     queries : tuple(str)
         the individual search queries
+    limit : int | None, default=None
+        the number of ranked trades to display, None for the limit in
+        the config
+    sort : str | None, default=None
+        what to sort the trades by, see display_data
+    group : str | None, default=None
+        what to group the trades by, see display_data
     """
 
-    data = get_data()
-
-    if data is None:
-        print('Exiting...')
-        exit(1)
-
-    results = []
-
-    if choice == 3:
-        for profession in data:
-            if profession['profession'] in queries:
-                results.append(profession)
-
-    else:
-        for profession in data:
-            temp_prof = {
-                'profession'     : profession['profession'],
-                'job-site-block' : profession['job-site-block'],
-                'trades'         : []
-            }
-
-            for trade in profession['trades']:
-                temp_trade_level = {
-                    'level'     : trade['level'],
-                    'exchanges' : []
-                }
-
-                for exchange in trade['exchanges']:
-                    if choice == 1:
-                        for item in exchange['wanted']['item']:
-                            found = False
-                            # gets cases of only part of item being in query
-                            # i.e. 'quartz' in 'quartz pillar'
-                            for query in queries: 
-                                if query in item.lower():
-                                    temp_trade_level['exchanges'].append(exchange)
-                                    found = True
-                                    break
-
-                            if found:
-                                break
-                    else:
-                        for query in queries: 
-                            if query in exchange['given']['item'].lower():
-                                temp_trade_level['exchanges'].append(exchange)
-                                break
-                    
-                if temp_trade_level['exchanges']:
-                    temp_prof['trades'].append(temp_trade_level)
-
-            if temp_prof['trades']:
-                results.append(temp_prof)
-                    
-    
-    if not results:
+    queries = tuple(query.strip().lower() for query in queries)
+    ranked = choice != 3 and CONFIG_DICT.get('rank-results', True)
+    if limit is None:
+        limit = CONFIG_DICT.get('result-limit', 0)
+    sort, group = view_settings(sort, group)
+    display = (CONFIG_DICT['display-mode'], CONFIG_DICT['display-job-site'],
+               ranked, limit if ranked else 0, sort, group)
+
+    start = time.perf_counter()
+    lines = None
+    fingerprint = VILLAGER_DATA.data_fingerprint()
+    if fingerprint is not None:
+        key = SearchCache.key(choice, queries, fingerprint, *display)
+        lines = SEARCH_CACHE.get(key)
+
+    cached = lines is not None
+    if lines is None:
+        results = find_results(choice, queries, ranked, limit)
+        lines = render_data(results, sort=sort, group=group) \
+                if results else []
+
+        # the data may have only just been fetched
+        fingerprint = VILLAGER_DATA.data_fingerprint()
+        if fingerprint is not None:
+            key = SearchCache.key(choice, queries, fingerprint, *display)
+            SEARCH_CACHE.put(key, lines)
+
+    LOG.debug('search', choice=choice, queries=list(queries), cached=cached,
+              lines=len(lines),
+              ms=round((time.perf_counter() - start) * 1000, 2))
+
+    if not lines:
         print('no results found')
         etc()
     else:        
-        display_data(results)
-        prompt_to_save(results)
+        print('\n'.join(lines))
+        prompt_to_save(lines)
 
 
     return
 
 
-
-#################################################
-#                 File Handling                 #
-#################################################
-
-def create_dir(path: str = 'data') -> bool: 
-    """Create directory from the root of the script
-
+def find_results(choice: int, queries: tuple[str], ranked: bool=False,
+                 limit: int=0) -> list[dict[str, Any]]:
+    """
+    Gets the data and finds the trades matching the given queries.
+    
     Parameters
     ----------
-    path : str
-        path of the directory to be created
+    choice : int
+        the int corresponding to the user's search query
+    queries : tuple(str)
+        the individual search queries
+    ranked : bool, default=False
+        True, to order the trades by relevance, see rank_trades
+    limit : int, default=0
+        the number of ranked trades to find, 0 for every match
 
     Returns
     -------
-    bool
-        True,  if directory was created successfully \n
-        False, otherwise
+    list[dict[str, Any]]
+        the villager data of the matching trades
     """
 
-    ret = False
-    try:
-        Path(path).mkdir()
-        ret = True
+    if choice == 3:
+        data = get_professions(queries)
+    else:
+        data = get_data()
 
-    except FileExistsError as e:
-        handle_error(e, 'create_dir()', 
-                     'error creating data directory')
+    if data is None:
+        print('Exiting...')
+        sys.exit(exit_code(EXIT_ERROR))
 
-    except Exception as e:
-        handle_error(e, 'create_dir()', 
-                     'erroneous error creating data directory')
+    if choice == 3:
+        return data
 
-    finally:
-        return ret
+    if ranked:
+        return rank_trades(data, choice, queries, limit)
 
+    return filter_trades(data, choice, queries)
 
-def create_file(path: str) -> bool:
-    """Create file for local storage of villager data
+
+def rank_trades(data: list[dict[str, Any]], choice: int,
+                queries: tuple[str], limit: int=0) -> list[dict[str, Any]]:
+    """
+    Finds the same trades as filter_trades, ordered best first with
+    the relevance index saved with the data, so an exact match of a
+    query comes before trades that only contain it. The index is
+    rebuilt if the data was saved without it.
 
     Parameters
     ----------
-    path : str
-        path of the file to be created
+    data : list[dict[str, Any]]
+        the saved villager data
+    choice : int
+        1 to search items wanted, 2 to search items given
+    queries : tuple(str)
+        the individual search queries
+    limit : int, default=0
+        the number of trades to find, 0 for every match
 
     Returns
     -------
-    bool
-        True,  if file was created successfully \n
-        False, otherwise
+    list[dict[str, Any]]
+        the villager data of the matching trades
     """
 
-    try:
-        with open(path, 'w'):
-            ret = True
-        print('file created successfully')
-
-    except IOError as e:
-        handle_error(e, 'create_file()', 'error creating file')
-        ret = False
-
-    except Exception as e:
-        handle_error(e, 'create_file()', 'erroneous error creating file')
-        ret = False
+    fingerprint = VILLAGER_DATA.data_fingerprint()
+    if not RELEVANCE.load(fingerprint):
+        RELEVANCE.build(data, fingerprint)
 
-    finally:
-        return ret
+    # the index only orders the matches, which are found as by a filter
+    matches = exchange_matcher(choice, queries)
+    candidates = {
+        (p, t, e)
+        for p, profession in enumerate(data)
+        for t, trade in enumerate(profession['trades'])
+        for e, exchange in enumerate(trade['exchanges'])
+        if matches(exchange)
+    }
 
+    return RELEVANCE.top(data, 'wanted' if choice == 1 else 'given',
+                         queries, limit or None, candidates)
 
-def open_file_json(path: str) -> list[dict]:
-    """Opens JSON file for reading
 
+def filter_trades(data: list[dict[str, Any]], choice: int, 
+                  queries: tuple[str]) -> list[dict[str, Any]]:
+    """
+    Finds the trades whose wanted or given items contain any query.
+    
     Parameters
     ----------
-    path : str
-        path of the file to be opened
+    data : list[dict[str, Any]]
+        the villager data to search
+    choice : int
+        1 to search items wanted, 2 to search items given
+    queries : tuple(str)
+        the individual search queries, in lowercase
 
     Returns
     -------
-    list[dict]
-        data from file \n
-        None, if there was an error opening the file
+    list[dict[str, Any]]
+        the villager data of the matching trades
     """
 
-    try:
-        with open(path, 'r') as f:
-            data = json.load(f)
+    results = []
+    matches = exchange_matcher(choice, queries)
 
-    except IOError as e:
-        handle_error(e, 'open_file()', 'error opening file')
-        data = None
+    for profession in data:
+        temp_prof = {
+            'profession'     : profession['profession'],
+            'job-site-block' : profession['job-site-block'],
+            'trades'         : []
+        }
 
-    except Exception as e:
-        handle_error(e, 'open_file()', 'erroneous error opening file')
-        data = None
+        for trade in profession['trades']:
+            temp_trade_level = {
+                'level'     : trade['level'],
+                'exchanges' : []
+            }
 
-    finally:
-        return data
-    
+            for exchange in trade['exchanges']:
+                if matches(exchange):
+                    temp_trade_level['exchanges'].append(exchange)
+                
+            if temp_trade_level['exchanges']:
+                temp_prof['trades'].append(temp_trade_level)
 
-def open_file_txt(path: str) -> list[str]:
-    """Opens text file for reading
+        if temp_prof['trades']:
+            results.append(temp_prof)
+
+    return results
+
+
+def exchange_matcher(choice: int, queries: tuple[str]
+                     ) -> Callable[[dict[str, Any]], bool]:
+    """
+    Makes a function that determines if an exchange's wanted or given
+    items contain any query.
 
     Parameters
     ----------
-    path : str
-        path of the file to be opened
-
+    choice : int
+        1 to search items wanted, 2 to search items given
+    queries : tuple(str)
+        the individual search queries, in lowercase
+
+    Returns
+    -------
+    Callable[[dict[str, Any]], bool]
+        the function, given an exchange
+    """
+
+    # items are matched by catalog ID, so each distinct item is only
+    # matched once, in a single pass over its names for every query
+    matched_ids = ITEM_CATALOG.matching(queries)
+
+    # data saved before the catalog has no IDs, and is matched by name
+    matcher = AhoCorasick(queries)
+    matched = {}
+
+    def item_matches(item: str) -> bool:
+        if item not in matched:
+            matched[item] = matcher.matches(item.lower())
+        return matched[item]
+
+    def matches(exchange: dict[str, Any]) -> bool:
+        side = exchange['wanted'] if choice == 1 else exchange['given']
+        if 'id' in side:
+            ids = side['id'] if choice == 1 else [side['id']]
+            return not matched_ids.isdisjoint(ids)
+
+        # gets cases of only part of item being in query
+        # i.e. 'quartz' in 'quartz pillar'
+        items = side['item'] if choice == 1 else [side['item']]
+        return any(item_matches(item) for item in items)
+
+    return matches
+
+
+
+#################################################
+#              Background Prefetch              #
+#################################################
+
+def start_prefetch() -> None:
+    """
+    Starts fetching and parsing the wiki data in the background,
+    unless disabled in the config or a prefetch is already running.
+    """
+
+    global PREFETCH
+
+    if not CONFIG_DICT.get('prefetch', True):
+        return
+    if PREFETCH is not None and not PREFETCH.done():
+        return
+
+    PREFETCH = Prefetcher(prefetch_data)
+    PREFETCH.start()
+
+    return
+
+
+def prefetch_data(prefetcher: Prefetcher) -> list[dict[str, Any]] | None:
+    """
+    Fetches and parses the wiki data, saving it if there is no saved
+    data yet. Runs on the prefetch thread.
+
+    Parameters
+    ----------
+    prefetcher : Prefetcher
+        the prefetcher to report progress to and check for cancellation
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        a list of dicts holding the data of villager trades |
+        None, if there was an error or the prefetch was cancelled
+    """
+
+    if API_SOURCE:
+        prefetcher.report('downloading trading wikitext')
+        data = fetch_wikitext_data()
+    else:
+        prefetcher.report('downloading trading page')
+        tables = fetch_tables()
+        if tables is None:
+            return None
+
+        # parse table by table so progress shows and cancelling is quick
+        data = []
+        for i, (job_site, table) in enumerate(zip(*tables)):
+            if prefetcher.cancelled():
+                return None
+            prefetcher.report('parsing trade tables', i / len(tables[1]))
+            data.append(parse_table_html(job_site, table))
+
+    if data is None or prefetcher.cancelled():
+        return None
+
+    record_snapshot(data, 'prefetched from ' + 
+                          ('api' if API_SOURCE else 'page'))
+    if CONFIG_DICT.get('trade-packs'):
+        prefetcher.report('reading trade packs')
+        data = merge_trade_packs(data)
+    merge_item_details(data, ITEM_DATA.read())
+    with FileLock(FETCH_LOCK):
+        if VILLAGER_DATA.is_empty():
+            prefetcher.report('saving villager data')
+            save_data(copy.deepcopy(data))
+
+    return data
+
+
+def wait_for_prefetch() -> None:
+    """
+    Waits for a running prefetch with a progress indicator if there is
+    no saved data yet, as the prefetch is about to save it.
+    """
+
+    if PREFETCH is not None and not PREFETCH.done() \
+       and VILLAGER_DATA.is_empty():
+        PREFETCH.wait()
+
+    return
+
+
+def take_prefetch() -> list[dict[str, Any]] | None:
+    """
+    Takes the result of the prefetch, waiting for it with a progress
+    indicator if it is still running. Each result is only used once,
+    and a result that finished more than prefetch-max-age seconds ago
+    (i.e. the menu was left open) is dropped, so that checks do not
+    compare against stale data.
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        the prefetched villager data |
+        None, if there was no prefetch, it failed or it is stale
+    """
+
+    global PREFETCH
+
+    if PREFETCH is None:
+        return None
+
+    prefetcher, PREFETCH = PREFETCH, None
+    data = prefetcher.wait()
+    if prefetcher.age() > CONFIG_DICT.get('prefetch-max-age', 300):
+        return None
+
+    return data
+
+
+
+#################################################
+#                  Watch Mode                   #
+#################################################
+
+def watch(interval: float, jitter: float=0.1) -> None:
+    """
+    Polls the wiki on a schedule and applies any updates to the saved
+    data without prompting the user. Runs until interrupted.
+
+    Parameters
+    ----------
+    interval : float
+        seconds between polls
+    jitter : float, default=0.1
+        fraction of the interval the wait is randomly varied by
+    """
+
+    set_interactive(False)
+    state = WATCH_STATE.read() or {}
+
+    print_internal(f'watching {TRADING_URL} every {interval:.0f}s, ' +
+                   'press Ctrl+C to stop')
+
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                result = watch_cycle(state)
+            except Exception as e:
+                # a bad poll must not end the watcher, try again later
+                latency = time.perf_counter() - start
+                WATCH_LOG.error(f'latency={latency:.2f}s error: {e!r}',
+                                latency=round(latency, 3), error=repr(e))
+            else:
+                latency = time.perf_counter() - start
+                WATCH_LOG.info(f'latency={latency:.2f}s {result}',
+                               latency=round(latency, 3), result=result)
+
+            time.sleep(max(0, interval * random.uniform(1-jitter, 1+jitter)))
+
+    except KeyboardInterrupt:
+        print_internal('stopped watching')
+
+    return
+
+
+def watch_cycle(state: dict[str, str]) -> str:
+    """
+    Checks the wiki once for changes and applies them to the saved data.
+    Uses a conditional request, and then a hash of the page, so that
+    the page is only parsed when it has actually changed. Changed
+    trades are read from the source set in the config, so with the api
+    source the page is only used to tell when it has changed.
+
+    Parameters
+    ----------
+    state : dict[str, str]
+        the etag, last modified date and hash of the last seen page,
+        updated in place and saved
+
+    Returns
+    -------
+    str
+        a summary of the changes found
+    """
+
+    # without saved data an unmodified page still has to be parsed
+    headers = dict(WIKI_HEADERS)
+    if not VILLAGER_DATA.is_empty():
+        if 'etag' in state:
+            headers['if-none-match'] = state['etag']
+        if 'last-modified' in state:
+            headers['if-modified-since'] = state['last-modified']
+
+    try:
+        page = requests.get(TRADING_URL, headers=headers, timeout=30)
+    except requests.exceptions.RequestException as e:
+        return f'error connecting to wiki: {e}'
+
+    if page.status_code == 304:
+        return 'not modified'
+    if page.status_code != 200:
+        return f'error connecting to wiki: status {page.status_code}'
+
+    for header in ('etag', 'last-modified'):
+        if header in page.headers:
+            state[header] = page.headers[header]
+
+    content_hash = hashlib.sha256(page.content).hexdigest()
+    if content_hash == state.get('content-hash') \
+       and not VILLAGER_DATA.is_empty():
+        WATCH_STATE.write(state)
+        return 'page unchanged'
+
+    if API_SOURCE:
+        data = fetch_wikitext_data()
+        if data is None:
+            return 'error connecting to wiki api'
+    else:
+        job_sites, trade_tables = scan_page(page.content)
+        cache_tables(job_sites, trade_tables)
+        data = make_into_dicts(job_sites, trade_tables)
+    record_snapshot(data, 'watch ' + state.get('last-modified', ''))
+    data = merge_trade_packs(data)
+    merge_item_details(data, ITEM_DATA.read())
+
+    changes = find_changes(data)
+    if changes is None:
+        return 'error reading saved data'
+
+    if changes and not save_data(data):
+        return 'error writing updated data'
+    if changes:
+        DATASET.publish(data)
+
+    state['content-hash'] = content_hash
+    WATCH_STATE.write(state)
+
+    if not changes:
+        return 'page changed, trades unchanged'
+    return f'updated {len(changes)} professions: {", ".join(changes)}'
+
+
+def find_changes(data: list[dict[str, Any]]) -> list[str] | None:
+    """
+    Finds the professions whose saved data differs from the given data.
+    Sharded data is compared by fingerprint without opening any shard.
+
+    Parameters
+    ----------
+    data : list[dict[str, Any]]
+        the updated villager data
+
+    Returns
+    -------
+    list[str]
+        names of the professions that were added, removed or changed |
+        None, if the saved data could not be read
+    """
+
+    if SHARDED:
+        return VILLAGER_DATA.changed(data)
+
+    if VILLAGER_DATA.is_empty():
+        return changed_professions([], data)
+
+    old_data = VILLAGER_DATA.read()
+    if old_data is None:
+        return None
+
+    return changed_professions(old_data, data)
+
+
+def changed_professions(old: list[dict[str, Any]],
+                        new: list[dict[str, Any]]) -> list[str]:
+    """
+    Finds the professions that differ between two sets of villager data.
+
+    Parameters
+    ----------
+    old : list[dict[str, Any]]
+        the saved villager data
+    new : list[dict[str, Any]]
+        the updated villager data
+
+    Returns
+    -------
+    list[str]
+        names of the professions that were added, removed or changed
+    """
+
+    old_professions = {prof['profession']: prof for prof in old}
+    new_professions = {prof['profession']: prof for prof in new}
+
+    return [
+        name for name in dict.fromkeys([*old_professions, *new_professions])
+        if old_professions.get(name) != new_professions.get(name)
+    ]
+
+
+
+#################################################
+#                 File Handling                 #
+#################################################
+
+def create_dir(path: str = 'data') -> bool: 
+    """Create directory from the root of the script
+
+    Parameters
+    ----------
+    path : str
+        path of the directory to be created
+
+    Returns
+    -------
+    bool
+        True,  if directory was created successfully \n
+        False, otherwise
+    """
+
+    ret = False
+    try:
+        Path(path).mkdir()
+        ret = True
+
+    except FileExistsError as e:
+        handle_error(e, 'create_dir()', 
+                     'error creating data directory')
+
+    except Exception as e:
+        handle_error(e, 'create_dir()', 
+                     'erroneous error creating data directory')
+
+    finally:
+        return ret
+
+
+def create_file(path: str) -> bool:
+    """Create file for local storage of villager data
+
+    Parameters
+    ----------
+    path : str
+        path of the file to be created
+
+    Returns
+    -------
+    bool
+        True,  if file was created successfully \n
+        False, otherwise
+    """
+
+    try:
+        with open(path, 'w'):
+            ret = True
+        print('file created successfully')
+
+    except IOError as e:
+        handle_error(e, 'create_file()', 'error creating file')
+        ret = False
+
+    except Exception as e:
+        handle_error(e, 'create_file()', 'erroneous error creating file')
+        ret = False
+
+    finally:
+        return ret
+
+
+def open_file_json(path: str) -> list[dict]:
+    """Opens JSON file for reading
+
+    Parameters
+    ----------
+    path : str
+        path of the file to be opened
+
+    Returns
+    -------
+    list[dict]
+        data from file \n
+        None, if there was an error opening the file
+    """
+
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+
+    except IOError as e:
+        handle_error(e, 'open_file()', 'error opening file')
+        data = None
+
+    except Exception as e:
+        handle_error(e, 'open_file()', 'erroneous error opening file')
+        data = None
+
+    finally:
+        return data
+    
+
+def open_file_txt(path: str) -> list[str]:
+    """Opens text file for reading
+
+    Parameters
+    ----------
+    path : str
+        path of the file to be opened
+
     Returns
     -------
     list[str]
@@ -606,353 +1462,951 @@ def open_file_txt(path: str) -> list[str]:
         handle_error(e, 'open_file()', 'erroneous error opening file')
         data = None
 
-    finally:
-        return data
-    
+    finally:
+        return data
+    
+
+def write_to_file_json(file: TextIO, data: list[dict]) -> None:
+    """Writes JSON to file
+    
+    Parameters
+    ----------
+    file : TextIO
+        file to write data to
+    data : list[dict]
+        list of dictionaries to write to file
+    """
+    
+    try:
+        json.dump(data, file, ensure_ascii=False, indent=2)
+        print('success writing to file')
+
+    except Exception as e:
+        handle_error(e, 'write_to_file_json()', 'error writing to file')
+    
+    return
+
+
+def write_to_file_txt(file: TextIO, data: list[str]) -> None:
+    """Writes text to file
+    
+    Parameters
+    ----------
+    file : TextIO
+        file to write data to
+    data : list[str]
+        lines of text to write to file
+    """
+    
+    try:
+        file.writelines(line + '\n' for line in data)
+        print('success writing to file')
+
+    except Exception as e:
+        handle_error(e, 'write_to_file_text()', 'error writing to file')
+    
+    return
+
+
+
+#################################################
+#              Connecting and DOM               #
+#################################################
+
+def connect() -> bytes | None:
+    """
+    Connects to the Minecraft Wiki Trading page.
+
+    Returns
+    -------
+    bytes
+        the HTML of the page |
+        None, if there was an error connecting to the website
+    """
+
+    content = None
+    try:
+        page = requests.get(TRADING_URL, headers=WIKI_HEADERS)
+        content = page.content
+    
+    except requests.exceptions.ConnectionError as e:
+        handle_error(e, 'main.connect()', 'error connecting to wiki')
+
+    finally: 
+        return content
+
+
+def get_list(dom: BeautifulSoup) -> tuple[list[str], list[Tag]]:
+    """
+    Parses the DOM to get the required tables and job sites.
+
+    Parameters
+    ----------
+    dom : BeautifulSoup
+        the DOM of the website
+
+    Returns
+    -------
+    tuple[list[str], list[Tag]]
+        a tuple that contains both job sites and trade tables
+    """
+
+    ##### The wiki is *very* annoyingly formatted so parsing isn't as
+    ##### simple as it should be
+    ##### okay i formatted it better now but still like why
+
+    ##### the encoding to view the hyphen characters is
+    ##### windows 1252, otherwise it will be a question mark 
+    ##### IN THE VIEW NOT IN THE FILE
+
+    # get job sites for each profession
+    job_sites_span = dom.select(
+        'h3 ~ p > a[href^="/wiki/"] > span > span.sprite-text'
+    )
+
+    job_sites = []
+    for job in job_sites_span:
+        job_sites.append(job.get_text().lower())
+
+    # only get the Java job sites
+    job_sites = job_sites[:13]
+
+    # get tables related to villager trades
+    tables = dom.select('table.wikitable')
+    tables = tables[1:10] + tables[12:16]
+
+    return (job_sites, tables)
+
+
+def scan_page(content: bytes) -> tuple[list[str], list[str]]:
+    """
+    Gets the same job sites and trade tables as get_list, but by
+    scanning the page rather than building its DOM, so that only one
+    table's DOM exists at a time once each is parsed.
+
+    Parameters
+    ----------
+    content : bytes
+        the HTML of the page
+
+    Returns
+    -------
+    tuple[list[str], list[str]]
+        a tuple that contains both job sites and the HTML of the
+        trade tables
+    """
+
+    scanner = PageScanner()
+    scanner.scan(UnicodeDammit(content, is_html=True).unicode_markup)
+
+    # only the Java job sites and tables, as in get_list
+    job_sites = scanner.job_sites[:13]
+    tables = scanner.tables[1:10] + scanner.tables[12:16]
+
+    return (job_sites, tables)
+
+
+def fetch_tables() -> tuple[list[str], list[str]] | None:
+    """
+    Connects to the wiki, gets the job sites and trade tables,
+    and caches the tables of each profession.
+
+    Returns
+    -------
+    tuple[list[str], list[str]]
+        a tuple that contains both job sites and the HTML of the
+        trade tables |
+        None, if there was an error connecting to the website
+    """
+
+    content = connect()
+    if content is None:
+        return None
+
+    job_sites, trade_tables = scan_page(content)
+    cache_tables(job_sites, trade_tables)
+
+    return (job_sites, trade_tables)
+
+
+def cache_tables(job_sites: list[str], tables: list[str]) -> None:
+    """
+    Saves the raw HTML of each profession's trade table, so that
+    single professions can be parsed later without the whole page.
+
+    Parameters
+    ----------
+    job_sites : list[str]
+        list of job site blocks for each villager
+    tables : list[str]
+        list of the HTML of tables containing villager trade info
+    """
+
+    os.makedirs(TABLE_CACHE_DIR, exist_ok=True)
+
+    professions = []
+    for job_site, table in zip(job_sites, tables):
+        profession = html_profession(table)
+        professions.append(profession)
+
+        JSONFile(os.path.join(TABLE_CACHE_DIR, profession + '.json')).write({
+            'job-site-block' : job_site,
+            'html'           : table
+        })
+
+    JSONFile(os.path.join(TABLE_CACHE_DIR, 'index.json')).write(professions)
+
+    return
+
+
+def cached_professions() -> list[str] | None:
+    """
+    Gets the professions whose tables are cached.
+
+    Returns
+    -------
+    list[str]
+        names of the cached professions, in wiki order |
+        None, if no tables are cached
+    """
+
+    index = os.path.join(TABLE_CACHE_DIR, 'index.json')
+    if not os.path.isfile(index):
+        return None
+
+    return JSONFile(index).read()
+
+
+def parse_cached_table(profession: str) -> dict[str, Any]:
+    """
+    Parses the cached table of a single profession.
+
+    Parameters
+    ----------
+    profession : str
+        the name of the profession
+
+    Returns
+    -------
+    dict[str, Any]
+        a dict holding the data of the profession's trades
+    """
+
+    cached = JSONFile(os.path.join(TABLE_CACHE_DIR, profession + '.json')) \
+             .read()
+
+    return parse_table_html(cached['job-site-block'], cached['html'])
+
+
+
+#################################################
+#                 Data Handling                 #
+#################################################
+
+'''
+JSON format of villager records
+{
+    "profession" : <PROFESSION>,
+    'job-site-block' : <JOB SITE BLOCK>,
+    "trades" : [
+        {
+            "level" : <LEVEL>,
+            "exchanges" : [
+                {
+                    "wanted" : {
+                        'item' : [<ITEM>],
+                        'default-quantity' : [<NUMBER>],
+                        'price-multiplier' : <NUMBER>
+                    },
+                    "given"  : {
+                        'item' : <ITEM>,
+                        'quantity' : <NUMBER>,
+                    },
+                    'trades-until-disabled' : <NUMBER>,
+                    'xp-to-villager' : <NUMBER>
+                },
+                ...
+            ]
+        },
+        ...
+    ]
+}
+'''
+def make_into_dicts(job_sites: list[str], 
+                    data: list[str]) -> list[dict[str, Any]]:
+    """
+    Traverses the tables to assemble the JSON for storage, parsing
+    and releasing one table at a time.
+
+    Parameters
+    ----------
+    job_sites : list[str]
+        list of job site blocks for each villager
+    data : list[str]
+        list of the HTML of tables containing villager trade info
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        a list of dicts holding the data of villager trades
+    """
+
+    return [
+        parse_table_html(job_site, table) 
+        for job_site, table in zip(job_sites, data)
+    ]
+
+
+def remove_excess_text(text: str, stop_character: str = '[') -> str:
+    """
+    Preserves text in given text up to the first instance of a given
+    stop character (exclusive).
+
+    Parameters
+    ----------
+    text : str
+        the text to strip
+    stop_character : str, default='['
+        the character to stop at
+
+    Returns
+    -------
+    str
+        the stripped text
+    """
+
+    text = re.sub(REMOVE_NOTES, ' ', text).strip()
+
+    return text[:text.index(stop_character)].strip() \
+    if stop_character in text \
+    else text.strip()
+
+
+def table_profession(table: Tag) -> str:
+    """
+    Gets the profession a trade table belongs to.
+
+    Parameters
+    ----------
+    table : Tag
+        table containing villager trade info
+
+    Returns
+    -------
+    str
+        the name of the profession
+    """
+
+    # tr[0] = <PROFESSION> Economic Trade
+    return table.find('tr').contents[1] \
+                .get_text().split(' ')[0].lower().strip()
+
+
+def html_profession(html: str) -> str:
+    """
+    Gets the profession a trade table belongs to from its HTML,
+    parsing only the table's first row.
+
+    Parameters
+    ----------
+    html : str
+        the HTML of a table containing villager trade info
+
+    Returns
+    -------
+    str
+        the name of the profession
+    """
+
+    end = html.find('</tr>')
+    first_row = html[:end + len('</tr>')] if end != -1 else html
+
+    return table_profession(BeautifulSoup(first_row, 'html.parser'))
+
+
+def parse_table_html(job_site: str, html: str) -> dict[str, Any]:
+    """
+    Parses the HTML of a single trade table, releasing its DOM as soon
+    as the data is extracted.
+
+    Parameters
+    ----------
+    job_site : str
+        the job site block of the profession
+    html : str
+        the HTML of the table
+
+    Returns
+    -------
+    dict[str, Any]
+        a dict holding the data of the profession's trades
+    """
+
+    soup = BeautifulSoup(html, 'html.parser')
+    data = parse_table(job_site, soup.find('table'))
+    soup.decompose()
+
+    return data
+
+
+def parse_table(job_site: str, table: Tag) -> dict[str, Any]:
+    """
+    Traverses a single profession's table to assemble its JSON.
+
+    Parameters
+    ----------
+    job_site : str
+        the job site block of the profession
+    table : Tag
+        table containing the profession's trade info
+
+    Returns
+    -------
+    dict[str, Any]
+        a dict holding the data of the profession's trades
+    """
+
+    info = {}
+    table_rows = table.select('tr')
+
+    profession = table_profession(table)
+    info['profession'] = profession
+    info['job-site-block'] = job_site
+
+
+    # tr[2] = Novice row, includes first trade
+    #         has attr 'rowspan' that holds the number of trades
+
+    row_tracker = 2  # track the rows in the table
+    trades = []  # holds the trade info
+
+    # handle each level of trade
+    for i in range(5):
+
+        trade_level = {}
+
+        top_row = table_rows[row_tracker].contents[1]
+        if top_row.has_attr('rowspan'):
+            num_of_trades = int(top_row['rowspan'])
+        else:
+            num_of_trades = 1
+
+        trade_level_string = top_row.get_text().lower().strip()
+        trade_level['level'] = trade_level_string
+
+        rows = table_rows[row_tracker : row_tracker+num_of_trades]
+        row_tracker += num_of_trades
+
+        exchanges = []
+
+        # handle each trade within a level
+        first_row = True
+        for row in rows:
+
+            exchange_info = {}
+            columns = [
+                content for content in row.contents 
+                if content.get_text() != '\n'
+            ]
+
+            # first row has additional table header changing format
+            if first_row:
+                columns = columns[1:]
+                first_row = False
+
+            wanted = columns[0]
+            # if there are multiple items wanted for a trade
+            if wanted.find('br'):
+                if not (profession == 'fisherman'
+                        and trade_level_string == 'master'):
+                    item_wanted  = [
+                        remove_excess_text(item)
+                        for item in columns[0]
+                        .get_text(separator='\n', strip=True).split('\n')
+                    ]
+                # handle case of fisherman trade with 
+                # multiple possible items given
+                else:
+                    items_wanted = ' '.join(
+                        columns[0].get_text(separator='\n', strip=True)
+                        .split('\n')
+                    )
+                    parsed_items = items_wanted.strip()
+                    item_wanted  = [
+                        remove_excess_text(parsed_items)
+                    ]
+
+                default_quantity = [
+                    remove_excess_text(quantity)
+                    for quantity 
+                    in columns[1].get_text(separator='\n', strip=True)
+                    .split('\n')
+                ]
+            else:
+                parsed_item = columns[0].get_text(strip=True).strip()
+                item_wanted = [
+                    remove_excess_text(parsed_item)
+                ]
+                parsed_quantity = columns[1].get_text(strip=True).strip()
+                default_quantity = [
+                    remove_excess_text(parsed_quantity)
+                ]
+            
+            parsed_multiplier = columns[2].get_text(strip=True).strip()
+            price_multiplier  = remove_excess_text(parsed_multiplier)
+
+            give = columns[3]
+            if give.find('br'):
+                items_wanted = ' '.join(
+                    give.get_text(separator='\n', strip=True).split('\n')
+                )
+                item_given = remove_excess_text(items_wanted)
+            else:
+                item_parsed = columns[3].get_text(strip=True).strip()
+                item_given  = remove_excess_text(item_parsed)
+
+            quantity              = remove_excess_text(
+                                        columns[4].get_text(strip=True)
+                                    )
+            trades_until_disabled = remove_excess_text(
+                                        columns[5].get_text(strip=True)
+                                    )
+            xp_to_villager        = remove_excess_text(
+                                        columns[6].get_text(strip=True)
+                                    )
+
+            exchange_info['wanted'] = {
+                'item'             : item_wanted,
+                'default-quantity' : default_quantity,
+                'price-multiplier' : price_multiplier
+            }
+            exchange_info['given'] = {
+                'item'     : item_given,
+                'quantity' : quantity
+            }
+            exchange_info['trades-until-disabled'] = trades_until_disabled
+            exchange_info['xp-to-villager'] = xp_to_villager
+
+            exchanges.append(exchange_info)
+
+
+        trade_level['exchanges'] = exchanges
+
+
+        trades.append(trade_level)
+
+    info['trades'] = trades
+
+    return info
+
+
+
+def parse_wikitext_table(job_site: str, 
+                         rows: list[list[dict[str, Any]]]) -> dict[str, Any]:
+    """
+    Traverses a single profession's wikitext table to assemble its JSON,
+    the same way parse_table does for the rendered table.
+
+    Parameters
+    ----------
+    job_site : str
+        the job site block of the profession
+    rows : list[list[dict[str, Any]]]
+        the rows of cells of the profession's table, see 
+        wikitext.parse_tables
+
+    Returns
+    -------
+    dict[str, Any]
+        a dict holding the data of the profession's trades
+    """
+
+    def lines(cell: dict[str, Any]) -> list[str]:
+        return [
+            line.strip() for line in wikitext.render(cell['text']).split('\n')
+            if line.strip()
+        ]
+
+    def text(cell: dict[str, Any]) -> str:
+        return remove_excess_text(''.join(lines(cell)))
+
+    # row 0 = <PROFESSION> Economic Trade
+    profession = ' '.join(lines(rows[0][0])).split(' ')[0].lower().strip()
+
+    # row 2 = Novice row, includes first trade
+    row_tracker = 2
+    trades = []
+
+    for i in range(5):
+        top_row = rows[row_tracker][0]
+        num_of_trades = int(top_row['attrs'].get('rowspan', 1))
+        trade_level_string = ' '.join(lines(top_row)).lower().strip()
+
+        exchanges = []
+        for j, row in enumerate(rows[row_tracker : 
+                                     row_tracker+num_of_trades]):
+            # first row has additional table header
+            columns = row[1:] if j == 0 else row
+
+            wanted = columns[0]
+            if wikitext.BREAK.search(wanted['text']):
+                if not (profession == 'fisherman'
+                        and trade_level_string == 'master'):
+                    item_wanted = [
+                        remove_excess_text(item) for item in lines(wanted)
+                    ]
+                else:
+                    item_wanted = [
+                        remove_excess_text(' '.join(lines(wanted)))
+                    ]
+                default_quantity = [
+                    remove_excess_text(quantity) 
+                    for quantity in lines(columns[1])
+                ]
+            else:
+                item_wanted = [text(wanted)]
+                default_quantity = [text(columns[1])]
+
+            if wikitext.BREAK.search(columns[3]['text']):
+                item_given = remove_excess_text(' '.join(lines(columns[3])))
+            else:
+                item_given = text(columns[3])
+
+            exchanges.append({
+                'wanted' : {
+                    'item'             : item_wanted,
+                    'default-quantity' : default_quantity,
+                    'price-multiplier' : text(columns[2])
+                },
+                'given' : {
+                    'item'     : item_given,
+                    'quantity' : text(columns[4])
+                },
+                'trades-until-disabled' : text(columns[5]),
+                'xp-to-villager'        : text(columns[6])
+            })
+
+        row_tracker += num_of_trades
+        trades.append({
+            'level'     : trade_level_string,
+            'exchanges' : exchanges
+        })
 
-def write_to_file_json(file: TextIO, data: list[dict]) -> None:
-    """Writes JSON to file
-    
-    Parameters
-    ----------
-    file : TextIO
-        file to write data to
-    data : list[dict]
-        list of dictionaries to write to file
-    """
-    
-    try:
-        json.dump(data, file, ensure_ascii=False, indent=2)
-        print('success writing to file')
+    return {
+        'profession'     : profession,
+        'job-site-block' : job_site,
+        'trades'         : trades
+    }
 
-    except Exception as e:
-        handle_error(e, 'write_to_file_json()', 'error writing to file')
-    
-    return
 
+def fetch_wikitext_data() -> list[dict[str, Any]] | None:
+    """
+    Gets the villager data from the Trading page's wikitext through the
+    MediaWiki API, instead of from the rendered page.
 
-def write_to_file_txt(file: TextIO, data: list[str]) -> None:
-    """Writes text to file
-    
-    Parameters
-    ----------
-    file : TextIO
-        file to write data to
-    data : list[str]
-        lines of text to write to file
+    Returns
+    -------
+    list[dict[str, Any]]
+        a list of dicts holding the data of villager trades |
+        None, if there was an error connecting to the wiki
     """
-    
-    try:
-        file.writelines(line + '\n' for line in data)
-        print('success writing to file')
 
-    except Exception as e:
-        handle_error(e, 'write_to_file_text()', 'error writing to file')
-    
-    return
+    api = WikiAPI(CONFIG_DICT.get('wiki-api-url', wikitext.API_URL))
+    text = api.wikitext('Trading')
+    if text is None:
+        return None
+
+    # the job site is the first link in each profession's section
+    job_sites = {}
+    for heading, section in wikitext.parse_sections(text):
+        link = re.search(r'\{\{\w*Link\|[^{}]*\}\}', section.split('{|')[0])
+        if link is not None:
+            job_sites[heading.lower()] = wikitext.render(link.group(0)) \
+                                         .strip().lower()
+
+    # only the first table of each profession, as later tables are
+    # for other editions
+    data = {}
+    for rows in wikitext.parse_tables(text):
+        header = wikitext.render(rows[0][0]['text']) if rows[0] else ''
+        if 'Economic Trade' not in header:
+            continue
 
+        profession = header.strip().split(' ')[0].lower()
+        if profession not in data:
+            data[profession] = parse_wikitext_table(
+                job_sites.get(profession, ''), rows
+            )
 
+    return list(data.values())
 
-#################################################
-#              Connecting and DOM               #
-#################################################
 
-def connect() -> BeautifulSoup | None:
+def fetch_data() -> list[dict[str, Any]] | None:
     """
-    Connects to the Minecraft Wiki Trading page.
+    Gets the villager data from the wiki, from the source set in the
+    config (the rendered page or the MediaWiki API).
 
     Returns
     -------
-    BeautifulSoup
-        a BeautifulSoup object representing the DOM of the website |
-        None, if there was an error connecting to the website
+    list[dict[str, Any]]
+        a list of dicts holding the data of villager trades |
+        None, if there was an error connecting to the wiki
     """
 
-    URL = "https://minecraft.fandom.com/wiki/Trading"
-    soup = None
-    try:
-        # https://www.zenrows.com/blog/403-web-scraping#complete-your-headers
-        # needed to imitate a full browser request to prevent 403 error
-        headers = {
-            'authority': 'www.google.com',
-            'accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
-            'accept-language': 'en-US,en;q=0.9',
-            'cache-control': 'max-age=0',
-            'user-agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/115.0.0.0 Safari/537.36',
-        }
-        page = requests.get(URL, headers=headers)
-        soup = BeautifulSoup(page.content, 'html.parser')
-    
-    except requests.exceptions.ConnectionError as e:
-        handle_error(e, 'main.connect()', 'error connecting to wiki')
+    start = time.perf_counter()
+    if API_SOURCE:
+        data = fetch_wikitext_data()
+    else:
+        tables = fetch_tables()
+        if tables is None:
+            return None
 
-    finally: 
-        return soup
+        job_sites, trade_tables = tables
+        data = make_into_dicts(job_sites, trade_tables)
 
+    LOG.debug('fetched and parsed trades', 
+              source='api' if API_SOURCE else 'html',
+              professions=None if data is None else len(data),
+              ms=round((time.perf_counter() - start) * 1000, 2))
 
-def get_list(dom: BeautifulSoup) -> tuple[list[str], list[Tag]]:
+    if data is not None:
+        record_snapshot(data, 'fetched from ' + 
+                              ('api' if API_SOURCE else 'page'))
+
+    return data
+
+
+def record_snapshot(data: list[dict[str, Any]], label: str) -> None:
     """
-    Parses the DOM to get the required tables and job sites.
+    Stores freshly fetched data in the snapshot history, unless the
+    history is turned off in the config. Must be called before item
+    details are merged in, so that only wiki trade data is kept.
 
     Parameters
     ----------
-    dom : BeautifulSoup
-        the DOM of the website
-
-    Returns
-    -------
-    tuple[list[str], list[Tag]]
-        a tuple that contains both job sites and trade tables
+    data : list[dict[str, Any]]
+        the villager data as fetched from the wiki
+    label : str
+        a description of where the data came from
     """
 
-    ##### The wiki is *very* annoyingly formatted so parsing isn't as
-    ##### simple as it should be
-    ##### okay i formatted it better now but still like why
+    if not CONFIG_DICT.get('history', True):
+        return
 
-    ##### the encoding to view the hyphen characters is
-    ##### windows 1252, otherwise it will be a question mark 
-    ##### IN THE VIEW NOT IN THE FILE
+    snapshot = HISTORY.add(data, label)
+    if snapshot is not None:
+        LOG.debug('recorded snapshot', snapshot=snapshot, label=label)
 
-    # get job sites for each profession
-    job_sites_span = dom.select(
-        'h3 ~ p > a[href^="/wiki/"] > span > span.sprite-text'
-    )
+    return
 
-    job_sites = []
-    for job in job_sites_span:
-        job_sites.append(job.get_text().lower())
 
-    # only get the Java job sites
-    job_sites = job_sites[:13]
+def enrich_items() -> None:
+    """
+    Fetches the wiki page of every traded item and merges the item
+    details (stack size, renewable, icon url) into the saved data.
+    """
 
-    # get tables related to villager trades
-    tables = dom.select('table.wikitable')
-    tables = tables[1:10] + tables[12:16]
+    data = get_data()
 
-    return (job_sites, tables)
+    if data is None:
+        print('Exiting...')
+        sys.exit(exit_code(EXIT_ERROR))
+
+    names = sorted({
+        item.lower()
+        for profession in data
+        for trade in profession['trades']
+        for exchange in trade['exchanges']
+        for item in exchange['wanted']['item'] + [exchange['given']['item']]
+    })
+
+    crawler = WikiCrawler(cache_dir=ITEM_CACHE_DIR)
+    titles = {name: WikiCrawler.page_title(name) for name in names}
+    try:
+        pages = crawler.fetch_all(list(titles.values()))
+    finally:
+        crawler.close()
 
+    details = ITEM_DATA.read() or {}
+    for name, title in titles.items():
+        if pages[title] is not None:
+            details[name] = parse_item_page(pages[title])
 
+    found = sum(pages[title] is not None for title in titles.values())
+    print_internal(f'found details for {found} of {len(names)} items')
 
-#################################################
-#                 Data Handling                 #
-#################################################
+    ITEM_DATA.write(details)
+    save_data(merge_item_details(data, details))
+    DATASET.publish(data)
 
-'''
-JSON format of villager records
-{
-    "profession" : <PROFESSION>,
-    'job-site-block' : <JOB SITE BLOCK>,
-    "trades" : [
-        {
-            "level" : <LEVEL>,
-            "exchanges" : [
-                {
-                    "wanted" : {
-                        'item' : [<ITEM>],
-                        'default-quantity' : [<NUMBER>],
-                        'price-multiplier' : <NUMBER>
-                    },
-                    "given"  : {
-                        'item' : <ITEM>,
-                        'quantity' : <NUMBER>,
-                    },
-                    'trades-until-disabled' : <NUMBER>,
-                    'xp-to-villager' : <NUMBER>
-                },
-                ...
-            ]
-        },
-        ...
-    ]
-}
-'''
-def make_into_dicts(job_sites: list[str], 
-                    data: list[Tag]) -> list[dict[str, Any]]:
+    return
+
+
+def print_completion(shell: str) -> None:
     """
-    Traverses the tables to assemble the JSON for storage.
+    Prints the completion script of a shell, writing the completion
+    index first if the data was saved before there was one.
 
     Parameters
     ----------
-    job_sites : list[str]
-        list of job site blocks for each villager
-    data : list[Tag]
-        list of tables containing villager trade info
+    shell : str
+        'bash', 'zsh' or 'fish'
+    """
+
+    if not COMPLETIONS.exists():
+        data = get_data()
+        if data is not None:
+            COMPLETIONS.build(data)
+
+    print(COMPLETIONS.script(shell, sys.executable, 
+                             os.path.abspath(__file__)))
+
+    return
+
+
+def trade_pack_dirs() -> list[str]:
+    """
+    Gets the trade pack directories set in the config.
 
     Returns
     -------
-    list[dict[str, Any]]
-        a list of dicts holding the data of villager trades
+    list[str]
+        the path of each directory, relative ones from the data directory
     """
 
-    remove_notes = '\\[note \\d+\\]'
-    def remove_excess_text(text: str, stop_character: str = '[') -> str:
-        """
-        Preserves text in given text up to the first instance of a given
-        stop character (exclusive).
+    return [os.path.join(SCRIPT_ROOT, 'data', dir)
+            for dir in CONFIG_DICT.get('trade-packs') or []]
 
-        Parameters
-        ----------
-        text : str
-            the text to strip
-        stop_character : str, default='['
-            the character to stop at
 
-        Returns
-        -------
-        str
-            the stripped text
-        """
-
-        
-        text = re.sub(remove_notes, ' ', text).strip()
-
-        return text[:text.index(stop_character)].strip() \
-        if stop_character in text \
-        else text.strip()
+def load_trade_packs(dirs: list[str]) -> list[dict[str, Any]]:
+    """
+    Reads the trade definition files of the given directories, logging
+    the throughput and any file that could not be read.
 
+    Parameters
+    ----------
+    dirs : list[str]
+        the directories to read
 
+    Returns
+    -------
+    list[dict[str, Any]]
+        the villager data of each profession defined
+    """
 
-    villager_data = []  # stores all the villager trade data
+    loader = TradePackLoader(dirs)
+    professions = loader.load()
 
-    # traverse the tables
-    for i, table in enumerate(data):
+    stats = loader.stats
+    for error in stats['errors']:
+        LOG.warning(f'could not read trade definitions: {error}')
+    LOG.info('read trade packs', files=stats['files'],
+             professions=stats['professions'],
+             exchanges=stats['exchanges'],
+             errors=len(stats['errors']),
+             ms=round(stats['seconds'] * 1000, 2),
+             files_per_s=round(stats['files-per-s'], 1), echo=False)
 
-        info = {}
-        table_rows = table.select('tr')
+    return professions
 
-        # tr[0] = <PROFESSION> Economic Trade
-        profession = table_rows[0].contents[1] \
-                    .get_text().split(' ')[0].lower().strip()
-        info['profession'] = profession
-        info['job-site-block'] = job_sites[i]
 
+def merge_trade_packs(data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Merges the professions of the trade packs set in the config into
+    villager data from the wiki. A pack's profession replaces the wiki's
+    profession of the same name.
 
-        # tr[2] = Novice row, includes first trade
-        #         has attr 'rowspan' that holds the number of trades
+    Parameters
+    ----------
+    data : list[dict[str, Any]]
+        the villager data from the wiki
 
-        row_tracker = 2  # track the rows in the table
-        trades = []  # holds the trade info
+    Returns
+    -------
+    list[dict[str, Any]]
+        the merged villager data
+    """
 
-        # handle each level of trade
-        for i in range(5):
+    dirs = trade_pack_dirs()
+    if not dirs:
+        return data
 
-            trade_level = {}
+    return TradePackLoader.merge(data, load_trade_packs(dirs))
 
-            top_row = table_rows[row_tracker].contents[1]
-            if top_row.has_attr('rowspan'):
-                num_of_trades = int(top_row['rowspan'])
-            else:
-                num_of_trades = 1
 
-            trade_level_string = top_row.get_text().lower().strip()
-            trade_level['level'] = trade_level_string
+def ingest_trade_packs(dirs: list[str]) -> None:
+    """
+    Reads the trade definition files of the given directories, or else
+    of the trade packs set in the config, merges them into the saved
+    data and reports the throughput.
 
-            rows = table_rows[row_tracker : row_tracker+num_of_trades]
-            row_tracker += num_of_trades
+    Parameters
+    ----------
+    dirs : list[str]
+        the directories to read, none for the ones in the config
+    """
 
-            exchanges = []
+    dirs = dirs or trade_pack_dirs()
+    if not dirs:
+        print_internal('no trade pack directories given or set in config')
+        return
 
-            # handle each trade within a level
-            first_row = True
-            for row in rows:
+    start = time.perf_counter()
+    professions = load_trade_packs(dirs)
+    seconds = time.perf_counter() - start
 
-                exchange_info = {}
-                columns = [
-                    content for content in row.contents 
-                    if content.get_text() != '\n'
-                ]
+    data = get_data() or []
+    data = TradePackLoader.merge(data, professions)
+    merge_item_details(data, ITEM_DATA.read())
+    save_data(data)
+    DATASET.publish(data)
 
-                # first row has additional table header changing format
-                if first_row:
-                    columns = columns[1:]
-                    first_row = False
-
-                wanted = columns[0]
-                # if there are multiple items wanted for a trade
-                if wanted.find('br'):
-                    if not (profession == 'fisherman'
-                            and trade_level_string == 'master'):
-                        item_wanted  = [
-                            remove_excess_text(item)
-                            for item in columns[0]
-                            .get_text(separator='\n', strip=True).split('\n')
-                        ]
-                    # handle case of fisherman trade with 
-                    # multiple possible items given
-                    else:
-                        items_wanted = ' '.join(
-                            columns[0].get_text(separator='\n', strip=True)
-                            .split('\n')
-                        )
-                        parsed_items = items_wanted.strip()
-                        item_wanted  = [
-                            remove_excess_text(parsed_items)
-                        ]
-
-                    default_quantity = [
-                        remove_excess_text(quantity)
-                        for quantity 
-                        in columns[1].get_text(separator='\n', strip=True)
-                        .split('\n')
-                    ]
-                else:
-                    parsed_item = columns[0].get_text(strip=True).strip()
-                    item_wanted = [
-                        remove_excess_text(parsed_item)
-                    ]
-                    parsed_quantity = columns[1].get_text(strip=True).strip()
-                    default_quantity = [
-                        remove_excess_text(parsed_quantity)
-                    ]
-                
-                parsed_multiplier = columns[2].get_text(strip=True).strip()
-                price_multiplier  = remove_excess_text(parsed_multiplier)
+    exchanges = sum(len(trade['exchanges']) for prof in professions
+                    for trade in prof['trades'])
+    print_internal(f'ingested {len(professions)} professions ' +
+                   f'({exchanges} exchanges) in {seconds:.2f}s, ' +
+                   f'{exchanges / max(seconds, 1e-9):.0f} exchanges/s')
 
-                give = columns[3]
-                if give.find('br'):
-                    items_wanted = ' '.join(
-                        give.get_text(separator='\n', strip=True).split('\n')
-                    )
-                    item_given = remove_excess_text(items_wanted)
-                else:
-                    item_parsed = columns[3].get_text(strip=True).strip()
-                    item_given  = remove_excess_text(item_parsed)
-
-                quantity              = remove_excess_text(
-                                            columns[4].get_text(strip=True)
-                                        )
-                trades_until_disabled = remove_excess_text(
-                                            columns[5].get_text(strip=True)
-                                        )
-                xp_to_villager        = remove_excess_text(
-                                            columns[6].get_text(strip=True)
-                                        )
-
-                exchange_info['wanted'] = {
-                    'item'             : item_wanted,
-                    'default-quantity' : default_quantity,
-                    'price-multiplier' : price_multiplier
-                }
-                exchange_info['given'] = {
-                    'item'     : item_given,
-                    'quantity' : quantity
-                }
-                exchange_info['trades-until-disabled'] = trades_until_disabled
-                exchange_info['xp-to-villager'] = xp_to_villager
+    return
 
-                exchanges.append(exchange_info)
 
+def merge_item_details(data: list[dict[str, Any]],
+                       details: dict[str, dict] | None
+                       ) -> list[dict[str, Any]]:
+    """
+    Attaches the catalog ID and the saved item details to each item
+    of each exchange.
 
-            trade_level['exchanges'] = exchanges
+    Parameters
+    ----------
+    data : list[dict[str, Any]]
+        the villager data, modified in place
+    details : dict[str, dict] | None
+        the item details keyed by lowercase item name,
+        None if no item details have been fetched
 
+    Returns
+    -------
+    list[dict[str, Any]]
+        the given villager data
+    """
 
-            trades.append(trade_level)
+    ITEM_CATALOG.assign_ids(data)
+    ITEM_CATALOG.save()
 
-        info['trades'] = trades
+    if not details:
+        return data
 
-        villager_data.append(info)
+    for profession in data:
+        for trade in profession['trades']:
+            for exchange in trade['exchanges']:
+                wanted, given = exchange['wanted'], exchange['given']
+                wanted['details'] = [
+                    details.get(item.lower()) for item in wanted['item']
+                ]
+                given['details'] = details.get(given['item'].lower())
 
-    return villager_data
+    return data
 
 
 
@@ -960,7 +2414,10 @@ def make_into_dicts(job_sites: list[str],
 #                    Display                    #
 #################################################
 
-def display_data(villagers: list[dict[str, Any]]) -> None:
+def display_data(villagers: list[dict[str, Any]],
+                 file: TextIO | None=None, display_mode: str | None=None,
+                 display_job_site: bool | None=None, sort: str | None=None,
+                 group: str | None=None, whole: bool=False) -> None:
     """
     Displays the given villager data.
 
@@ -968,29 +2425,51 @@ def display_data(villagers: list[dict[str, Any]]) -> None:
     ----------
     villagers : list[dict[str, Any]]
         list of information regarding villager trades to be printed
+    file : TextIO | None, default=None
+        the stream to print to, None for stdout
+    display_mode : str | None, default=None
+        'simple', 'complex' or 'full', None for the mode in the config
+    display_job_site : bool | None, default=None
+        whether to display job sites, None for the setting in the config
+    sort : str | None, default=None
+        'xp', 'price' or 'uses' to sort the trades by, 'default' to keep
+        their order, None for the setting in the config
+    group : str | None, default=None
+        'profession', 'given' (item given), 'level', or 'none' to list
+        every trade together, None for the setting in the config
+    whole : bool, default=False
+        True,  if villagers is the whole saved data, which is sorted
+        faster |
+        False, otherwise, i.e. for search results
     """
 
-    display_mode = CONFIG_DICT['display-mode']
-    display_job_site = CONFIG_DICT['display-job-site']
+    if display_mode is None:
+        display_mode = CONFIG_DICT['display-mode']
+    if display_job_site is None:
+        display_job_site = CONFIG_DICT['display-job-site']
+
+    villagers = arrange_data(villagers, *view_settings(sort, group), whole)
 
     for profession in villagers:
-        print_centered( '+--------------------------------------+')
-        print_centered(f'|{profession["profession"].title().center(38)}|')
-        if display_job_site:
+        print_centered( '+--------------------------------------+', file)
+        print_centered(f'|{profession["profession"].title().center(38)}|',
+                       file)
+        if display_job_site and profession['job-site-block']:
             print_centered(
                            '|' + 
                            f'Job Site: {profession["job-site-block"].title()}'
                            .center(38) + 
-                           '|'
+                           '|',
+                           file
                            )
-        print_centered( '+--------------------------------------+')
+        print_centered( '+--------------------------------------+', file)
 
         trades = profession['trades']
 
         for trade in trades:
-            print_centered( '+-----------------------+')
-            print_centered(f'|{trade["level"].title().center(23)}|')
-            print_centered( '+-----------------------+')
+            print_centered( '+-----------------------+', file)
+            print_centered(f'|{trade["level"].title().center(23)}|', file)
+            print_centered( '+-----------------------+', file)
 
             for exchange in trade['exchanges']:
                 wanted = exchange['wanted']
@@ -998,7 +2477,8 @@ def display_data(villagers: list[dict[str, Any]]) -> None:
                
                 if display_mode == 'simple':
                     wanted_string = ', '.join(wanted['item'])
-                    print_centered(wanted_string + ' -> ' + given['item'])
+                    print_centered(wanted_string + ' -> ' + given['item'],
+                                   file)
                     continue
 
                 # complex
@@ -1015,7 +2495,7 @@ def display_data(villagers: list[dict[str, Any]]) -> None:
 
                 print_centered(wanted_string + 
                                 ' -<' + wanted['price-multiplier'] + '>-> ' +
-                                given_string)
+                                given_string, file)
 
                 if display_mode == 'complex':
                     continue
@@ -1025,24 +2505,167 @@ def display_data(villagers: list[dict[str, Any]]) -> None:
                               ' until disabled'
                             
                 # full
-                print_centered(full_string)
-                print()
+                print_centered(full_string, file)
+                print(file=file)
                 
-        print('=' * MAX_WIDTH)
+        print('=' * MAX_WIDTH, file=file)
+
+    return
+
+
+def render_data(villagers: list[dict[str, Any]],
+                display_mode: str | None=None,
+                display_job_site: bool | None=None, sort: str | None=None,
+                group: str | None=None, whole: bool=False) -> list[str]:
+    """
+    Renders the given villager data to lines of text, as they would
+    be displayed.
+
+    Parameters
+    ----------
+    villagers : list[dict[str, Any]]
+        list of information regarding villager trades to be rendered
+    display_mode : str | None, default=None
+        'simple', 'complex' or 'full', None for the mode in the config
+    display_job_site : bool | None, default=None
+        whether to display job sites, None for the setting in the config
+    sort : str | None, default=None
+        what to sort the trades by, see display_data
+    group : str | None, default=None
+        what to group the trades by, see display_data
+    whole : bool, default=False
+        whether villagers is the whole saved data, see display_data
+
+    Returns
+    -------
+    list[str]
+        the rendered lines
+    """
+
+    # written to a stream of its own rather than redirecting stdout,
+    # so that threads can render at the same time
+    output = io.StringIO()
+    display_data(villagers, output, display_mode, display_job_site, sort,
+                 group, whole)
+
+    return output.getvalue().splitlines()
+
+
+def view_settings(sort: str | None=None,
+                  group: str | None=None) -> tuple[str, str]:
+    """
+    Gets the sort and grouping to display trades with, from the config
+    if not given. Settings that are not valid are ignored.
+
+    Parameters
+    ----------
+    sort : str | None, default=None
+        one of SORTS, None for the setting in the config
+    group : str | None, default=None
+        one of GROUPS, None for the setting in the config
+
+    Returns
+    -------
+    tuple[str, str]
+        the sort and grouping
+    """
+
+    if sort is None:
+        sort = CONFIG_DICT.get('sort-by', 'default')
+    if group is None:
+        group = CONFIG_DICT.get('group-by', 'profession')
+
+    return (sort if sort in SORTS else 'default',
+            group if group in GROUPS else 'profession')
+
+
+def arrange_data(villagers: list[dict[str, Any]], sort: str,
+                 group: str, whole: bool=False) -> list[dict[str, Any]]:
+    """
+    Sorts and groups villager data with the views saved with the data,
+    see classes/result_views.py.
+
+    Parameters
+    ----------
+    villagers : list[dict[str, Any]]
+        the villager data
+    sort : str
+        one of SORTS
+    group : str
+        one of GROUPS
+    whole : bool, default=False
+        whether villagers is the whole saved data, see display_data
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        the arranged villager data
+    """
+
+    if sort == 'default' and group == 'profession':
+        return villagers
+
+    VIEWS.load(VILLAGER_DATA.data_fingerprint())
+    return VIEWS.arrange(villagers, sort, group, whole)
+
+
+def display_history(queries: list[str]) -> None:
+    """
+    Displays the saved snapshots, or how the exchanges of a profession
+    that want or give an item changed across them.
+
+    Parameters
+    ----------
+    queries : list[str]
+        empty to list the snapshots, or the profession and the item
+    """
+
+    if not queries:
+        snapshots = HISTORY.snapshots()
+        if not snapshots:
+            print('no snapshots saved')
+        for snapshot in snapshots:
+            print(f'{snapshot["id"][:12]}  {snapshot["time"]}  ' +
+                  snapshot['label'])
+        return
+
+    profession, item = queries[0].lower(), queries[1]
+    history = HISTORY.exchange_history(profession, item)
+    if not history:
+        print(f'no {profession} exchanges with {item} in the history')
+
+    for entry in history:
+        print(f'{entry["id"][:12]}  {entry["time"]}  {entry["label"]}')
+        if not entry['exchanges']:
+            print('  (no matching exchanges)')
+
+        for exchange in entry['exchanges']:
+            wanted, given = exchange['wanted'], exchange['given']
+            items = ' + '.join(
+                f'{quantity} {name}' for quantity, name in 
+                zip(wanted['default-quantity'], wanted['item'])
+            )
+            print(f'  {exchange["level"]}: {items} -> ' +
+                  f'{given["quantity"]} {given["item"]} ' +
+                  f'(multiplier {wanted["price-multiplier"]}, ' +
+                  f'uses {exchange["trades-until-disabled"]}, ' +
+                  f'xp {exchange["xp-to-villager"]})')
 
     return
 
 
-def print_centered(text: str) -> None:
+def print_centered(text: str, file: TextIO | None=None) -> None:
     """Prints the given text with a center value of 50
 
     Parameters
     ----------
     text : str
         the text to be printed
+    file : TextIO | None, default=None
+        the stream to print to, None for stdout
     """
 
-    print(text.center(MAX_WIDTH))
+    print(text.center(MAX_WIDTH), file=file)
     return
 
 
@@ -1082,8 +2705,12 @@ def display_options(
     -------
     int
         the option selected by the user |
-        -1 if error raised or invalid response
+        -1 if error raised or invalid response |
+        0 if the script is not interactive
     """
+
+    if not is_interactive():
+        return 0
     
     last_option = len(options)
     option = -1
@@ -1103,6 +2730,11 @@ def display_options(
             if option < 1 or option > last_option:
                 option = -1
                 raise TypeError('number out of bounds')
+
+        except EOFError:
+            # stdin was closed, there is no one left to answer
+            set_interactive(False)
+            return 0
         
         except Exception as e:
             if backable:
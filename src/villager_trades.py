@@ -0,0 +1,194 @@
+"""
+Minecraft Villager Trade Data, library API
+
+Functions for using the villager data from other programs, apart from
+the menus and command line args of main.py:
+
+    import villager_trades
+
+    results = villager_trades.search(['enchanted book'])
+    print('\\n'.join(villager_trades.render(results)))
+
+Importing this module does no I/O and only imports the standard
+library. The script is imported (setting up its data directory and
+config) and the data loaded on the first call, and the loaded data is
+kept in a single thread-safe dataset that every later call reuses.
+Functions can be called from any thread.
+"""
+
+# python native
+import threading, importlib.util
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+
+# constants
+SEARCH_KINDS = {
+    'wanted'     : 1,
+    'given'      : 2,
+    'profession' : 3
+}
+
+# the script is loaded from beside this file under its own name, so a
+# program with a main module of its own does not import that instead
+SCRIPT_PATH = Path(__file__).with_name('main.py')
+SCRIPT_NAME = '_villager_trades_main'
+
+_SCRIPT: ModuleType | None = None
+_SCRIPT_LOCK = threading.Lock()
+
+
+def _script() -> ModuleType:
+    """
+    Imports the script the first time it is needed. Prompts are turned
+    off before it is imported, as a program using the library cannot
+    answer them, and its setup messages are only recorded in the log.
+
+    Returns
+    -------
+    ModuleType
+        the main module of the script
+    """
+
+    global _SCRIPT
+
+    if _SCRIPT is None:
+        with _SCRIPT_LOCK:
+            if _SCRIPT is None:
+                from classes.useful_methods import set_interactive
+                set_interactive(False)
+
+                spec = importlib.util.spec_from_file_location(SCRIPT_NAME,
+                                                              SCRIPT_PATH)
+                script = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(script)
+                _SCRIPT = script
+
+    return _SCRIPT
+
+
+def load(refresh: bool=False) -> Any:
+    """
+    Gets the current snapshot of the villager data, loading it the
+    first time (fetching it from the wiki if it was never saved).
+
+    Parameters
+    ----------
+    refresh : bool, default=False
+        True, to read the saved data again
+
+    Returns
+    -------
+    Snapshot
+        the current snapshot, see classes/dataset.py, with the villager
+        data read-only |
+        None, if there is no data and it could not be fetched
+    """
+
+    dataset = _script().DATASET
+    return dataset.refresh() if refresh else dataset.snapshot()
+
+
+def search(queries: list[str] | tuple[str],
+           kind: str='wanted') -> list[dict[str, Any]]:
+    """
+    Finds the trades matching any of the queries.
+
+    Parameters
+    ----------
+    queries : list[str] | tuple[str]
+        items (or part of their names, or their IDs, i.e.
+        'minecraft:emerald') or professions to search for
+    kind : str, default='wanted'
+        'wanted' for items wanted by villagers, 'given' for items given
+        by villagers, 'profession' for professions
+
+    Returns
+    -------
+    list[dict[str, Any]]
+        the read-only villager data of the matching trades, empty if
+        there is no data
+
+    Raises
+    ------
+    ValueError
+        if the kind of search is not one of SEARCH_KINDS
+    """
+
+    if kind not in SEARCH_KINDS:
+        raise ValueError(f'kind must be one of {", ".join(SEARCH_KINDS)}')
+
+    snapshot = load()
+    if snapshot is None:
+        return []
+
+    queries = tuple(query.strip().lower() for query in queries)
+    if kind == 'profession':
+        return [snapshot.professions[query] for query in dict.fromkeys(queries)
+                if query in snapshot.professions]
+
+    return _script().filter_trades(snapshot.data, SEARCH_KINDS[kind], queries)
+
+
+def render(villagers: list[dict[str, Any]], display_mode: str | None=None,
+           display_job_site: bool | None=None, sort: str | None=None,
+           group: str | None=None) -> list[str]:
+    """
+    Renders villager data to lines of text, as the script displays it.
+
+    Parameters
+    ----------
+    villagers : list[dict[str, Any]]
+        the villager data, i.e. results of search
+    display_mode : str | None, default=None
+        'simple', 'complex' or 'full', None for the mode in the config
+    display_job_site : bool | None, default=None
+        whether to display job sites, None for the setting in the config
+    sort : str | None, default=None
+        'xp', 'price' or 'uses' to sort the trades by, 'default' to keep
+        their order, None for the setting in the config
+    group : str | None, default=None
+        'profession', 'given' (item given), 'level', or 'none' to list
+        every trade together, None for the setting in the config
+
+    Returns
+    -------
+    list[str]
+        the rendered lines
+    """
+
+    return _script().render_data(villagers, display_mode, display_job_site,
+                                 sort, group)
+
+
+def update() -> list[str] | None:
+    """
+    Fetches the villager data from the wiki and saves it if it changed.
+    Threads reading the data keep their snapshot, and later calls get
+    the new data.
+
+    Returns
+    -------
+    list[str]
+        the names of the professions that changed, empty if the data
+        is up to date |
+        None, if there was an error fetching or reading the data
+    """
+
+    main = _script()
+
+    data = main.fetch_data()
+    if data is None:
+        return None
+
+    data = main.merge_trade_packs(data)
+    main.merge_item_details(data, main.ITEM_DATA.read())
+
+    changes = main.find_changes(data)
+    if changes:
+        if not main.save_data(data):
+            return None
+        main.DATASET.publish(data)
+
+    return changes